@@ -34,7 +34,7 @@ limiter = Limiter(
     storage_uri=os.environ.get('REDIS_URL', 'memory://')
 )
 
-def create_app(testing=False):
+def create_app(testing=False, database_uri=None):
     app = Flask(
         __name__,
         static_folder=None,  # Disable automatic static file serving
@@ -43,8 +43,10 @@ def create_app(testing=False):
     app.config.from_object(Config)
     if testing:
         app.config["TESTING"] = True
-        app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+        # Tests that need several connections (e.g. concurrency tests) pass a file URI
+        app.config["SQLALCHEMY_DATABASE_URI"] = database_uri or "sqlite:///:memory:"
         app.config["WTF_CSRF_ENABLED"] = False
+        app.config["LOGIN_ENRICHMENT_EAGER"] = True
 
     # Configure logging
     logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s: %(message)s')
@@ -78,24 +80,46 @@ def create_app(testing=False):
     migrate.init_app(app, db)
     jwt.init_app(app)
     csrf.init_app(app)
+    # Rate limit counters share the bounded per-process pool settings of
+    # utils/redis_client.py instead of an unbounded pool of their own
+    from utils import redis_client  # noqa: PLC0415
+    limiter_pool = redis_client.get_pool(decode_responses=False)
+    if limiter_pool is not None:
+        app.config.setdefault('RATELIMIT_STORAGE_OPTIONS', {})['connection_pool'] = limiter_pool
     limiter.init_app(app)
 
     # JWT token version validation for security (invalidate tokens on password change)
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):  # noqa: ARG001
-        """Check if token_version in JWT matches current user's token_version."""
+        """
+        Check the token against the session registry and its token_version.
+
+        Tokens from login/verify-2fa/extend-session carry a session claim and
+        must still be registered (one Redis EXISTS), so single sessions can be
+        revoked. Every token must also match the user's current token_version,
+        so a password change ends all sessions even if revoking them in Redis
+        failed.
+        """
         try:
-            user_id = jwt_payload.get('sub')  # 'sub' is the identity (user ID)
-            token_version = jwt_payload.get('token_version', 0)
-
             from models.user import User  # noqa: PLC0415
-            user = User.query.get(int(user_id))
+            from utils import sessions, token_versions  # noqa: PLC0415
+
+            if jwt_payload.get('session') and not sessions.exists(jwt_payload['jti']):
+                return True
+
+            user_id = int(jwt_payload.get('sub'))  # 'sub' is the identity (user ID)
+            token_version = jwt_payload.get('token_version', 0)
 
-            if not user:
-                return True  # User deleted, block token
+            # Local/Redis cache first; only a miss reads the single column
+            current_version = token_versions.get_cached(user_id)
+            if current_version is None:
+                current_version = db.session.query(User.token_version).filter_by(id=user_id).scalar()
+                if current_version is None:
+                    return True  # User deleted, block token
+                current_version = token_versions.remember(user_id, current_version)
 
             # If token_version doesn't match, token is revoked
-            return user.token_version != token_version
+            return current_version != token_version
 
         except Exception:
             return True  # Error occurred, block token to be safe
@@ -122,6 +146,22 @@ def create_app(testing=False):
         token = generate_csrf()
         return {'csrf_token': token}
 
+    # Liveness for the container healthcheck. Public, so it reports only the
+    # status and is rate limited like any other endpoint that does I/O; the
+    # healthcheck polls every 30s. Pool usage is logged by log_pool_stats.
+    @app.route('/api/health', methods=['GET'])
+    @limiter.limit("30 per minute")
+    def health():
+        """Report whether Redis answers"""
+        healthy = redis_client.ping()
+        return {'status': 'ok' if healthy else 'degraded'}, 200 if healthy else 503
+
+    # Periodic Redis pool usage line in this worker's log (for monitoring)
+    @app.after_request
+    def log_redis_pool_stats(response):
+        redis_client.log_pool_stats()
+        return response
+
     # Security headers
     @app.after_request
     def set_security_headers(response):
@@ -153,16 +193,16 @@ def create_app(testing=False):
     # Rate limit breach handler - send security alerts
     @app.errorhandler(429)
     def rate_limit_handler(e):  # noqa: ARG001
-        """Handle rate limit exceeded - send admin alert and return error"""
-        from models.user import User  # noqa: PLC0415
-        from utils.email import send_rate_limit_alert  # noqa: PLC0415
+        """Handle rate limit exceeded - record the incident for the admin digest and return error"""
+        from utils.alert_digest import record_rate_limit_incident  # noqa: PLC0415
+        from utils.security_counters import record_rate_limit_violation  # noqa: PLC0415
 
         # Get request details
         ip_address = get_real_ip()
         endpoint = request.path
 
         # Skip alerts for non-security endpoints (health checks, monitoring, etc.)
-        skip_alert_endpoints = ['/health', '/ping', '/metrics']
+        skip_alert_endpoints = ['/api/health', '/health', '/ping', '/metrics']
         should_send_alert = not any(endpoint.startswith(skip) for skip in skip_alert_endpoints)
 
         # Try to extract user email from request if available
@@ -174,24 +214,16 @@ def create_app(testing=False):
                 user_email = data.get('email') or data.get('identifier')
 
                 # Track rate limit violation for the user if email/username provided
+                # (one HINCRBY; the blog-worker resolves the user and flushes it)
                 if user_email:
-                    user = User.query.filter(
-                        (User.email == user_email.lower().strip()) |
-                        (User.username == user_email.lower().strip())
-                    ).first()
-                    if user:
-                        user.rate_limit_violations += 1
-                        db.session.commit()
+                    record_rate_limit_violation(user_email)
         except Exception as track_error:
             app.logger.error(f"Failed to track rate limit violation: {track_error!r}")
 
-        # Send alert to admin (non-blocking - won't fail request if email fails)
-        # Only send for security-relevant endpoints (auth, user actions, etc.)
+        # One stream append; the blog-worker emails a digest to the admin
+        # Only recorded for security-relevant endpoints (auth, user actions, etc.)
         if should_send_alert:
-            try:
-                send_rate_limit_alert(ip_address, endpoint, user_email)
-            except Exception as alert_error:
-                app.logger.error(f"Failed to send rate limit alert: {alert_error!r}")
+            record_rate_limit_incident(ip_address, endpoint, user_email)
         else:
             app.logger.debug(f"Rate limit on {endpoint} - skipping alert (non-security endpoint)")
 
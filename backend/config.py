@@ -27,6 +27,14 @@ class Config:
     RESEND_API_KEY = os.environ.get('RESEND_API_KEY')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@notifications.computeranything.dev')
 
+    # How the worker delivers outbox emails: 'resend', 'log' (development) or
+    # 'fake' (tests) - see utils/email_outbox.py
+    EMAIL_TRANSPORT = os.environ.get('EMAIL_TRANSPORT') or (
+        'fake' if os.environ.get('TESTING') == 'true'
+        else 'log' if os.environ.get('FLASK_ENV') == 'development'
+        else 'resend'
+    )
+
     # Admin Email (for security alerts)
     ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL')
 
@@ -39,6 +47,19 @@ class Config:
     # Rate Limiting Storage (Redis)
     RATELIMIT_STORAGE_URI = os.environ.get('REDIS_URL', 'memory://')
 
+    # Buffer vote counter updates in Redis and flush them from the worker
+    # (see utils/vote_buffer.py); needs REDIS_URL to point at a real Redis
+    VOTE_BUFFER_ENABLED = os.environ.get('VOTE_BUFFER_ENABLED', 'false').lower() in ('true', '1', 'yes')
+
+    # Local IP geolocation database (.mmdb or a range table built by
+    # scripts/refresh_geoip.py); ipapi.co is only used for IPs it misses
+    GEOIP_DATABASE_PATH = os.environ.get('GEOIP_DATABASE_PATH')
+
+    # Seconds a resolved login location is cached per IP (see utils/login_enrichment.py)
+    GEOLOCATION_CACHE_TTL = int(os.environ.get('GEOLOCATION_CACHE_TTL', 86400))  # noqa: PLW1508
+    # Enrich logins inline instead of in the background (tests)
+    LOGIN_ENRICHMENT_EAGER = False
+
     # Environment detection
     ENV = os.environ.get('FLASK_ENV', 'development')
     DEBUG = ENV == 'development'
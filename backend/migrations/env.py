@@ -45,6 +45,15 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Full-text search objects created by raw DDL (see models/post.py) rather than
+# mapped on the models; keep autogenerate from proposing to drop them.
+UNMAPPED_SEARCH_OBJECTS = {'search_vector', 'ix_blog_posts_search_vector', 'blog_posts_fts'}
+
+
+def include_object(object, name, type_, reflected, compare_to):  # noqa: A002, ARG001
+    return not (reflected and (name in UNMAPPED_SEARCH_OBJECTS or (name or '').startswith('blog_posts_fts_')))
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -93,6 +102,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,25 @@
+"""add blog_posts (created_at, id) index for keyset pagination
+
+Revision ID: 3c9a51e2d7b4
+Revises: 12f2e7c93b83
+Create Date: 2026-10-17 09:12:41.208311
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a51e2d7b4'
+down_revision = '12f2e7c93b83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.create_index('ix_blog_posts_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_blog_posts_created_at_id')
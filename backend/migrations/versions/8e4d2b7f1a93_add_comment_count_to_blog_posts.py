@@ -0,0 +1,43 @@
+"""add denormalized comment_count to blog_posts
+
+Revision ID: 8e4d2b7f1a93
+Revises: 3c9a51e2d7b4
+Create Date: 2026-10-17 10:03:17.552904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d2b7f1a93'
+down_revision = '3c9a51e2d7b4'
+branch_labels = None
+depends_on = None
+
+# Posts per backfill UPDATE. This bounds statement size only: env.py runs the
+# whole upgrade in one transaction, so every row lock is held until it commits.
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def upgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill in primary-key ranges so no single UPDATE touches the whole table
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text('SELECT MAX(id) FROM blog_posts')).scalar() or 0
+    for start in range(0, max_id + 1, BACKFILL_CHUNK_SIZE):
+        bind.execute(
+            sa.text(
+                'UPDATE blog_posts SET comment_count = '
+                '(SELECT COUNT(*) FROM comments WHERE comments.post_id = blog_posts.id) '
+                'WHERE id >= :start AND id < :end'
+            ),
+            {'start': start, 'end': start + BACKFILL_CHUNK_SIZE}
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_column('comment_count')
@@ -0,0 +1,74 @@
+"""add stored score and hot_rank ranking columns to blog_posts
+
+Revision ID: 9f6b1d3a7c52
+Revises: 5a0e9c4b2f68
+Create Date: 2026-10-17 15:06:44.381925
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f6b1d3a7c52'
+down_revision = '5a0e9c4b2f68'
+branch_labels = None
+depends_on = None
+
+# Posts read per backfill chunk. This bounds memory and statement size only:
+# env.py runs the whole upgrade in one transaction, so row locks are held until
+# it commits.
+BACKFILL_CHUNK_SIZE = 1000
+# Frozen copy of utils.ranking.HOT_GRAVITY at the time of this migration
+HOT_GRAVITY = 1.8
+
+
+def compute_hot_rank(score, created_at, now):
+    age_hours = max((now - created_at).total_seconds() / 3600, 0) if created_at else 0
+    return (score + 1) / (age_hours + 2) ** HOT_GRAVITY
+
+
+def upgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('score', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('hot_rank', sa.Float(), server_default='0', nullable=False))
+
+    bind = op.get_bind()
+    now = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                'SELECT id, upvotes, downvotes, created_at FROM blog_posts '
+                'WHERE id > :last_id ORDER BY id LIMIT :limit'
+            ),
+            {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            created_at = row.created_at
+            if isinstance(created_at, str):  # SQLite returns text for raw SELECTs
+                created_at = datetime.fromisoformat(created_at)
+            score = (row.upvotes or 0) - (row.downvotes or 0)
+            updates.append({'id': row.id, 'score': score, 'hot_rank': compute_hot_rank(score, created_at, now)})
+        bind.execute(
+            sa.text('UPDATE blog_posts SET score = :score, hot_rank = :hot_rank WHERE id = :id'),
+            updates
+        )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.create_index('ix_blog_posts_score_id', ['score', 'id'], unique=False)
+        batch_op.create_index('ix_blog_posts_hot_rank_id', ['hot_rank', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_blog_posts_hot_rank_id')
+        batch_op.drop_index('ix_blog_posts_score_id')
+        batch_op.drop_column('hot_rank')
+        batch_op.drop_column('score')
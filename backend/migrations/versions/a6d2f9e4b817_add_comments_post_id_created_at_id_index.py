@@ -0,0 +1,25 @@
+"""add comments (post_id, created_at, id) index for thread pagination
+
+Revision ID: a6d2f9e4b817
+Revises: e3b8c6a1f4d9
+Create Date: 2026-10-17 16:48:27.903164
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d2f9e4b817'
+down_revision = 'e3b8c6a1f4d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_post_id_created_at_id', ['post_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_post_id_created_at_id')
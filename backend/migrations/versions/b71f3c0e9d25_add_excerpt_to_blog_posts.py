@@ -0,0 +1,59 @@
+"""add precomputed excerpt to blog_posts
+
+Revision ID: b71f3c0e9d25
+Revises: 8e4d2b7f1a93
+Create Date: 2026-10-17 11:20:55.037162
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71f3c0e9d25'
+down_revision = '8e4d2b7f1a93'
+branch_labels = None
+depends_on = None
+
+# Posts read per backfill chunk. This bounds memory and statement size only:
+# env.py runs the whole upgrade in one transaction, so row locks are held until
+# it commits.
+BACKFILL_CHUNK_SIZE = 500
+# Frozen copy of models.post.EXCERPT_LENGTH / make_excerpt at the time of this migration
+EXCERPT_LENGTH = 280
+
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    text = re.sub(r'\s+', ' ', content or '').strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0] or text[:length]
+    return cut.rstrip(' .,;:') + '…'
+
+
+def upgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('excerpt', sa.String(length=300), nullable=True))
+
+    # Backfill in id order, a chunk at a time, so full post bodies are never all in memory
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text('SELECT id, content FROM blog_posts WHERE id > :last_id ORDER BY id LIMIT :limit'),
+            {'last_id': last_id, 'limit': BACKFILL_CHUNK_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        bind.execute(
+            sa.text('UPDATE blog_posts SET excerpt = :excerpt WHERE id = :id'),
+            [{'id': row.id, 'excerpt': make_excerpt(row.content)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_column('excerpt')
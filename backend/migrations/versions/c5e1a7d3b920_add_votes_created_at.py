@@ -0,0 +1,38 @@
+"""add votes.created_at and (user_id, created_at, id) index for voted-posts
+
+Revision ID: c5e1a7d3b920
+Revises: a6d2f9e4b817
+Create Date: 2026-10-17 17:21:09.644812
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e1a7d3b920'
+down_revision = 'a6d2f9e4b817'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+
+    # Existing votes have no recorded time; stamping them all with the
+    # migration time keeps their relative order through the id tie-breaker
+    now = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    op.get_bind().execute(sa.text('UPDATE votes SET created_at = :now'), {'now': now})
+
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_votes_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.drop_index('ix_votes_user_id_created_at_id')
+        batch_op.drop_column('created_at')
@@ -0,0 +1,88 @@
+"""add full-text search index for posts
+
+Postgres: generated weighted tsvector column + GIN index.
+SQLite: external-content FTS5 table kept in sync by triggers.
+
+Revision ID: d42a8f6c3e17
+Revises: b71f3c0e9d25
+Create Date: 2026-10-17 12:41:08.916420
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd42a8f6c3e17'
+down_revision = 'b71f3c0e9d25'
+branch_labels = None
+depends_on = None
+
+
+POSTGRES_UPGRADE = [
+    """
+    ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(topic_tags, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_blog_posts_search_vector ON blog_posts USING GIN (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_blog_posts_search_vector",
+    "ALTER TABLE blog_posts DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blog_posts_fts USING fts5(
+        title, content, topic_tags,
+        content='blog_posts', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ai AFTER INSERT ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(rowid, title, content, topic_tags)
+        VALUES (new.id, new.title, new.content, new.topic_tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ad AFTER DELETE ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content, topic_tags)
+        VALUES ('delete', old.id, old.title, old.content, old.topic_tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_au AFTER UPDATE OF title, content, topic_tags ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content, topic_tags)
+        VALUES ('delete', old.id, old.title, old.content, old.topic_tags);
+        INSERT INTO blog_posts_fts(rowid, title, content, topic_tags)
+        VALUES (new.id, new.title, new.content, new.topic_tags);
+    END
+    """,
+    # Index rows that existed before the table was created
+    "INSERT INTO blog_posts_fts(blog_posts_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS blog_posts_fts_au",
+    "DROP TRIGGER IF EXISTS blog_posts_fts_ad",
+    "DROP TRIGGER IF EXISTS blog_posts_fts_ai",
+    "DROP TABLE IF EXISTS blog_posts_fts",
+]
+
+
+def _run(statements_by_dialect):
+    dialect = op.get_bind().dialect.name
+    for statement in statements_by_dialect.get(dialect, []):
+        op.execute(statement)
+
+
+def upgrade():
+    _run({'postgresql': POSTGRES_UPGRADE, 'sqlite': SQLITE_UPGRADE})
+
+
+def downgrade():
+    _run({'postgresql': POSTGRES_DOWNGRADE, 'sqlite': SQLITE_DOWNGRADE})
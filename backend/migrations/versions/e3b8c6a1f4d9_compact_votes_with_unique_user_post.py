@@ -0,0 +1,69 @@
+"""dedupe votes, add unique (user_id, post_id) index and store vote_type as smallint
+
+Revision ID: e3b8c6a1f4d9
+Revises: 9f6b1d3a7c52
+Create Date: 2026-10-17 16:02:13.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b8c6a1f4d9'
+down_revision = '9f6b1d3a7c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Keep the most recent vote per (user, post); older duplicates came from
+    # racing double-clicks before votes were toggled atomically
+    bind.execute(sa.text(
+        'DELETE FROM votes WHERE id NOT IN ('
+        'SELECT MAX(id) FROM votes GROUP BY user_id, post_id'
+        ')'
+    ))
+
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('vote_value', sa.SmallInteger(), nullable=True))
+
+    bind.execute(sa.text(
+        "UPDATE votes SET vote_value = CASE WHEN vote_type = 'upvote' THEN 1 ELSE -1 END"
+    ))
+
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.drop_column('vote_type')
+        batch_op.alter_column('vote_value', new_column_name='vote_type',
+                              existing_type=sa.SmallInteger(), nullable=False)
+        batch_op.create_index('uq_votes_user_id_post_id', ['user_id', 'post_id'], unique=True)
+        batch_op.create_index('ix_votes_post_id', ['post_id'], unique=False)
+
+    # Dedupe may have removed counted votes, so recount the denormalized columns.
+    # hot_rank catches up on the next recompute_hot_ranks run.
+    bind.execute(sa.text(
+        'UPDATE blog_posts SET '
+        'upvotes = (SELECT COUNT(*) FROM votes WHERE votes.post_id = blog_posts.id AND votes.vote_type = 1), '
+        'downvotes = (SELECT COUNT(*) FROM votes WHERE votes.post_id = blog_posts.id AND votes.vote_type = -1)'
+    ))
+    bind.execute(sa.text('UPDATE blog_posts SET score = upvotes - downvotes'))
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.drop_index('ix_votes_post_id')
+        batch_op.drop_index('uq_votes_user_id_post_id')
+        batch_op.add_column(sa.Column('vote_name', sa.String(length=10), nullable=True))
+
+    bind.execute(sa.text(
+        "UPDATE votes SET vote_name = CASE WHEN vote_type = 1 THEN 'upvote' ELSE 'downvote' END"
+    ))
+
+    with op.batch_alter_table('votes', schema=None) as batch_op:
+        batch_op.drop_column('vote_type')
+        batch_op.alter_column('vote_name', new_column_name='vote_type',
+                              existing_type=sa.String(length=10), nullable=False)
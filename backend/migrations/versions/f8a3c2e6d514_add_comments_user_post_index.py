@@ -0,0 +1,29 @@
+"""add comments (user_id, post_id, created_at, id) index for commented-posts
+
+Revision ID: f8a3c2e6d514
+Revises: c5e1a7d3b920
+Create Date: 2026-10-17 17:52:36.117420
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a3c2e6d514'
+down_revision = 'c5e1a7d3b920'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_comments_user_id_post_id_created_at_id',
+            ['user_id', 'post_id', 'created_at', 'id'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_user_id_post_id_created_at_id')
@@ -1,10 +1,20 @@
 from datetime import datetime, timezone
 
 from app import db
+from models.user import User
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.orm import joinedload
 
 
 class Comment(db.Model):
     __tablename__ = 'comments'
+    # Serves a post's thread in chronological order as one index range scan
+    __table_args__ = (
+        db.Index('ix_comments_post_id_created_at_id', 'post_id', 'created_at', 'id'),
+        # A user's latest comment per post (commented-posts on profiles)
+        db.Index('ix_comments_user_id_post_id_created_at_id', 'user_id', 'post_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
@@ -12,6 +22,50 @@ class Comment(db.Model):
     post_id = db.Column(db.Integer, db.ForeignKey('blog_posts.id', ondelete='CASCADE'), nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(tz=timezone.utc).replace(tzinfo=None))
 
+    @classmethod
+    def query_for_thread(cls, post_id):
+        """Comments on one post with their authors (id and username only) joined in"""
+        return (
+            cls.query
+            .options(joinedload(cls.user).load_only(User.id, User.username))
+            .filter(cls.post_id == post_id)
+        )
+
+    @classmethod
+    def latest_per_post(cls, user_id):
+        """
+        Subquery of the user's most recent comment on each post they commented on.
+
+        Postgres uses DISTINCT ON (post_id); other databases rank with
+        ROW_NUMBER() and keep the first row. Either way it is one set-based
+        scan of ix_comments_user_id_post_id_created_at_id.
+
+        Returns:
+            Subquery with columns id, post_id, content, created_at
+        """
+        newest_first = (cls.created_at.desc(), cls.id.desc())
+        if db.engine.dialect.name == 'postgresql':
+            return (
+                select(cls.id, cls.post_id, cls.content, cls.created_at)
+                .where(cls.user_id == user_id)
+                .ext(distinct_on(cls.post_id))
+                .order_by(cls.post_id, *newest_first)
+                .subquery()
+            )
+        ranked = (
+            select(
+                cls.id, cls.post_id, cls.content, cls.created_at,
+                func.row_number().over(partition_by=cls.post_id, order_by=newest_first).label('rank')
+            )
+            .where(cls.user_id == user_id)
+            .subquery()
+        )
+        return (
+            select(ranked.c.id, ranked.c.post_id, ranked.c.content, ranked.c.created_at)
+            .where(ranked.c.rank == 1)
+            .subquery()
+        )
+
     def to_dict(self):
         return {
             "id": self.id,
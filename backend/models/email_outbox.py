@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+
+from app import db
+
+
+OUTBOX_PENDING = 'pending'
+OUTBOX_DEAD = 'dead'
+
+
+class OutboxEmail(db.Model):
+    """
+    An email waiting to be delivered by the blog-worker (see utils/email_outbox.py).
+
+    Rows are added to the caller's transaction by utils.email.send_email, so an
+    email exists exactly when the change that triggered it was committed.
+    Delivered rows are deleted; rows that keep failing are kept as 'dead'.
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        # The delivery job polls: WHERE status = 'pending' AND next_attempt_at <= now
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    to = db.Column(db.JSON, nullable=False)  # list of addresses
+    subject = db.Column(db.String(255), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    from_email = db.Column(db.String(255), nullable=False)
+    reply_to = db.Column(db.String(255), nullable=True)
+    status = db.Column(db.String(10), default=OUTBOX_PENDING, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=lambda: datetime.now(tz=timezone.utc).replace(tzinfo=None), nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(tz=timezone.utc).replace(tzinfo=None), nullable=False)
+
+    def __repr__(self):
+        return f'<OutboxEmail {self.id} {self.status}>'
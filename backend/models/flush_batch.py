@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+
+from app import db
+
+
+# Batches are only ever looked up while their Redis in-flight hash exists,
+# which is seconds; a day of history is plenty for debugging.
+FLUSH_BATCH_RETENTION = timedelta(days=1)
+
+
+class FlushBatch(db.Model):
+    """
+    A Redis write-behind batch that has been applied to the database.
+
+    The flush jobs (utils/vote_buffer.py, utils/security_counters.py) insert
+    the row in the same transaction as the counter updates, so a batch replayed
+    after a crash between the commit and deleting its in-flight hash is
+    recognised and skipped instead of being counted twice.
+    """
+    __tablename__ = 'flush_batches'
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex stored in the in-flight hash
+    source = db.Column(db.String(32), nullable=False)  # which buffer the batch came from
+    applied_at = db.Column(db.DateTime, default=lambda: datetime.now(tz=timezone.utc).replace(tzinfo=None), nullable=False, index=True)
+
+    @classmethod
+    def begin(cls, batch_id, source):
+        """
+        Record a batch in the current transaction unless it was applied already.
+
+        Also prunes rows older than FLUSH_BATCH_RETENTION.
+
+        Returns:
+            bool: False if the batch was committed by an earlier flush (skip it)
+        """
+        if db.session.get(cls, batch_id) is not None:
+            return False
+        cutoff = datetime.now(tz=timezone.utc).replace(tzinfo=None) - FLUSH_BATCH_RETENTION
+        db.session.query(cls).filter(cls.applied_at < cutoff).delete(synchronize_session=False)
+        db.session.add(cls(id=batch_id, source=source))
+        return True
+
+    def __repr__(self):
+        return f'<FlushBatch {self.source} {self.id}>'
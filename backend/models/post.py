@@ -1,23 +1,154 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import re
 
 from app import db
+from models.tag import Tag, post_tags
+from models.user import User
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import defer, joinedload, validates
+from utils.ranking import HOT_WINDOW_DAYS, compute_hot_rank, hot_rank_decay
+
+
+EXCERPT_LENGTH = 280
+
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    """Collapse whitespace and truncate content on a word boundary for feed previews"""
+    text = re.sub(r'\s+', ' ', content or '').strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0] or text[:length]
+    return cut.rstrip(' .,;:') + '…'
 
 
 class BlogPost(db.Model):
     __tablename__ = 'blog_posts'
+    __table_args__ = (
+        # Keyset pagination for the feed: ORDER BY created_at DESC, id DESC
+        db.Index('ix_blog_posts_created_at_id', 'created_at', 'id'),
+        # ?sort=top and ?sort=hot: first page is an index scan, not a full sort
+        db.Index('ix_blog_posts_score_id', 'score', 'id'),
+        db.Index('ix_blog_posts_hot_rank_id', 'hot_rank', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
+    # Precomputed preview of content so feeds never need to load the full body
+    excerpt = db.Column(db.String(300), nullable=True)
     topic_tags = db.Column(db.String(255), nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(tz=timezone.utc).replace(tzinfo=None))
     upvotes = db.Column(db.Integer, default=0, nullable=False)
     downvotes = db.Column(db.Integer, default=0, nullable=False)
+    # Stored ranking keys, updated with each vote (hot_rank also decays via
+    # BlogPost.recompute_hot_ranks, run periodically by worker.py)
+    score = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    hot_rank = db.Column(db.Float, default=lambda: compute_hot_rank(0, None), server_default='0', nullable=False)
+    # Denormalized count of rows in comments, maintained on write
+    comment_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
 
     # Relationships
     votes = db.relationship('Vote', backref='post', cascade='all, delete-orphan', lazy=True)
     comments = db.relationship('Comment', backref='post', cascade='all, delete-orphan', lazy=True)
+    # Normalized index of topic_tags (the CSV column stays the display source)
+    tags = db.relationship('Tag', secondary=post_tags, lazy=True)
+
+    @validates('content')
+    def _sync_excerpt(self, _key, content):
+        """Keep excerpt in step with content on every assignment"""
+        self.excerpt = make_excerpt(content)
+        return content
+
+    def set_tags(self, names):
+        """Replace this post's tag index entries (caller commits)"""
+        self.tags = Tag.get_or_create_many(names)
+        Tag.invalidate_usage_counts()
+
+    @classmethod
+    def query_for_list(cls, summary=False):
+        """
+        Query for list endpoints that avoids per-post lazy loads.
+
+        The author (id and username only) is eagerly joined and the comment
+        count is a stored column, so serializing N posts costs one statement.
+        With summary=True the content column is deferred and never read.
+        """
+        options = [joinedload(cls.user).load_only(User.id, User.username)]
+        if summary:
+            options.append(defer(cls.content, raiseload=True))
+        return cls.query.options(*options)
+
+    @classmethod
+    def apply_vote_delta(cls, post_id, created_at, upvote_delta, downvote_delta):
+        """
+        Atomically apply a vote change to the counters and ranking keys.
+
+        A single UPDATE ... RETURNING increments in SQL, so concurrent voters
+        never lose each other's updates and the row lock lasts one statement
+        plus the caller's commit.
+
+        Returns:
+            tuple: (upvotes, downvotes) after the update, or None if the post is gone
+        """
+        score_delta = upvote_delta - downvote_delta
+        row = db.session.execute(
+            db.update(cls)
+            .where(cls.id == post_id)
+            .values(
+                upvotes=cls.upvotes + upvote_delta,
+                downvotes=cls.downvotes + downvote_delta,
+                score=cls.score + score_delta,
+                # SET expressions see the pre-update score
+                hot_rank=(cls.score + score_delta + 1) / hot_rank_decay(created_at),
+            )
+            .returning(cls.upvotes, cls.downvotes)
+            .execution_options(synchronize_session=False)
+        ).first()
+        return (row.upvotes, row.downvotes) if row else None
+
+    @classmethod
+    def recompute_hot_ranks(cls, batch_size=500, now=None):
+        """
+        Re-apply time decay to hot_rank for posts inside the hot window.
+
+        Processes posts in primary-key batches, committing after each one so
+        row locks are held briefly.
+
+        Returns:
+            int: Number of posts updated
+        """
+        if now is None:
+            now = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        window_start = now - timedelta(days=HOT_WINDOW_DAYS)
+        updated = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.session.query(cls.id, cls.score, cls.created_at)
+                .filter(cls.created_at >= window_start, cls.id > last_id)
+                .order_by(cls.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            db.session.execute(
+                db.update(cls),
+                [{'id': row.id, 'hot_rank': compute_hot_rank(row.score, row.created_at, now)} for row in rows]
+            )
+            db.session.commit()
+            updated += len(rows)
+            last_id = rows[-1].id
+        return updated
+
+    @classmethod
+    def adjust_comment_count(cls, post_id, delta):
+        """Atomically add delta to a post's comment_count in SQL (caller commits)"""
+        cls.query.filter_by(id=post_id).update(
+            {cls.comment_count: cls.comment_count + delta},
+            synchronize_session=False
+        )
 
     def to_dict(self):
         return {
@@ -30,8 +161,81 @@ class BlogPost(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "user_id": self.user_id,
             "author": self.user.username if hasattr(self, 'user') and self.user else None,
-            "comment_count": len(self.comments) if self.comments else 0
+            "comment_count": self.comment_count or 0
+        }
+
+    def to_summary_dict(self):
+        """Feed projection: everything in to_dict() except the full content"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "excerpt": self.excerpt,
+            "topic_tags": self.topic_tags,
+            "upvotes": self.upvotes,
+            "downvotes": self.downvotes,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "user_id": self.user_id,
+            "author": self.user.username if hasattr(self, 'user') and self.user else None,
+            "comment_count": self.comment_count or 0
         }
 
     def __repr__(self):
         return f'<BlogPost {self.title}>'
+
+
+# ============================================================================
+# FULL-TEXT SEARCH INDEX
+# ============================================================================
+# Postgres keeps a generated, weighted tsvector column with a GIN index. SQLite
+# (local development and tests) uses an external-content FTS5 table kept in sync
+# by triggers. Neither is mapped on the model; utils/search.py queries them.
+
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(topic_tags, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_blog_posts_search_vector ON blog_posts USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blog_posts_fts USING fts5(
+        title, content, topic_tags,
+        content='blog_posts', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ai AFTER INSERT ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(rowid, title, content, topic_tags)
+        VALUES (new.id, new.title, new.content, new.topic_tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ad AFTER DELETE ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content, topic_tags)
+        VALUES ('delete', old.id, old.title, old.content, old.topic_tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_au AFTER UPDATE OF title, content, topic_tags ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, content, topic_tags)
+        VALUES ('delete', old.id, old.title, old.content, old.topic_tags);
+        INSERT INTO blog_posts_fts(rowid, title, content, topic_tags)
+        VALUES (new.id, new.title, new.content, new.topic_tags);
+    END
+    """,
+]
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(BlogPost.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(BlogPost.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(
+    BlogPost.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS blog_posts_fts').execute_if(dialect='sqlite')
+)
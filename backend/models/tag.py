@@ -0,0 +1,93 @@
+from app import db
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from utils.cache import TTLCache
+
+
+# Usage counts change on every tagged write but are read on every feed load;
+# a short TTL keeps them cheap without needing cross-worker invalidation.
+TAG_COUNTS_TTL = 60
+MAX_TAG_COUNTS = 100
+_tag_counts_cache = TTLCache(maxsize=1, ttl=TAG_COUNTS_TTL)
+
+
+# Association between posts and normalized tags. The composite primary key
+# serves post -> tags lookups; ix_post_tags_tag_id_post_id serves tag -> posts.
+post_tags = db.Table(
+    'post_tags',
+    db.Column('post_id', db.Integer, db.ForeignKey('blog_posts.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_post_tags_tag_id_post_id', 'tag_id', 'post_id'),
+)
+
+
+def normalize_tag(name):
+    """Canonical form used for the tag index (the CSV keeps the author's casing)"""
+    return name.strip().lower()
+
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(30), unique=True, nullable=False, index=True)
+
+    @classmethod
+    def get_or_create_many(cls, names):
+        """
+        Resolve tag names to Tag rows, creating any that do not exist yet.
+
+        Missing tags are inserted with ON CONFLICT (name) DO NOTHING and then
+        selected, so two posts introducing the same new tag at once both get
+        the row instead of one failing on the unique constraint.
+
+        Args:
+            names: Iterable of raw tag names
+
+        Returns:
+            list: Tag instances in first-seen order, without duplicates
+        """
+        normalized = list(dict.fromkeys(normalize_tag(name) for name in names if name and name.strip()))
+        if not normalized:
+            return []
+        existing = {tag.name: tag for tag in cls.query.filter(cls.name.in_(normalized)).all()}
+        missing = [name for name in normalized if name not in existing]
+        if missing:
+            insert = postgresql_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+            db.session.execute(
+                insert(cls).values([{'name': name} for name in missing]).on_conflict_do_nothing(index_elements=['name'])
+            )
+            existing.update((tag.name, tag) for tag in cls.query.filter(cls.name.in_(missing)).all())
+        return [existing[name] for name in normalized]
+
+    @classmethod
+    def usage_counts(cls):
+        """
+        Most-used tags with the number of posts carrying each (cached).
+
+        Returns:
+            list: [{'name': str, 'count': int}, ...] ordered by count, then name
+        """
+        counts = _tag_counts_cache.get('all')
+        if counts is None:
+            post_count = func.count(post_tags.c.post_id)
+            rows = (
+                db.session.query(cls.name, post_count)
+                .join(post_tags, post_tags.c.tag_id == cls.id)
+                .group_by(cls.id, cls.name)
+                .order_by(post_count.desc(), cls.name)
+                .limit(MAX_TAG_COUNTS)
+                .all()
+            )
+            counts = [{'name': name, 'count': count} for name, count in rows]
+            _tag_counts_cache.set('all', counts)
+        return counts
+
+    @staticmethod
+    def invalidate_usage_counts():
+        """Drop this worker's cached counts after a tag write"""
+        _tag_counts_cache.clear()
+
+    def __repr__(self):
+        return f'<Tag {self.name}>'
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta, timezone
 import secrets
 
 from app import db
+from utils import sessions, token_versions
 from werkzeug.security import check_password_hash, generate_password_hash
 
 
@@ -59,6 +60,10 @@ class User(db.Model):
     def invalidate_tokens(self):
         """Increment token_version to invalidate all existing JWT tokens"""
         self.token_version += 1
+        # Every worker's token_version cache picks this up once the caller commits
+        token_versions.store_after_commit(self.id, self.token_version)
+        # Also drop the registry entries so per-session checks fail immediately
+        sessions.revoke_all_after_commit(self.id)
 
     def record_successful_login(self, ip_address=None, location=None, browser=None, device=None):
         """Record a successful login and reset failed attempts"""
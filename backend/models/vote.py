@@ -1,13 +1,123 @@
+from datetime import datetime, timezone
+
 from app import db
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+# vote_type is stored as a signed SMALLINT; the API keeps speaking in names
+UPVOTE = 1
+DOWNVOTE = -1
+VOTE_VALUES = {'upvote': UPVOTE, 'downvote': DOWNVOTE}
+VOTE_NAMES = {value: name for name, value in VOTE_VALUES.items()}
+
+
+def _counter_delta(value, amount):
+    """(upvote_delta, downvote_delta) for adding amount votes of the given value"""
+    return (amount, 0) if value == UPVOTE else (0, amount)
 
 
 class Vote(db.Model):
     __tablename__ = 'votes'
+    # The unique index doubles as the user_id lookup index, so
+    # filter_by(user_id=..., post_id=...) never touches the heap
+    __table_args__ = (
+        db.Index('uq_votes_user_id_post_id', 'user_id', 'post_id', unique=True),
+        db.Index('ix_votes_post_id', 'post_id'),
+        # A user's voted posts, most recent vote first
+        db.Index('ix_votes_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey('blog_posts.id', ondelete='CASCADE'), nullable=False)
-    vote_type = db.Column(db.String(10), nullable=False)  # 'upvote' or 'downvote'
+    vote_type = db.Column(db.SmallInteger, nullable=False)  # UPVOTE (+1) or DOWNVOTE (-1)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(tz=timezone.utc).replace(tzinfo=None))
+
+    @property
+    def vote_name(self):
+        """'upvote' or 'downvote', as exposed by the API"""
+        return VOTE_NAMES[self.vote_type]
+
+    @classmethod
+    def states_for(cls, user_id, post_ids):
+        """
+        The user's vote on each of the given posts, in one IN query.
+
+        The (user_id, post_id) unique index covers the lookup.
+
+        Returns:
+            dict: {post_id: 'upvote' | 'downvote' | None} for every requested id
+        """
+        states = dict.fromkeys(post_ids)
+        if states:
+            rows = (
+                db.session.query(cls.post_id, cls.vote_type)
+                .filter(cls.user_id == user_id, cls.post_id.in_(states))
+                .all()
+            )
+            for post_id, value in rows:
+                states[post_id] = VOTE_NAMES[value]
+        return states
+
+    @classmethod
+    def toggle(cls, user_id, post_id, vote_type):
+        """
+        Apply a vote click with conditional DML instead of read-modify-write.
+
+        Clicking the same vote again removes it, clicking the opposite vote
+        flips it, and otherwise a new vote is inserted. Each step is a single
+        statement whose RETURNING clause says whether it matched, so no Python
+        state can go stale between reading and writing. Caller commits.
+
+        Args:
+            user_id: ID of the voting user
+            post_id: ID of the post being voted on
+            vote_type: 'upvote' or 'downvote'
+
+        Returns:
+            tuple: (upvote_delta, downvote_delta) to apply to the post counters
+        """
+        value = VOTE_VALUES[vote_type]
+        same_vote = (cls.user_id == user_id) & (cls.post_id == post_id)
+
+        removed = db.session.execute(
+            db.delete(cls)
+            .where(same_vote, cls.vote_type == value)
+            .returning(cls.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if removed:
+            return _counter_delta(value, -1)
+
+        flipped = db.session.execute(
+            db.update(cls)
+            .where(same_vote, cls.vote_type == -value)
+            .values(vote_type=value)
+            .returning(cls.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if flipped:
+            up, down = _counter_delta(value, 1)
+            old_up, old_down = _counter_delta(-value, -1)
+            return up + old_up, down + old_down
+
+        # ON CONFLICT DO NOTHING: if a concurrent click from the same user got
+        # here first, the unique index keeps a single row and this click is a no-op
+        inserted = db.session.execute(
+            _insert_ignoring_duplicates(cls)
+            .values(user_id=user_id, post_id=post_id, vote_type=value)
+            .returning(cls.id)
+        ).first()
+        if inserted:
+            return _counter_delta(value, 1)
+        return 0, 0
 
     def __repr__(self):
         return f'<Vote user_id={self.user_id} post_id={self.post_id} vote_type={self.vote_type}>'
+
+
+def _insert_ignoring_duplicates(model):
+    """Dialect-specific INSERT ... ON CONFLICT (user_id, post_id) DO NOTHING"""
+    insert = postgresql_insert if db.engine.dialect.name == 'postgresql' else sqlite_insert
+    return insert(model).on_conflict_do_nothing(index_elements=['user_id', 'post_id'])
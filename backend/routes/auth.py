@@ -2,6 +2,7 @@ from datetime import datetime, timedelta, timezone
 import os
 import re
 import secrets
+import uuid
 
 from app import db, get_real_ip, limiter
 from flask import (
@@ -14,6 +15,7 @@ from flask import (
 )
 from flask_jwt_extended import (
     create_access_token,
+    get_jwt,
     get_jwt_identity,
     jwt_required,
     set_access_cookies,
@@ -21,12 +23,13 @@ from flask_jwt_extended import (
 )
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 from models.user import User
+import redis
 import requests
 from sqlalchemy.exc import IntegrityError
+from utils import login_enrichment, security_counters, sessions, token_versions
 from utils.email import (
     get_2fa_code_email,
     get_email_verification_email,
-    get_login_notification_email,
     get_password_change_confirmation_email,
     get_password_reset_confirmation_email,
     get_password_reset_request_email,
@@ -34,7 +37,7 @@ from utils.email import (
     send_email,
     send_password_reset_admin_alert,
 )
-from utils.login_details import get_location_from_ip, parse_user_agent
+from utils.login_details import parse_user_agent
 from utils.password_validator import validate_password
 
 
@@ -76,10 +79,38 @@ def send_verification_email(user_email):
     # Get professional email template
     subject, html = get_email_verification_email(confirm_url)
 
-    # Send via centralized email system
+    # Queue via centralized email system (caller commits)
     send_email(to=user_email, subject=subject, html=html)
 
 
+def issue_session_token(user, ip_address=None, browser=None, device=None):
+    """
+    Create an access token backed by a new session registry entry.
+
+    If the registry cannot be written the token is issued without the session
+    claim, so it is checked against token_version instead of being rejected.
+
+    Returns:
+        tuple: (access_token, session_expires_at) where session_expires_at is a
+            Unix timestamp in seconds
+    """
+    jwt_expires_seconds = current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES', 14400)
+    claims = {"token_version": user.token_version}
+    jti = str(uuid.uuid4())
+    try:
+        sessions.register(user.id, jti, jwt_expires_seconds, ip_address=ip_address, browser=browser, device=device)
+        claims.update(jti=jti, session=True)
+    except redis.RedisError as e:
+        current_app.logger.warning(f"Session registry unavailable, issuing token_version token: {e!r}")
+
+    # The revocation check compares token_version too; the row was just read
+    token_versions.remember(user.id, user.token_version)
+
+    access_token = create_access_token(identity=str(user.id), additional_claims=claims)
+    session_expires_at = int(datetime.now(timezone.utc).timestamp()) + jwt_expires_seconds
+    return access_token, session_expires_at
+
+
 # VERIFY EMAIL
 @auth_bp.route('/verify-email/<token>', methods=['GET'])
 def verify_email(token):
@@ -144,6 +175,7 @@ def resend_verification():
     if user.is_verified:
         return jsonify({"msg": "Email already verified."}), 400
     send_verification_email(user.email)
+    db.session.commit()
     return jsonify({"msg": "Verification email sent."}), 200
 
 
@@ -191,21 +223,17 @@ def register():
     code = new_user.generate_2fa_code(minutes=10)
 
     db.session.add(new_user)
+
+    # Queue verification code email (committed together with the user)
+    subject, html = get_registration_code_email(code)
+    send_email(to=email, subject=subject, html=html)
+
     try :
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         return {"msg": "Username or email already exists."}, 400
 
-    # Send verification code via email
-    try:
-        subject, html = get_registration_code_email(code)
-        send_email(to=email, subject=subject, html=html)
-    except Exception as e:
-        print(f"Failed to send verification code email: {e!r}")
-        # Don't fail registration if email fails - user can request resend
-        # But log the error
-
     return jsonify({"msg": "Registration successful. Please check your email for a verification code."}), 201
 
 
@@ -229,9 +257,10 @@ def login():
         return jsonify({"msg": "User does not exist"}), 404
 
     if not user.check_password(password):
-        # Record failed login attempt
-        user.record_failed_login()
-        db.session.commit()
+        # Record failed login attempt (buffered in Redis, flushed by the worker)
+        if not security_counters.buffer_failed_login(user.id):
+            user.record_failed_login()
+            db.session.commit()
         return jsonify({"msg": "Incorrect password"}), 401
 
     # Handle unverified users OR 2FA users - both use same 6-digit code flow
@@ -239,18 +268,14 @@ def login():
         # Generate and send code (10 min for unverified, 5 min for 2FA)
         code_expiry_minutes = 10 if not user.is_verified else 5
         code = user.generate_2fa_code(minutes=code_expiry_minutes)
-        db.session.commit()
 
-        # Send appropriate email based on verification status
-        try:
-            if not user.is_verified:
-                subject, html = get_registration_code_email(code)
-            else:
-                subject, html = get_2fa_code_email(code)
-            send_email(to=user.email, subject=subject, html=html)
-        except Exception as e:
-            print(f"Failed to send verification code email: {e!r}")
-            return jsonify({"msg": "Failed to send verification code. Please try again."}), 500
+        # Queue appropriate email based on verification status
+        if not user.is_verified:
+            subject, html = get_registration_code_email(code)
+        else:
+            subject, html = get_2fa_code_email(code)
+        send_email(to=user.email, subject=subject, html=html)
+        db.session.commit()
 
         # Return unified response (frontend treats both the same)
         return jsonify({
@@ -265,43 +290,23 @@ def login():
     login_ip = get_real_ip()
     user_agent_string = request.headers.get('User-Agent', '')
     browser_info, device_info = parse_user_agent(user_agent_string)
-    location_info = get_location_from_ip(login_ip)
 
-    # Record successful login
+    # Record successful login; location and the notification email are
+    # filled in by the background enrichment worker
     user.record_successful_login(
         ip_address=login_ip,
-        location=location_info,
         browser=browser_info,
         device=device_info
     )
     db.session.commit()
+    security_counters.discard_failed_logins(user.id)
+    login_enrichment.enqueue_login(user.id, login_ip, browser=browser_info, device=device_info)
 
-    # Send login notification email (security feature)
-    try:
-        login_time = datetime.now(timezone.utc).strftime('%B %d, %Y at %I:%M %p UTC')
-        subject, html = get_login_notification_email(
-            email=user.email,
-            login_time=login_time,
-            ip_address=login_ip,
-            location=location_info,
-            browser=browser_info,
-            device=device_info
-        )
-        send_email(to=user.email, subject=subject, html=html)
-    except Exception as e:
-        # Don't fail login if email fails - log it
-        print(f"Failed to send login notification: {e!r}")
-
-    # Create access token with token version for invalidation support
-    access_token = create_access_token(
-        identity=str(user.id),
-        additional_claims={"token_version": user.token_version}
+    # Create access token recorded in the session registry
+    access_token, session_expires_at = issue_session_token(
+        user, ip_address=login_ip, browser=browser_info, device=device_info
     )
 
-    # Calculate session expiry timestamp (Unix timestamp in seconds)
-    jwt_expires_seconds = current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES', 14400)
-    session_expires_at = int(datetime.now(timezone.utc).timestamp()) + jwt_expires_seconds
-
     # Set httpOnly cookie and return user info with session expiry
     response = make_response(jsonify({
         'user': user.to_dict(),
@@ -316,8 +321,11 @@ def login():
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
-    """Logout by clearing httpOnly cookie"""
+    """Logout by ending this session and clearing the httpOnly cookie"""
     try:
+        claims = get_jwt()
+        if claims.get('session'):
+            sessions.revoke(int(get_jwt_identity()), claims['jti'])
         response = make_response(jsonify({
             'message': 'Logged out successfully'
         }), 200)
@@ -340,15 +348,14 @@ def extend_session():
         if not user:
             return jsonify({'error': 'User not found'}), 401
 
-        # Create new JWT with fresh 4-hour expiry
-        access_token = create_access_token(
-            identity=str(user.id),
-            additional_claims={"token_version": user.token_version}
+        # Create new JWT with fresh expiry, replacing this session in the registry
+        browser_info, device_info = parse_user_agent(request.headers.get('User-Agent', ''))
+        access_token, session_expires_at = issue_session_token(
+            user, ip_address=get_real_ip(), browser=browser_info, device=device_info
         )
-
-        # Calculate new session expiry timestamp (Unix timestamp in seconds)
-        jwt_expires_seconds = current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES', 14400)
-        session_expires_at = int(datetime.now(timezone.utc).timestamp()) + jwt_expires_seconds
+        claims = get_jwt()
+        if claims.get('session'):
+            sessions.revoke(user.id, claims['jti'])
 
         # Set new httpOnly cookie and return new expiry time
         response = make_response(jsonify({
@@ -363,6 +370,31 @@ def extend_session():
         return jsonify({'error': 'An error occurred while extending session'}), 500
 
 
+# LIST SESSIONS
+@auth_bp.route('/auth/sessions', methods=['GET'])
+@jwt_required()
+def list_sessions():
+    """Active sessions (devices) of the current user, newest first"""
+    current_jti = get_jwt()['jti']
+    user_sessions = sessions.list_for_user(int(get_jwt_identity()))
+    for session in user_sessions:
+        session['current'] = session['id'] == current_jti
+    return jsonify({'sessions': user_sessions}), 200
+
+
+# REVOKE SESSION
+@auth_bp.route('/auth/sessions/<session_id>', methods=['DELETE'])
+@jwt_required()
+def revoke_session(session_id):
+    """End one of the current user's sessions (logs that device out)"""
+    if not sessions.revoke(int(get_jwt_identity()), session_id):
+        return jsonify({'msg': 'Session not found'}), 404
+    response = make_response(jsonify({'msg': 'Session revoked'}), 200)
+    if session_id == get_jwt()['jti']:
+        unset_jwt_cookies(response)
+    return response
+
+
 # FORGOT PASSWORD - Request password reset
 @auth_bp.route('/forgot-password', methods=['POST'])
 @limiter.limit("3 per hour")
@@ -388,20 +420,21 @@ def forgot_password():
     reset_token = secrets.token_urlsafe(32)
     user.reset_token = reset_token
     user.reset_token_expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
-    db.session.commit()
 
-    # Send password reset email using professional template
+    # Queue password reset email using professional template
     reset_url = f"{FRONTEND_URL}/reset-password/{reset_token}"
     subject, html = get_password_reset_request_email(reset_url)
     send_email(to=email, subject=subject, html=html)
 
-    # Send admin security alert for password reset
+    # Queue admin security alert for password reset
     try:
         send_password_reset_admin_alert(email)
     except Exception as e:
         # Don't fail request if admin alert fails - log it
         print(f"Failed to send password reset admin alert: {e!r}")
 
+    db.session.commit()
+
     return jsonify({"msg": "If that email exists, a password reset link has been sent."}), 200
 
 
@@ -434,15 +467,11 @@ def reset_password():
     user.password_reset_count += 1
     user.reset_token = None
     user.reset_token_expiry = None
-    db.session.commit()
 
-    # Send password reset confirmation email
-    try:
-        subject, html = get_password_reset_confirmation_email(user.email)
-        send_email(to=user.email, subject=subject, html=html)
-    except Exception as e:
-        # Don't fail request if email fails - log it
-        print(f"Failed to send password reset confirmation email: {e!r}")
+    # Queue password reset confirmation email
+    subject, html = get_password_reset_confirmation_email(user.email)
+    send_email(to=user.email, subject=subject, html=html)
+    db.session.commit()
 
     return jsonify({"msg": "Password has been reset successfully"}), 200
 
@@ -478,42 +507,23 @@ def verify_2fa():
     login_ip = get_real_ip()
     user_agent_string = request.headers.get('User-Agent', '')
     browser_info, device_info = parse_user_agent(user_agent_string)
-    location_info = get_location_from_ip(login_ip)
 
-    # Record successful login
+    # Record successful login; location and the notification email are
+    # filled in by the background enrichment worker
     user.record_successful_login(
         ip_address=login_ip,
-        location=location_info,
         browser=browser_info,
         device=device_info
     )
     db.session.commit()
+    security_counters.discard_failed_logins(user.id)
+    login_enrichment.enqueue_login(user.id, login_ip, browser=browser_info, device=device_info)
 
-    # Send login notification email
-    try:
-        login_time = datetime.now(timezone.utc).strftime('%B %d, %Y at %I:%M %p UTC')
-        subject, html = get_login_notification_email(
-            email=user.email,
-            login_time=login_time,
-            ip_address=login_ip,
-            location=location_info,
-            browser=browser_info,
-            device=device_info
-        )
-        send_email(to=user.email, subject=subject, html=html)
-    except Exception as e:
-        print(f"Failed to send login notification: {e!r}")
-
-    # Create access token
-    access_token = create_access_token(
-        identity=str(user.id),
-        additional_claims={"token_version": user.token_version}
+    # Create access token recorded in the session registry
+    access_token, session_expires_at = issue_session_token(
+        user, ip_address=login_ip, browser=browser_info, device=device_info
     )
 
-    # Calculate session expiry timestamp (Unix timestamp in seconds)
-    jwt_expires_seconds = current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES', 14400)
-    session_expires_at = int(datetime.now(timezone.utc).timestamp()) + jwt_expires_seconds
-
     # Set httpOnly cookie and return user info with session expiry
     response = make_response(jsonify({
         'user': user.to_dict(),
@@ -578,15 +588,11 @@ def change_password():
         # Set new password and invalidate all existing tokens
         user.set_password(new_password)
         user.invalidate_tokens()  # Invalidate all existing JWT tokens
-        db.session.commit()
 
-        # Send password change confirmation email
-        try:
-            subject, html = get_password_change_confirmation_email(user.email)
-            send_email(to=user.email, subject=subject, html=html)
-        except Exception as e:
-            print(f"Failed to send password change confirmation email: {e!r}")
-            # Don't fail the request if email fails
+        # Queue password change confirmation email
+        subject, html = get_password_change_confirmation_email(user.email)
+        send_email(to=user.email, subject=subject, html=html)
+        db.session.commit()
 
         return jsonify({'message': 'Password changed successfully'}), 200
 
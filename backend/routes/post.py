@@ -3,27 +3,157 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from models.comment import Comment
 from models.post import BlogPost
+from models.tag import Tag, normalize_tag, post_tags
 from models.vote import Vote
+from utils import vote_buffer
+from utils.overview_cache import invalidate_overview
+from utils.pagination import (
+    MAX_PAGE_LIMIT,
+    InvalidCursorError,
+    paginate_keyset,
+    parse_limit,
+)
+from utils.search import MAX_QUERY_LENGTH, search_posts
 
 
 post_bp = Blueprint('post', __name__)
 
+# ?sort= modes for the feed, each backed by a (column, id) index
+SORT_COLUMNS = {
+    'new': BlogPost.created_at,
+    'top': BlogPost.score,
+    'hot': BlogPost.hot_rank,
+}
+
 # GET ALL POSTS
 @post_bp.route('/posts', methods=['GET'])
 def get_posts():
+    """
+    List posts using keyset pagination over (sort key, id).
+
+    Query params:
+        sort: "new" (default, by created_at), "top" (by score) or "hot" (by hot_rank)
+        limit: Page size (1-100, default 20)
+        cursor: Opaque next_cursor value from the previous page
+        view: "full" (default) or "summary" (excerpt instead of content)
+        tag: Only posts carrying this tag (served by the post_tags index)
+        all: "true" returns the legacy unpaginated list (transitional)
+    """
     try:
-        posts = BlogPost.query.all()
-        return jsonify([post.to_dict() for post in posts]), 200
+        view = request.args.get('view', 'full')
+        if view not in ('full', 'summary'):
+            return jsonify({'msg': "View must be 'full' or 'summary'"}), 400
+        summary = view == 'summary'
+        serialize = BlogPost.to_summary_dict if summary else BlogPost.to_dict
+        query = BlogPost.query_for_list(summary=summary)
+
+        sort = request.args.get('sort', 'new')
+        if sort not in SORT_COLUMNS:
+            return jsonify({'msg': "Sort must be 'new', 'top' or 'hot'"}), 400
+        sort_col = SORT_COLUMNS[sort]
+
+        tag_name = request.args.get('tag')
+        if tag_name is not None:
+            query = (
+                query.join(post_tags, post_tags.c.post_id == BlogPost.id)
+                .join(Tag, Tag.id == post_tags.c.tag_id)
+                .filter(Tag.name == normalize_tag(tag_name))
+            )
+
+        if request.args.get('all', '').lower() in ('true', '1', 'yes'):
+            posts = query.order_by(sort_col.desc(), BlogPost.id.desc()).all()
+            return jsonify(vote_buffer.merge_pending_votes([serialize(post) for post in posts])), 200
+
+        try:
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({'msg': str(e)}), 400
+
+        try:
+            posts, next_cursor = paginate_keyset(
+                query, sort_col, BlogPost.id,
+                limit, request.args.get('cursor')
+            )
+        except InvalidCursorError as e:
+            return jsonify({'msg': str(e)}), 400
+
+        return jsonify({
+            'posts': vote_buffer.merge_pending_votes([serialize(post) for post in posts]),
+            'next_cursor': next_cursor
+        }), 200
     except Exception as e:
         return jsonify({'msg': str(e)}), 500
 
+# GET TAGS WITH USAGE COUNTS
+@post_bp.route('/tags', methods=['GET'])
+def get_tags():
+    """Most-used tags and how many posts carry each (cached briefly per worker)"""
+    return jsonify(Tag.usage_counts()), 200
+
+# SEARCH POSTS
+@post_bp.route('/posts/search', methods=['GET'])
+def search():
+    """
+    Ranked full-text search over title, content and tags.
+
+    Query params:
+        q: Search text (1-100 characters)
+        limit: Page size (1-100, default 20)
+        cursor: Opaque next_cursor value from the previous page
+    """
+    query_text = request.args.get('q', '').strip()
+    if not query_text:
+        return jsonify({'msg': 'Search query is required'}), 400
+    if len(query_text) > MAX_QUERY_LENGTH:
+        return jsonify({'msg': f'Search query too long (max {MAX_QUERY_LENGTH} characters)'}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'msg': str(e)}), 400
+
+    try:
+        posts, next_cursor = search_posts(query_text, limit, request.args.get('cursor'))
+    except InvalidCursorError as e:
+        return jsonify({'msg': str(e)}), 400
+
+    return jsonify({
+        'posts': vote_buffer.merge_pending_votes([post.to_summary_dict() for post in posts]),
+        'next_cursor': next_cursor
+    }), 200
+
+# GET CURRENT USER'S VOTES ON A SET OF POSTS
+@post_bp.route('/posts/votes/me', methods=['GET'])
+@jwt_required()
+def get_my_votes():
+    """
+    Vote state for up to 100 posts, so a feed page needs one request instead of N.
+
+    Query params:
+        ids: Comma-separated post IDs, e.g. ?ids=1,2,3
+
+    Returns:
+        {"votes": {"<post_id>": "upvote" | "downvote" | null, ...}}
+    """
+    raw_ids = [raw.strip() for raw in request.args.get('ids', '').split(',') if raw.strip()]
+    if not raw_ids:
+        return jsonify({'msg': 'ids is required'}), 400
+    if not all(raw.isdigit() for raw in raw_ids):
+        return jsonify({'msg': 'ids must be comma-separated post IDs'}), 400
+    post_ids = list(dict.fromkeys(int(raw) for raw in raw_ids))
+    if len(post_ids) > MAX_PAGE_LIMIT:
+        return jsonify({'msg': f'At most {MAX_PAGE_LIMIT} ids per request'}), 400
+
+    states = Vote.states_for(int(get_jwt_identity()), post_ids)
+    return jsonify({'votes': {str(post_id): state for post_id, state in states.items()}}), 200
+
 # GET POST BY ID
 @post_bp.route('/posts/<int:post_id>', methods=['GET'])
 def get_post(post_id):
     post = BlogPost.query.get(post_id)
     if not post:
         return jsonify({"msg": "Post not found"}), 404
-    return jsonify(post.to_dict()), 200
+    return jsonify(vote_buffer.merge_pending_votes([post.to_dict()])[0]), 200
 
 # CREATE POST
 @post_bp.route('/posts', methods=['POST'])
@@ -59,8 +189,10 @@ def create_post():
                 return jsonify({"msg": "Empty tags are not allowed"}), 400
 
     new_post = BlogPost(title=title, content=content, topic_tags=topic_tags, user_id=user_id) # type: ignore
+    new_post.set_tags(tags if topic_tags else [])
     db.session.add(new_post)
     db.session.commit()
+    invalidate_overview(new_post.user_id)
     return jsonify(new_post.to_dict()), 201
 
 # UPDATE POST
@@ -105,7 +237,9 @@ def update_post(post_id):
     post.title = title
     post.content = content
     post.topic_tags = topic_tags
+    post.set_tags(tags if topic_tags else [])
     db.session.commit()
+    invalidate_overview(post.user_id)
     return jsonify({"msg": "Post updated successfully", "post": post.to_dict()}), 200
 
 # DELETE POST
@@ -120,55 +254,65 @@ def delete_post(post_id):
         return jsonify({"msg": "You are not authorized to delete this post"}), 403
     db.session.delete(post)
     db.session.commit()
+    Tag.invalidate_usage_counts()
+    invalidate_overview(int(user_id))
     return jsonify({"msg": "Post deleted successfully"}), 200
 
+def _cast_vote(post_id, vote_type):
+    """
+    Toggle the current user's vote and update the post counters atomically.
+
+    With VOTE_BUFFER_ENABLED the counter change is queued in Redis instead of
+    touching the (possibly hot) blog_posts row; it falls back to writing
+    through if Redis is unavailable.
+
+    Returns:
+        tuple: (upvotes, downvotes) after the vote, or None if the post does not exist
+    """
+    user_id = int(get_jwt_identity())
+    post = (
+        db.session.query(BlogPost.id, BlogPost.user_id, BlogPost.created_at, BlogPost.upvotes, BlogPost.downvotes)
+        .filter_by(id=post_id)
+        .first()
+    )
+    if not post:
+        return None
+    upvote_delta, downvote_delta = Vote.toggle(user_id, post_id, vote_type)
+
+    if vote_buffer.is_enabled():
+        db.session.commit()
+        # The voter's voted-posts list and the author's vote totals both change
+        invalidate_overview(user_id, post.user_id)
+        if vote_buffer.buffer_vote_delta(post_id, upvote_delta, downvote_delta):
+            merged = vote_buffer.merge_pending_votes([
+                {'id': post_id, 'upvotes': post.upvotes, 'downvotes': post.downvotes}
+            ])[0]
+            return merged['upvotes'], merged['downvotes']
+
+    counts = BlogPost.apply_vote_delta(post_id, post.created_at, upvote_delta, downvote_delta)
+    db.session.commit()
+    invalidate_overview(user_id, post.user_id)
+    return counts
+
 # UPVOTE POST
 @post_bp.route('/posts/<int:post_id>/upvote', methods=['POST'])
 @jwt_required()
 def upvote_post(post_id):
-    user_id = get_jwt_identity()
-    post = BlogPost.query.get(post_id)
-    if not post:
+    counts = _cast_vote(post_id, 'upvote')
+    if counts is None:
         return jsonify({"msg": "Post not found"}), 404
-    existing_vote = Vote.query.filter_by(user_id=user_id, post_id=post_id).first()
-    if existing_vote:
-        if existing_vote.vote_type == 'upvote':
-            db.session.delete(existing_vote)
-            post.upvotes -= 1
-        else:
-            existing_vote.vote_type = 'upvote'
-            post.upvotes += 1
-            post.downvotes -= 1
-    else:
-        new_vote = Vote(user_id=user_id, post_id=post_id, vote_type='upvote') # type: ignore
-        db.session.add(new_vote)
-        post.upvotes += 1
-    db.session.commit()
-    return jsonify({"msg": "Post upvoted successfully", "upvotes": post.upvotes, "downvotes": post.downvotes}), 200
+    upvotes, downvotes = counts
+    return jsonify({"msg": "Post upvoted successfully", "upvotes": upvotes, "downvotes": downvotes}), 200
 
 # DOWNVOTE POST
 @post_bp.route('/posts/<int:post_id>/downvote', methods=['POST'])
 @jwt_required()
 def downvote_post(post_id):
-    user_id = get_jwt_identity()
-    post = BlogPost.query.get(post_id)
-    if not post:
+    counts = _cast_vote(post_id, 'downvote')
+    if counts is None:
         return jsonify({"msg": "Post not found"}), 404
-    existing_vote = Vote.query.filter_by(user_id=user_id, post_id=post_id).first()
-    if existing_vote:
-        if existing_vote.vote_type == 'downvote':
-            db.session.delete(existing_vote)
-            post.downvotes -= 1
-        else:
-            existing_vote.vote_type = 'downvote'
-            post.downvotes += 1
-            post.upvotes -= 1
-    else:
-        new_vote = Vote(user_id=user_id, post_id=post_id, vote_type='downvote') # type: ignore
-        db.session.add(new_vote)
-        post.downvotes += 1
-    db.session.commit()
-    return jsonify({"msg": "Post downvoted successfully", "upvotes": post.upvotes, "downvotes": post.downvotes}), 200
+    upvotes, downvotes = counts
+    return jsonify({"msg": "Post downvoted successfully", "upvotes": upvotes, "downvotes": downvotes}), 200
 
 # COMMENT ON POST
 @post_bp.route('/posts/<int:post_id>/comments', methods=['POST'])
@@ -190,17 +334,48 @@ def add_comment(post_id):
 
     comment = Comment(content=content, user_id=user_id, post_id=post_id) # type: ignore
     db.session.add(comment)
+    BlogPost.adjust_comment_count(post_id, 1)
     db.session.commit()
+    invalidate_overview(comment.user_id, post.user_id)
     return jsonify(comment.to_dict()), 201
 
 # GET COMMENTS FOR POST
 @post_bp.route('/posts/<int:post_id>/comments', methods=['GET'])
 def get_comments(post_id):
-    post = BlogPost.query.get(post_id)
-    if not post:
+    """
+    List a post's comments oldest first, using keyset pagination over (created_at, id).
+
+    Query params:
+        limit: Page size (1-100, default 20)
+        cursor: Opaque next_cursor value from the previous page
+        all: "true" returns the legacy unpaginated list (transitional)
+    """
+    query = Comment.query_for_thread(post_id)
+    legacy_list = request.args.get('all', '').lower() in ('true', '1', 'yes')
+
+    if legacy_list:
+        page, next_cursor = query.order_by(Comment.created_at, Comment.id).all(), None
+    else:
+        try:
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({'msg': str(e)}), 400
+        try:
+            page, next_cursor = paginate_keyset(
+                query, Comment.created_at, Comment.id,
+                limit, request.args.get('cursor'), descending=False
+            )
+        except InvalidCursorError as e:
+            return jsonify({'msg': str(e)}), 400
+
+    # Only an empty result needs the existence check, so a non-empty page is one query
+    if not page and not db.session.query(BlogPost.id).filter_by(id=post_id).first():
         return jsonify({"msg": "Post not found"}), 404
-    comments = Comment.query.filter_by(post_id=post_id).all()
-    return jsonify([comment.to_dict() for comment in comments]), 200
+
+    serialized = [comment.to_dict() for comment in page]
+    if legacy_list:
+        return jsonify(serialized), 200
+    return jsonify({'comments': serialized, 'next_cursor': next_cursor}), 200
 
 # DELETE COMMENT
 @post_bp.route('/posts/<int:post_id>/comments/<int:comment_id>', methods=['DELETE'])
@@ -215,5 +390,7 @@ def delete_comment(post_id, comment_id):
     if comment.user_id != int(user_id):
         return jsonify({"msg": "You are not authorized to delete this comment"}), 403
     db.session.delete(comment)
+    BlogPost.adjust_comment_count(post_id, -1)
     db.session.commit()
+    invalidate_overview(comment.user_id, db.session.query(BlogPost.user_id).filter_by(id=post_id).scalar())
     return jsonify({"msg": "Comment deleted successfully"}), 200
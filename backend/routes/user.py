@@ -5,9 +5,14 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from models.comment import Comment
 from models.post import BlogPost
+from models.tag import Tag, post_tags
 from models.user import User
-from models.vote import Vote
+from models.vote import VOTE_NAMES, Vote
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
+from utils import sessions, token_versions, vote_buffer
+from utils.overview_cache import get_overview, invalidate_overview, set_overview
+from utils.pagination import InvalidCursorError, paginate_keyset, parse_limit
 
 
 user_bp = Blueprint('user', __name__)
@@ -61,6 +66,7 @@ def update_profile():
     except IntegrityError:
         db.session.rollback()
         return jsonify({"msg": "Username or email is already taken"}), 400
+    invalidate_overview(user.id)
 
     # Return the updated user object (matches GET /profile pattern)
     return jsonify({
@@ -81,10 +87,28 @@ def delete_profile():
     if not user:
         return jsonify({"msg": "User not found"}), 404
     Vote.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+    # Keep comment_count correct on other users' posts before bulk-deleting comments
+    comment_counts = (
+        db.session.query(Comment.post_id, func.count(Comment.id))
+        .filter(Comment.user_id == user.id)
+        .group_by(Comment.post_id)
+        .all()
+    )
+    for post_id, count in comment_counts:
+        BlogPost.adjust_comment_count(post_id, -count)
     Comment.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+    db.session.execute(
+        post_tags.delete().where(
+            post_tags.c.post_id.in_(select(BlogPost.id).where(BlogPost.user_id == user.id))
+        )
+    )
     BlogPost.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+    Tag.invalidate_usage_counts()
+    token_versions.forget_after_commit(user.id)
+    sessions.revoke_all_after_commit(user.id)
     db.session.delete(user)
     db.session.commit()
+    invalidate_overview(int(user_id))
     return jsonify({"msg": "Account and all related data deleted successfully"}), 200
 
 # GET USER PROFILE BY USERNAME
@@ -137,14 +161,47 @@ def get_all_users():
     except Exception:
         return jsonify({'error': 'An error occurred'}), 500
 
+def _user_posts_query(user_id, summary=False):
+    """A user's own posts with the author eagerly joined"""
+    return BlogPost.query_for_list(summary=summary).filter(BlogPost.user_id == user_id)
+
 # GET USER POSTS BY USERNAME
 @user_bp.route('/users/<string:username>/posts', methods=['GET'])
 def get_user_posts(username):
+    """
+    A user's posts, newest first.
+
+    Query params:
+        view: "full" (default) or "summary" (excerpt instead of content)
+        limit, cursor: Opt in to keyset pagination ({posts, next_cursor});
+            without them the full list is returned
+    """
     user = User.query.filter_by(username=username).first()
     if not user:
         return jsonify({"msg": "User not found"}), 404
-    posts = BlogPost.query.filter_by(user_id=user.id).all()
-    return jsonify([post.to_dict() for post in posts]), 200
+    view = request.args.get('view', 'full')
+    if view not in ('full', 'summary'):
+        return jsonify({"msg": "View must be 'full' or 'summary'"}), 400
+    summary = view == 'summary'
+    serialize = BlogPost.to_summary_dict if summary else BlogPost.to_dict
+    query = _user_posts_query(user.id, summary)
+
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        posts = query.order_by(BlogPost.created_at.desc(), BlogPost.id.desc()).all()
+        return jsonify(vote_buffer.merge_pending_votes([serialize(post) for post in posts])), 200
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'msg': str(e)}), 400
+    try:
+        posts, next_cursor = paginate_keyset(query, BlogPost.created_at, BlogPost.id, limit, request.args.get('cursor'))
+    except InvalidCursorError as e:
+        return jsonify({'msg': str(e)}), 400
+    return jsonify({
+        'posts': vote_buffer.merge_pending_votes([serialize(post) for post in posts]),
+        'next_cursor': next_cursor
+    }), 200
 
 # GET USER VOTES COUNT BY USERNAME
 @user_bp.route('/users/<string:username>/votes/count', methods=['GET'])
@@ -164,52 +221,185 @@ def get_user_comments_count(username):
     count = Comment.query.filter_by(user_id=user.id).count()
     return jsonify({"count": count}), 200
 
+def _voted_posts_query(user_id):
+    """
+    Posts a user voted on as a single votes -> blog_posts join.
+
+    The author is eagerly joined and comment_count is stored, so serializing
+    the rows issues no further statements. Rows are (post, vote_type,
+    created_at, id), where the last two are the vote's keyset columns.
+    """
+    return (
+        BlogPost.query_for_list()
+        .join(Vote, Vote.post_id == BlogPost.id)
+        .filter(Vote.user_id == user_id)
+        .add_columns(Vote.vote_type, Vote.created_at.label('created_at'), Vote.id.label('id'))
+    )
+
+
+def _serialize_voted_posts(rows):
+    posts = []
+    for post, vote_type, _voted_at, _vote_id in rows:
+        post_dict = post.to_dict()
+        post_dict['user_vote'] = VOTE_NAMES[vote_type]
+        posts.append(post_dict)
+    return vote_buffer.merge_pending_votes(posts)
+
 # GET POSTS USER HAS VOTED ON
 @user_bp.route('/users/<string:username>/voted-posts', methods=['GET'])
 def get_user_voted_posts(username):
-    """Get all posts that a user has voted on"""
+    """
+    Posts a user has voted on, most recent vote first.
+
+    Query params:
+        limit: Page size (1-100, default 20)
+        cursor: Opaque next_cursor value from the previous page
+        all: "true" returns the legacy unpaginated list (transitional)
+    """
     user = User.query.filter_by(username=username).first()
     if not user:
         return jsonify({"msg": "User not found"}), 404
+    query = _voted_posts_query(user.id)
 
-    # Get all votes by this user with their associated posts
-    votes = Vote.query.filter_by(user_id=user.id).all()
+    if request.args.get('all', '').lower() in ('true', '1', 'yes'):
+        rows = query.order_by(Vote.created_at.desc(), Vote.id.desc()).all()
+        return jsonify(_serialize_voted_posts(rows)), 200
 
-    # Get the posts and include user's vote type
-    posts_with_votes = []
-    for vote in votes:
-        post = BlogPost.query.get(vote.post_id)
-        if post:
-            post_dict = post.to_dict()
-            post_dict['user_vote'] = vote.vote_type
-            posts_with_votes.append(post_dict)
-
-    return jsonify(posts_with_votes), 200
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'msg': str(e)}), 400
+    try:
+        rows, next_cursor = paginate_keyset(query, Vote.created_at, Vote.id, limit, request.args.get('cursor'))
+    except InvalidCursorError as e:
+        return jsonify({'msg': str(e)}), 400
+    return jsonify({'posts': _serialize_voted_posts(rows), 'next_cursor': next_cursor}), 200
+
+def _commented_posts_query(user_id):
+    """
+    Posts a user commented on, each with the user's latest comment, in one statement.
+
+    Rows are (post, content, created_at, id), where the last three describe
+    the latest comment and (created_at, id) are its keyset columns. Returns
+    the query and the latest-comment subquery (for ordering and the cursor).
+    """
+    latest = Comment.latest_per_post(user_id)
+    query = (
+        BlogPost.query_for_list()
+        .join(latest, latest.c.post_id == BlogPost.id)
+        .add_columns(latest.c.content, latest.c.created_at.label('created_at'), latest.c.id.label('id'))
+    )
+    return query, latest
+
+
+def _serialize_commented_posts(rows):
+    posts = []
+    for post, content, commented_at, _comment_id in rows:
+        post_dict = post.to_dict()
+        post_dict['user_comment'] = {
+            'content': content,
+            'created_at': commented_at.isoformat() if commented_at else None
+        }
+        posts.append(post_dict)
+    return vote_buffer.merge_pending_votes(posts)
 
 # GET POSTS USER HAS COMMENTED ON
 @user_bp.route('/users/<string:username>/commented-posts', methods=['GET'])
 def get_user_commented_posts(username):
-    """Get all posts that a user has commented on, with their comment preview"""
+    """
+    Posts a user has commented on with their latest comment as a preview,
+    most recently commented first.
+
+    Query params:
+        limit: Page size (1-100, default 20)
+        cursor: Opaque next_cursor value from the previous page
+        all: "true" returns the legacy unpaginated list (transitional)
+    """
     user = User.query.filter_by(username=username).first()
     if not user:
         return jsonify({"msg": "User not found"}), 404
+    query, latest = _commented_posts_query(user.id)
+
+    if request.args.get('all', '').lower() in ('true', '1', 'yes'):
+        rows = query.order_by(latest.c.created_at.desc(), latest.c.id.desc()).all()
+        return jsonify(_serialize_commented_posts(rows)), 200
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'msg': str(e)}), 400
+    try:
+        rows, next_cursor = paginate_keyset(query, latest.c.created_at, latest.c.id, limit, request.args.get('cursor'))
+    except InvalidCursorError as e:
+        return jsonify({'msg': str(e)}), 400
+    return jsonify({'posts': _serialize_commented_posts(rows), 'next_cursor': next_cursor}), 200
+
+def _overview_counts(user_id):
+    """
+    Profile statistics for one user in a single aggregate statement.
+
+    Returns:
+        dict: posts, votes and comments made, plus votes and comments received
+    """
+    post_stats = (
+        select(
+            func.count(BlogPost.id).label('posts'),
+            func.coalesce(func.sum(BlogPost.upvotes + BlogPost.downvotes), 0).label('votes_received'),
+            func.coalesce(func.sum(BlogPost.comment_count), 0).label('comments_received'),
+        )
+        .where(BlogPost.user_id == user_id)
+        .subquery()
+    )
+    votes = select(func.count(Vote.id)).where(Vote.user_id == user_id).scalar_subquery()
+    comments = select(func.count(Comment.id)).where(Comment.user_id == user_id).scalar_subquery()
+    row = db.session.execute(select(post_stats, votes.label('votes'), comments.label('comments'))).one()
+    return {
+        'posts': row.posts,
+        'votes': row.votes,
+        'comments': row.comments,
+        # SUM() is numeric on Postgres; ints keep the overview JSON-cacheable
+        'votes_received': int(row.votes_received),
+        'comments_received': int(row.comments_received),
+    }
+
+# GET USER PROFILE OVERVIEW
+@user_bp.route('/users/<string:username>/overview', methods=['GET'])
+def get_user_overview(username):
+    """
+    Everything the profile page needs in one request: the user, their counts
+    and the first page of their posts, voted posts and commented posts.
+
+    The user is resolved once; the lists and counts are cached per user for
+    OVERVIEW_TTL seconds and invalidated by that user's writes. Each list's
+    next_cursor continues on its own endpoint.
+
+    Query params:
+        limit: Page size for each list (1-100, default 20)
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except ValueError as e:
+        return jsonify({'msg': str(e)}), 400
 
-    # Get distinct posts user has commented on
-    # For each post, include user's most recent comment as a preview
-    comments = Comment.query.filter_by(user_id=user.id).order_by(Comment.created_at.desc()).all()
-
-    # Track unique posts and their most recent comment from this user
-    seen_posts = {}
-    for comment in comments:
-        if comment.post_id not in seen_posts:
-            post = BlogPost.query.get(comment.post_id)
-            if post:
-                post_dict = post.to_dict()
-                post_dict['user_comment'] = {
-                    'content': comment.content,
-                    'created_at': comment.created_at.isoformat() if comment.created_at else None
-                }
-                seen_posts[comment.post_id] = post_dict
-
-    return jsonify(list(seen_posts.values())), 200
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        return jsonify({"msg": "User not found"}), 404
 
+    overview = get_overview(user.id, limit)
+    if overview is None:
+        posts, posts_cursor = paginate_keyset(_user_posts_query(user.id), BlogPost.created_at, BlogPost.id, limit)
+        voted_rows, voted_cursor = paginate_keyset(_voted_posts_query(user.id), Vote.created_at, Vote.id, limit)
+        commented_query, latest = _commented_posts_query(user.id)
+        commented_rows, commented_cursor = paginate_keyset(commented_query, latest.c.created_at, latest.c.id, limit)
+        overview = {
+            'counts': _overview_counts(user.id),
+            'posts': {
+                'posts': vote_buffer.merge_pending_votes([post.to_dict() for post in posts]),
+                'next_cursor': posts_cursor
+            },
+            'voted_posts': {'posts': _serialize_voted_posts(voted_rows), 'next_cursor': voted_cursor},
+            'commented_posts': {'posts': _serialize_commented_posts(commented_rows), 'next_cursor': commented_cursor},
+        }
+        set_overview(user.id, limit, overview)
+
+    return jsonify({'user': user.to_dict(), **overview}), 200
@@ -4,6 +4,7 @@ import os
 from app import create_app, db
 from models.comment import Comment
 from models.post import BlogPost
+from models.tag import Tag
 from models.user import User
 from models.vote import Vote
 
@@ -16,6 +17,7 @@ def make_shell_context():
         'db': db,
         'User': User,
         'BlogPost': BlogPost,
+        'Tag': Tag,
         'Vote': Vote,
         'Comment': Comment
     }
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for rendering the HTML emails from the compiled templates.
+
+Usage:
+    python scripts/bench_email_templates.py [emails]
+
+Prints the per-email cost of rendering the login notification and the 2FA
+code email one at a time and through render_batch, plus the one-off cost of
+compiling the templates in a fresh environment (paid once at import).
+"""
+
+from pathlib import Path
+import sys
+import time
+
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.email_templates import (
+    SUBJECTS,
+    create_environment,
+    render_batch,
+    render_email,
+)
+
+
+def login_context(i):
+    return {
+        'email': f'user{i}@example.com',
+        'login_time': 'January 01, 2025 at 10:00 AM UTC',
+        'ip_address': f'203.0.113.{i % 250}',
+        'location': 'Paris, France',
+        'browser': 'Chrome 120.0.0',
+        'device': 'Desktop (Windows)',
+        'frontend_url': 'https://computeranything.dev',
+    }
+
+
+def code_context(i):
+    return {'code': f'{i % 1000000:06d}'}
+
+
+def per_email(func, emails) -> float:
+    """Average microseconds per email"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) / emails * 1e6
+
+
+def main():
+    """Main entry point for the script."""
+    emails = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    print(f"{emails} emails per template")
+    for name, make_context in (('login_notification', login_context), ('2fa_code', code_context)):
+        contexts = [make_context(i) for i in range(emails)]
+        single = per_email(lambda n=name, c=contexts: [render_email(n, **ctx) for ctx in c], emails)
+        batch = per_email(lambda n=name, c=contexts: render_batch(n, c), emails)
+        print(f"  {name}:")
+        print(f"    render_email: {single:8.2f} us/email")
+        print(f"    render_batch: {batch:8.2f} us/email")
+
+    start = time.perf_counter()
+    env = create_environment()
+    for name in SUBJECTS:
+        env.get_template(f'{name}.html')
+    print(f"  compiling all {len(SUBJECTS)} templates: {(time.perf_counter() - start) * 1e3:.1f} ms (once per process)")
+
+
+if __name__ == '__main__':
+    main()
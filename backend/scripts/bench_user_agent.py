@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for parse_user_agent with and without its LRU cache.
+
+Usage:
+    python scripts/bench_user_agent.py [calls]
+
+Replays a corpus of real browser User-Agent strings (skewed the way login
+traffic is: a few common browsers dominate) through the uncached parser and
+the memoized parse_user_agent, and prints the per-call cost of each.
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import Flask
+from utils.login_details import (
+    _parse_user_agent_cached,
+    clear_user_agent_cache,
+    parse_user_agent,
+    user_agent_cache_stats,
+)
+
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (iPad; CPU OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.6099.144 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 13; SM-X700) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 14; SAMSUNG SM-S911B) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/23.0 Chrome/115.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/120.0.6099.119 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 OPR/106.0.0.0',
+    'Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+]
+
+
+def bench(parse, calls, corpus) -> float:
+    """Average microseconds per call over a skewed replay of the corpus"""
+    rng = random.Random(42)
+    weights = [1 / (rank + 1) for rank in range(len(corpus))]
+    sample = rng.choices(corpus, weights=weights, k=calls)
+    start = time.perf_counter()
+    for user_agent in sample:
+        parse(user_agent)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    """Main entry point for the script."""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    # parse_user_agent logs through current_app on failures
+    with Flask(__name__).app_context():
+        uncached = bench(_parse_user_agent_cached.__wrapped__, calls, USER_AGENTS)
+        clear_user_agent_cache()
+        cached = bench(parse_user_agent, calls, USER_AGENTS)
+        stats = user_agent_cache_stats()
+
+    print(f"{len(USER_AGENTS)} distinct User-Agents, {calls} calls")
+    print(f"  uncached: {uncached:8.2f} us/call")
+    print(f"  cached:   {cached:8.2f} us/call  ({uncached / cached:.0f}x)")
+    print(f"  cache:    {stats['hits']} hits, {stats['misses']} misses, {stats['size']}/{stats['maxsize']} entries")
+
+
+if __name__ == '__main__':
+    main()
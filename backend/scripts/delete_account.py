@@ -20,8 +20,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app import create_app, db
 from models.comment import Comment
 from models.post import BlogPost
+from models.tag import Tag, post_tags
 from models.user import User
 from models.vote import Vote
+from sqlalchemy import func, select
+from utils import sessions, token_versions
 
 
 def delete_user_account(identifier: str) -> bool:
@@ -73,10 +76,26 @@ def delete_user_account(identifier: str) -> bool:
         try:
             # Delete all associated data
             Vote.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+            comment_counts = (
+                db.session.query(Comment.post_id, func.count(Comment.id))
+                .filter(Comment.user_id == user.id)
+                .group_by(Comment.post_id)
+                .all()
+            )
+            for post_id, count in comment_counts:
+                BlogPost.adjust_comment_count(post_id, -count)
             Comment.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+            db.session.execute(
+                post_tags.delete().where(
+                    post_tags.c.post_id.in_(select(BlogPost.id).where(BlogPost.user_id == user.id))
+                )
+            )
             BlogPost.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+            Tag.invalidate_usage_counts()
 
-            # Delete user
+            # Delete user (and revoke their cached token_version and sessions in every worker)
+            token_versions.forget_after_commit(user.id)
+            sessions.revoke_all_after_commit(user.id)
             db.session.delete(user)
             db.session.commit()
 
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Script to download and install the local IP geolocation database.
+
+Usage:
+    python scripts/refresh_geoip.py [source]
+
+source is a URL or local file and defaults to GEOIP_SOURCE_URL, or else this
+month's DB-IP "IP to City Lite" CSV (CC BY 4.0). The result is written to
+GEOIP_DATABASE_PATH:
+
+    *.csv / *.csv.gz   compiled into a range table (see utils/geoip.py)
+    *.mmdb / *.mmdb.gz installed as-is (GEOIP_DATABASE_PATH must end in .mmdb)
+
+The file is replaced atomically, so running web workers switch over within a
+minute without a restart. Run it monthly (e.g. from cron).
+"""
+
+import csv
+from datetime import datetime, timezone
+import gzip
+import os
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+import requests
+from utils.geoip import build_range_table
+
+
+DBIP_URL = 'https://download.db-ip.com/free/dbip-city-lite-{month}.csv.gz'
+
+
+def default_source() -> str:
+    month = datetime.now(tz=timezone.utc).strftime('%Y-%m')
+    return os.environ.get('GEOIP_SOURCE_URL') or DBIP_URL.format(month=month)
+
+
+def fetch(source: str, directory: str) -> str:
+    """Download a URL (or use a local file) and return an uncompressed local path"""
+    if source.startswith(('http://', 'https://')):
+        fd, downloaded = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'wb') as f, requests.get(source, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            shutil.copyfileobj(response.raw, f)
+        path = downloaded
+    else:
+        path = source
+
+    if not source.endswith('.gz'):
+        return path
+    fd, unpacked = tempfile.mkstemp(dir=directory)
+    with gzip.open(path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    return unpacked
+
+
+def dbip_rows(path: str):
+    """(start_ip, end_ip, location) from a DB-IP city CSV"""
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if len(row) < 6:
+                continue
+            start_ip, end_ip, _continent, country, _region, city = row[:6]
+            yield start_ip, end_ip, f"{city}, {country}" if city else country
+
+
+def refresh_geoip(source: str, output: str) -> bool:
+    """
+    Install a fresh geolocation database at output.
+
+    Returns:
+        bool: True on success
+    """
+    is_mmdb = source.removesuffix('.gz').endswith('.mmdb')
+    if is_mmdb != output.endswith('.mmdb'):
+        print("❌ .mmdb sources need a GEOIP_DATABASE_PATH ending in .mmdb (and CSV sources one that does not)")
+        return False
+
+    directory = os.path.dirname(os.path.abspath(output))
+    print(f"Fetching {source} ...")
+    with tempfile.TemporaryDirectory(dir=directory) as work_dir:
+        try:
+            path = fetch(source, work_dir)
+            if is_mmdb:
+                shutil.copyfile(path, f"{output}.tmp")
+                os.replace(f"{output}.tmp", output)
+                print(f"✅ Installed {output}")
+            else:
+                v4_count, v6_count = build_range_table(dbip_rows(path), output)
+                print(f"✅ Wrote {output} ({v4_count} IPv4 and {v6_count} IPv6 ranges)")
+        except Exception as e:
+            print(f"❌ Error refreshing geolocation database: {e}")
+            return False
+    return True
+
+
+def main():
+    """Main entry point for the script."""
+    load_dotenv()
+    args = sys.argv[1:]
+    if len(args) > 1 or args[:1] in (['-h'], ['--help']):
+        print("Usage: python scripts/refresh_geoip.py [source]")
+        sys.exit(1)
+
+    output = os.environ.get('GEOIP_DATABASE_PATH')
+    if not output:
+        print("❌ GEOIP_DATABASE_PATH is not set")
+        sys.exit(1)
+
+    source = args[0] if args else default_source()
+    sys.exit(0 if refresh_geoip(source, output) else 1)
+
+
+if __name__ == '__main__':
+    main()
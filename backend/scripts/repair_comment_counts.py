@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Script to verify and repair drift in the denormalized blog_posts.comment_count.
+
+Usage:
+    python scripts/repair_comment_counts.py [--fix]
+
+Without --fix the script only reports posts whose stored count differs from
+the actual number of comments. With --fix the drifted rows are corrected.
+"""
+
+from pathlib import Path
+import sys
+
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import create_app, db
+from models.comment import Comment
+from models.post import BlogPost
+from sqlalchemy import func
+
+
+def find_drift() -> list[tuple[int, int, int]]:
+    """
+    Compare stored comment counts against the comments table.
+
+    Returns:
+        list: (post_id, stored_count, actual_count) for every drifted post
+    """
+    actual_counts = (
+        db.session.query(Comment.post_id, func.count(Comment.id).label('actual'))
+        .group_by(Comment.post_id)
+        .subquery()
+    )
+    actual = func.coalesce(actual_counts.c.actual, 0)
+    rows = (
+        db.session.query(BlogPost.id, BlogPost.comment_count, actual)
+        .outerjoin(actual_counts, actual_counts.c.post_id == BlogPost.id)
+        .filter(BlogPost.comment_count != actual)
+        .order_by(BlogPost.id)
+        .all()
+    )
+    return [(post_id, stored, count) for post_id, stored, count in rows]
+
+
+def repair_comment_counts(fix: bool = False) -> int:
+    """
+    Report (and optionally repair) comment_count drift.
+
+    Args:
+        fix: Write the actual counts back to drifted posts
+
+    Returns:
+        int: Number of drifted posts found, or -1 if the repair failed
+    """
+    app = create_app()
+
+    with app.app_context():
+        drift = find_drift()
+
+        if not drift:
+            print("✅ All comment counts are correct.")
+            return 0
+
+        print(f"⚠️  Found {len(drift)} post(s) with drifted comment_count:\n")
+        for post_id, stored, actual in drift:
+            print(f"   Post {post_id}: stored={stored} actual={actual}")
+
+        if not fix:
+            print("\nRun with --fix to repair these posts.")
+            return len(drift)
+
+        try:
+            for post_id, _stored, actual in drift:
+                BlogPost.query.filter_by(id=post_id).update(
+                    {BlogPost.comment_count: actual},
+                    synchronize_session=False
+                )
+            db.session.commit()
+            print(f"\n✅ Repaired {len(drift)} post(s).")
+        except Exception as e:
+            db.session.rollback()
+            print(f"\n❌ Error repairing comment counts: {e}")
+            return -1
+
+        return len(drift)
+
+
+def main():
+    """Main entry point for the script."""
+    args = sys.argv[1:]
+    if args not in ([], ['--fix']):
+        print("Usage: python scripts/repair_comment_counts.py [--fix]")
+        sys.exit(1)
+
+    fix = args == ['--fix']
+    drifted = repair_comment_counts(fix=fix)
+    success = drifted == 0 or (fix and drifted > 0)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
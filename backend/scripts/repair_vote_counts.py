@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Script to verify and repair drift in the denormalized blog_posts vote counters.
+
+Usage:
+    python scripts/repair_vote_counts.py [--fix]
+
+Without --fix the script only reports posts whose stored upvotes/downvotes
+differ from the votes table. With --fix the drifted rows are corrected (score
+follows; hot_rank catches up on the next recompute_hot_ranks run).
+
+With VOTE_BUFFER_ENABLED, stop the blog-worker and let it finish its last
+flush first, otherwise unflushed Redis deltas show up as drift.
+"""
+
+from pathlib import Path
+import sys
+
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import create_app, db
+from models.post import BlogPost
+from models.vote import DOWNVOTE, UPVOTE, Vote
+from sqlalchemy import func
+
+
+def find_drift() -> list[tuple[int, int, int, int, int]]:
+    """
+    Compare stored vote counters against the votes table.
+
+    Returns:
+        list: (post_id, stored_up, stored_down, actual_up, actual_down) for every drifted post
+    """
+    actual_counts = (
+        db.session.query(
+            Vote.post_id,
+            func.count(Vote.id).filter(Vote.vote_type == UPVOTE).label('up'),
+            func.count(Vote.id).filter(Vote.vote_type == DOWNVOTE).label('down'),
+        )
+        .group_by(Vote.post_id)
+        .subquery()
+    )
+    actual_up = func.coalesce(actual_counts.c.up, 0)
+    actual_down = func.coalesce(actual_counts.c.down, 0)
+    rows = (
+        db.session.query(BlogPost.id, BlogPost.upvotes, BlogPost.downvotes, actual_up, actual_down)
+        .outerjoin(actual_counts, actual_counts.c.post_id == BlogPost.id)
+        .filter((BlogPost.upvotes != actual_up) | (BlogPost.downvotes != actual_down))
+        .order_by(BlogPost.id)
+        .all()
+    )
+    return [tuple(row) for row in rows]
+
+
+def repair_vote_counts(fix: bool = False) -> int:
+    """
+    Report (and optionally repair) vote counter drift.
+
+    Args:
+        fix: Write the actual counts back to drifted posts
+
+    Returns:
+        int: Number of drifted posts found, or -1 if the repair failed
+    """
+    app = create_app()
+
+    with app.app_context():
+        drift = find_drift()
+
+        if not drift:
+            print("✅ All vote counts are correct.")
+            return 0
+
+        print(f"⚠️  Found {len(drift)} post(s) with drifted vote counts:\n")
+        for post_id, stored_up, stored_down, actual_up, actual_down in drift:
+            print(f"   Post {post_id}: stored=+{stored_up}/-{stored_down} actual=+{actual_up}/-{actual_down}")
+
+        if not fix:
+            print("\nRun with --fix to repair these posts.")
+            return len(drift)
+
+        try:
+            for post_id, _stored_up, _stored_down, actual_up, actual_down in drift:
+                BlogPost.query.filter_by(id=post_id).update(
+                    {
+                        BlogPost.upvotes: actual_up,
+                        BlogPost.downvotes: actual_down,
+                        BlogPost.score: actual_up - actual_down,
+                    },
+                    synchronize_session=False
+                )
+            db.session.commit()
+            print(f"\n✅ Repaired {len(drift)} post(s).")
+        except Exception as e:
+            db.session.rollback()
+            print(f"\n❌ Error repairing vote counts: {e}")
+            return -1
+
+        return len(drift)
+
+
+def main():
+    """Main entry point for the script."""
+    args = sys.argv[1:]
+    if args not in ([], ['--fix']):
+        print("Usage: python scripts/repair_vote_counts.py [--fix]")
+        sys.exit(1)
+
+    fix = args == ['--fix']
+    drifted = repair_vote_counts(fix=fix)
+    success = drifted == 0 or (fix and drifted > 0)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,11 @@
 """Pytest configuration and fixtures for backend tests."""
 
+from contextlib import contextmanager
 import os
 import sys
 
 import pytest
+from sqlalchemy import event
 
 
 # ==============================================================================
@@ -22,7 +24,16 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 # Now import with relative paths (no "backend." prefix)
 from app import create_app, db
 from config import Config
+from models.tag import Tag
 from models.user import User
+from utils import (
+    email_outbox,
+    login_enrichment,
+    redis_client,
+    sessions,
+    token_versions,
+)
+from utils.overview_cache import clear_overviews
 
 
 # ==============================================================================
@@ -75,6 +86,26 @@ def mock_send_email(monkeypatch):
     monkeypatch.setattr('routes.auth.send_verification_email', mock_send)
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Clear module-level in-process caches so state never leaks between tests."""
+    Tag.invalidate_usage_counts()
+    clear_overviews()
+    token_versions.clear_local()
+    sessions.clear_local()
+    login_enrichment.clear_local()
+    email_outbox.fake_transport.reset()
+    redis_client.reset()
+    yield
+    Tag.invalidate_usage_counts()
+    clear_overviews()
+    token_versions.clear_local()
+    sessions.clear_local()
+    login_enrichment.clear_local()
+    email_outbox.fake_transport.reset()
+    redis_client.reset()
+
+
 # ==============================================================================
 # Helper Fixtures
 # ==============================================================================
@@ -114,6 +145,24 @@ def get_auth_token(client):
     return _get_token
 
 
+@pytest.fixture
+def count_queries(app):  # noqa: ARG001
+    """Context manager factory that records SQL statements executed inside it."""
+    @contextmanager
+    def _count():
+        statements = []
+
+        def before_cursor_execute(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return _count
+
+
 @pytest.fixture
 def authenticated_client(client, create_verified_user, get_auth_token):
     """Create a client with an authenticated user and return both client and token."""
@@ -0,0 +1,59 @@
+import logging
+import os
+
+from models.email_outbox import OutboxEmail
+import pytest
+from utils import alert_digest, redis_client
+
+
+def test_incidents_are_logged_without_redis(client, app, caplog):
+    """Without Redis the worker cannot see incidents, so they are only logged"""
+    app.config['ADMIN_EMAIL'] = 'admin@dev.com'
+    with caplog.at_level(logging.INFO):
+        for _ in range(6):
+            response = client.post('/api/login', json={'identifier': 'victim@dev.com', 'password': 'wrong'})
+    assert response.status_code == 429
+    assert any('Rate limit incident' in record.message and 'victim@dev.com' in record.message for record in caplog.records)
+    assert alert_digest.send_rate_limit_digest() == 0
+    assert OutboxEmail.query.count() == 0
+
+
+@pytest.mark.skipif(not os.environ.get('REDIS_TEST_URL'), reason='REDIS_TEST_URL not set (needs a real Redis)')
+def test_rate_limited_requests_are_digested(client, app, monkeypatch):
+    """429s only record incidents; one digest email summarizes them per endpoint"""
+    monkeypatch.setenv('REDIS_URL', os.environ['REDIS_TEST_URL'])
+    redis_client.get_client().delete(alert_digest.STREAM_KEY)
+    app.config['ADMIN_EMAIL'] = 'admin@dev.com'
+    for _ in range(7):
+        response = client.post('/api/login', json={'identifier': 'victim@dev.com', 'password': 'wrong'})
+    assert response.status_code == 429
+    assert OutboxEmail.query.count() == 0  # nothing emailed on the request path
+
+    assert alert_digest.send_rate_limit_digest() == 2
+    message = OutboxEmail.query.one()
+    assert message.to == ['admin@dev.com']
+    assert message.subject == '🚨 Rate Limit Digest - 2 blocked request(s) from 1 IP(s)'
+    assert '/api/login' in message.html
+    assert 'victim@dev.com (2)' in message.html
+
+    # Reported incidents are consumed
+    assert alert_digest.send_rate_limit_digest() == 0
+
+
+def test_summarize_groups_by_endpoint_with_top_ips():
+    """Busiest endpoint first, IPs ranked by request count"""
+    incidents = [
+        {'ip': '198.51.100.1', 'endpoint': '/api/login', 'email': 'a@dev.com', 'ts': '1700000000.0'},
+        {'ip': '198.51.100.2', 'endpoint': '/api/login', 'email': '', 'ts': '1700000060.0'},
+        {'ip': '198.51.100.1', 'endpoint': '/api/login', 'email': 'a@dev.com', 'ts': '1700000030.0'},
+        {'ip': '198.51.100.3', 'endpoint': '/api/forgot-password', 'email': '', 'ts': '1700000010.0'},
+    ]
+
+    summary = alert_digest.summarize(incidents)
+
+    assert [group['endpoint'] for group in summary] == ['/api/login', '/api/forgot-password']
+    login = summary[0]
+    assert (login['count'], login['distinct_ips']) == (3, 2)
+    assert login['top_ips'] == [('198.51.100.1', 2), ('198.51.100.2', 1)]
+    assert login['identifiers'] == [('a@dev.com', 2)]
+    assert (login['first_seen'], login['last_seen']) == ('2023-11-14 22:13:20 UTC', '2023-11-14 22:14:20 UTC')
@@ -1,5 +1,11 @@
+import os
+
 from app import db
+from flask_jwt_extended import decode_token
 from models.user import User
+import pytest
+import redis
+from utils import sessions
 
 
 def test_register_and_login(client):
@@ -412,3 +418,188 @@ def test_reset_password_weak_password(create_verified_user, client):
     })
     assert response.status_code == 400
     assert b'password' in response.data.lower()
+
+
+def test_token_version_cached_and_invalidated(authenticated_client, count_queries):
+    """Authenticated requests skip the user lookup until the token_version changes"""
+    client, token = authenticated_client
+
+    client.get('/api/posts/votes/me?ids=1')
+    with count_queries() as statements:
+        assert client.get('/api/posts/votes/me?ids=1').status_code == 200
+    assert not any('FROM users' in statement for statement in statements)
+
+    response = client.post('/api/change-password', json={
+        'current_password': 'Test@Pass123',
+        'new_password': 'NewPass@123'
+    })
+    assert response.status_code == 200
+
+    # The old token is rejected immediately, despite the cached version
+    client.set_cookie('access_token_cookie', token)
+    assert client.get('/api/posts/votes/me?ids=1').status_code == 401
+
+
+# ============================================================================
+# SESSION REGISTRY TESTS
+# ============================================================================
+
+def test_list_sessions(authenticated_client, get_auth_token, count_queries):
+    """Each login is a session; the revocation check needs no database read after login"""
+    client, _ = authenticated_client
+    get_auth_token()
+
+    with count_queries() as statements:
+        response = client.get('/api/auth/sessions')
+    assert response.status_code == 200
+    assert statements == []
+
+    user_sessions = response.get_json()['sessions']
+    assert len(user_sessions) == 2
+    assert [session['current'] for session in user_sessions].count(True) == 1
+
+
+def test_revoke_other_session(authenticated_client, get_auth_token):
+    """Revoking one session logs out that token only"""
+    client, first_token = authenticated_client
+    second_token = get_auth_token()
+
+    first_jti = decode_token(first_token)['jti']
+    response = client.delete(f'/api/auth/sessions/{first_jti}')
+    assert response.status_code == 200
+
+    assert client.get('/api/auth/sessions').status_code == 200
+    client.set_cookie('access_token_cookie', first_token)
+    assert client.get('/api/auth/sessions').status_code == 401
+    client.set_cookie('access_token_cookie', second_token)
+    assert len(client.get('/api/auth/sessions').get_json()['sessions']) == 1
+
+
+def test_revoke_session_of_other_user(authenticated_client, create_verified_user, get_auth_token):
+    """Sessions can only be revoked by their owner"""
+    client, first_token = authenticated_client
+    create_verified_user(username='other', email='other@dev.com')
+    get_auth_token(username='other')
+
+    response = client.delete(f"/api/auth/sessions/{decode_token(first_token)['jti']}")
+    assert response.status_code == 404
+    client.set_cookie('access_token_cookie', first_token)
+    assert client.get('/api/auth/sessions').status_code == 200
+
+
+@pytest.mark.skipif(not os.environ.get('REDIS_TEST_URL'), reason='REDIS_TEST_URL not set (needs a real Redis)')
+def test_revoke_session_of_other_user_in_redis(client, create_verified_user, get_auth_token, monkeypatch):
+    """The Redis registry never deletes a session the caller does not own"""
+    monkeypatch.setenv('REDIS_URL', os.environ['REDIS_TEST_URL'])
+    create_verified_user(username='owner', email='owner@dev.com')
+    create_verified_user(username='other', email='other@dev.com')
+    owner_token = get_auth_token(username='owner')
+    get_auth_token(username='other')
+
+    response = client.delete(f"/api/auth/sessions/{decode_token(owner_token)['jti']}")
+    assert response.status_code == 404
+    client.set_cookie('access_token_cookie', owner_token)
+    assert client.get('/api/auth/sessions').status_code == 200
+
+
+def test_logout_and_extend_session_end_old_token(authenticated_client):
+    """Logout revokes the session; extending replaces it with a new one"""
+    client, token = authenticated_client
+
+    response = client.post('/api/auth/extend-session')
+    assert response.status_code == 200
+    client.set_cookie('access_token_cookie', token)
+    assert client.get('/api/auth/sessions').status_code == 401
+
+    new_token = response.headers['Set-Cookie'].split('access_token_cookie=')[1].split(';')[0]
+    client.set_cookie('access_token_cookie', new_token)
+    assert client.post('/api/logout').status_code == 200
+    client.set_cookie('access_token_cookie', new_token)
+    assert client.get('/api/auth/sessions').status_code == 401
+
+
+def test_change_password_revokes_all_sessions(authenticated_client, get_auth_token):
+    """A password change ends every session of the user"""
+    client, first_token = authenticated_client
+    get_auth_token()
+
+    response = client.post('/api/change-password', json={
+        'current_password': 'Test@Pass123',
+        'new_password': 'NewPass@123'
+    })
+    assert response.status_code == 200
+    assert client.get('/api/auth/sessions').status_code == 401
+    client.set_cookie('access_token_cookie', first_token)
+    assert client.get('/api/auth/sessions').status_code == 401
+
+
+def test_password_change_rejects_old_token_when_revocation_fails(authenticated_client, monkeypatch):
+    """token_version still rejects session tokens if the registry revocation fails"""
+    client, old_token = authenticated_client
+
+    def failing_revoke_all(user_id):  # noqa: ARG001
+        raise redis.RedisError("Redis down")
+
+    monkeypatch.setattr(sessions, 'revoke_all', failing_revoke_all)
+    response = client.post('/api/change-password', json={
+        'current_password': 'Test@Pass123',
+        'new_password': 'NewPass@123'
+    })
+    assert response.status_code == 200
+    assert sessions.exists(decode_token(old_token)['jti'])  # still registered
+
+    client.set_cookie('access_token_cookie', old_token)
+    assert client.get('/api/auth/sessions').status_code == 401
+
+
+# ============================================================================
+# LOGIN ENRICHMENT TESTS
+# ============================================================================
+
+def test_login_location_enriched_and_cached_per_ip(create_verified_user, client, monkeypatch):
+    """The location is filled in after login and looked up once per IP"""
+    lookups = []
+
+    def fake_lookup(ip_address):
+        lookups.append(ip_address)
+        return 'Berlin, Germany'
+
+    monkeypatch.setattr('utils.login_enrichment.get_location_from_ip', fake_lookup)
+    create_verified_user()
+
+    for _ in range(2):
+        response = client.post('/api/login', json={
+            'identifier': 'testuser',
+            'password': 'Test@Pass123'
+        }, headers={'X-Forwarded-For': '203.0.113.7'})
+        assert response.status_code == 200
+
+    user = User.query.filter_by(username='testuser').first()
+    assert user.last_login_ip == '203.0.113.7'
+    assert user.last_login_location == 'Berlin, Germany'
+    assert lookups == ['203.0.113.7']
+
+
+def test_login_does_not_wait_for_geolocation(app, create_verified_user, client, monkeypatch):
+    """Without eager mode the login response is returned before enrichment runs"""
+    submitted = []
+
+    class RecordingExecutor:
+        def submit(self, func, *args):
+            submitted.append((func, args))
+
+    def fail_lookup(_ip_address):
+        raise AssertionError('geolocation called on the request path')
+
+    app.config['LOGIN_ENRICHMENT_EAGER'] = False
+    monkeypatch.setattr('utils.login_enrichment._local_executor', RecordingExecutor)
+    monkeypatch.setattr('utils.login_enrichment.get_location_from_ip', fail_lookup)
+    create_verified_user()
+
+    response = client.post('/api/login', json={
+        'identifier': 'testuser',
+        'password': 'Test@Pass123'
+    })
+    assert response.status_code == 200
+    assert len(submitted) == 1
+    assert User.query.filter_by(username='testuser').first().last_login_location is None
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+from app import db
+from models.email_outbox import OUTBOX_DEAD, OUTBOX_PENDING, OutboxEmail
+from utils import email_outbox
+from utils.email import send_email
+
+
+def _make_due(message_id):
+    """Pretend the retry delay has passed"""
+    past = datetime.now(tz=timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+    OutboxEmail.query.filter_by(id=message_id).update({'next_attempt_at': past})
+    db.session.commit()
+
+
+def test_request_queues_email_and_worker_delivers(authenticated_client):
+    """Requests only write the outbox; the worker job sends and removes the row"""
+    client, _ = authenticated_client
+
+    response = client.post('/api/change-password', json={
+        'current_password': 'Test@Pass123',
+        'new_password': 'NewPass@123'
+    })
+    assert response.status_code == 200
+    assert email_outbox.fake_transport.sent == []
+    queued = [(message.to, message.subject) for message in OutboxEmail.query.order_by(OutboxEmail.id)]
+    assert queued[-1] == (['test@dev.com'], 'Password Changed Successfully')
+
+    delivered, failed = email_outbox.deliver_pending_emails()
+    assert (delivered, failed) == (len(queued), 0)
+    assert [(sent['to'], sent['subject']) for sent in email_outbox.fake_transport.sent] == queued
+    assert OutboxEmail.query.count() == 0
+
+
+def test_rolled_back_email_is_never_sent(app):  # noqa: ARG001
+    """The outbox row shares the caller's transaction"""
+    send_email(to='nobody@dev.com', subject='Hello', html='<p>Hi</p>')
+    db.session.rollback()
+
+    assert email_outbox.deliver_pending_emails() == (0, 0)
+    assert OutboxEmail.query.count() == 0
+
+
+def test_failed_delivery_backs_off_then_dead_letters(app):  # noqa: ARG001
+    """Failures are retried with growing delays and dead-lettered at the limit"""
+    message = send_email(to='retry@dev.com', subject='Retry me', html='<p>Hi</p>')
+    db.session.commit()
+    message_id = message.id
+    email_outbox.fake_transport.fail_next = email_outbox.MAX_ATTEMPTS
+
+    assert email_outbox.deliver_pending_emails() == (0, 1)
+    row = db.session.get(OutboxEmail, message_id)
+    assert (row.status, row.attempts) == (OUTBOX_PENDING, 1)
+    assert 'Fake transport failure' in row.last_error
+    # Not due again until the backoff has passed
+    assert email_outbox.deliver_pending_emails() == (0, 0)
+
+    for _ in range(email_outbox.MAX_ATTEMPTS - 1):
+        _make_due(message_id)
+        assert email_outbox.deliver_pending_emails() == (0, 1)
+
+    db.session.expire_all()
+    row = db.session.get(OutboxEmail, message_id)
+    assert (row.status, row.attempts) == (OUTBOX_DEAD, email_outbox.MAX_ATTEMPTS)
+    _make_due(message_id)
+    assert email_outbox.deliver_pending_emails() == (0, 0)
+    assert email_outbox.fake_transport.sent == []
+
+
+def test_retry_delay_is_exponential_and_capped():
+    assert [email_outbox.retry_delay(attempt) for attempt in (1, 2, 3)] == [30, 60, 120]
+    assert email_outbox.retry_delay(20) == email_outbox.BACKOFF_MAX
@@ -0,0 +1,30 @@
+from utils.email import get_login_notification_email
+from utils.email_templates import SUBJECTS, render_batch
+
+
+def test_login_notification_escapes_values_inside_layout(app):  # noqa: ARG001
+    """Context values are autoescaped and the shared header/footer wrap the content"""
+    subject, html = get_login_notification_email(
+        email='<script>alert(1)</script>@example.com',
+        login_time='January 01, 2025 at 10:00 AM UTC',
+        ip_address='203.0.113.7',
+        location='Paris, France',
+        browser='Chrome 120.0.0',
+        device='Desktop (Windows)',
+    )
+
+    assert subject == SUBJECTS['login_notification']
+    assert '<script>' not in html
+    assert '&lt;script&gt;alert(1)&lt;/script&gt;@example.com' in html
+    assert 'Computer Anything Blog</h1>' in html
+    assert 'Paris, France' in html
+    assert 'Best regards' in html
+
+
+def test_render_batch_renders_each_context(app):  # noqa: ARG001
+    """One (subject, html) pair per recipient, in order"""
+    rendered = render_batch('2fa_code', [{'code': '111111'}, {'code': '222222'}])
+
+    assert [subject for subject, _ in rendered] == [SUBJECTS['2fa_code']] * 2
+    assert '111111' in rendered[0][1] and '222222' not in rendered[0][1]
+    assert '222222' in rendered[1][1]
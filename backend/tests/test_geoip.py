@@ -0,0 +1,63 @@
+import gzip
+
+import pytest
+from scripts.refresh_geoip import refresh_geoip
+from utils import geoip
+from utils.login_details import get_location_from_ip
+
+
+ROWS = [
+    ('1.0.0.0', '1.0.0.255', 'Brisbane, AU'),
+    ('8.8.8.0', '8.8.8.255', 'Mountain View, US'),
+    ('9.9.9.0', '9.9.9.255', 'Brisbane, AU'),
+    ('2001:db8::', '2001:db8::ffff', 'Berlin, DE'),
+]
+
+
+def test_range_table_lookup(tmp_path):
+    """Addresses resolve to their range; gaps and uncovered IPs return None"""
+    path = str(tmp_path / 'geo.bin')
+    assert geoip.build_range_table(ROWS, path) == (3, 1)
+
+    reader = geoip.RangeTableReader(path)
+    assert reader.lookup('1.0.0.0') == 'Brisbane, AU'
+    assert reader.lookup('8.8.8.8') == 'Mountain View, US'
+    assert reader.lookup('9.9.9.255') == 'Brisbane, AU'
+    assert reader.lookup('2001:db8::42') == 'Berlin, DE'
+    assert reader.lookup('0.255.255.255') is None
+    assert reader.lookup('8.8.9.0') is None
+    assert reader.lookup('2001:db9::') is None
+    reader.close()
+
+
+def test_range_table_rejects_unsorted_rows(tmp_path):
+    with pytest.raises(ValueError):
+        geoip.build_range_table(list(reversed(ROWS)), str(tmp_path / 'geo.bin'))
+
+
+def test_location_from_local_database(app, tmp_path, monkeypatch):
+    """A configured database answers without calling the HTTP provider"""
+    path = str(tmp_path / 'geo.bin')
+    geoip.build_range_table(ROWS, path)
+    app.config['GEOIP_DATABASE_PATH'] = path
+
+    def fail_request(*_args, **_kwargs):
+        raise AssertionError('HTTP geolocation called')
+
+    monkeypatch.setattr('utils.login_details.requests.get', fail_request)
+    assert get_location_from_ip('8.8.8.8') == 'Mountain View, US'
+
+
+def test_refresh_script_compiles_dbip_csv(tmp_path):
+    """scripts/refresh_geoip.py turns a DB-IP city CSV into a range table"""
+    source = tmp_path / 'dbip.csv.gz'
+    with gzip.open(source, 'wt', encoding='utf-8') as f:
+        f.write('1.0.0.0,1.0.0.255,OC,AU,Queensland,Brisbane,-27.4,153.0\n')
+        f.write('1.0.1.0,1.0.3.255,AS,CN,,,35.0,105.0\n')
+    output = str(tmp_path / 'geo.bin')
+
+    assert refresh_geoip(str(source), output)
+    reader = geoip.RangeTableReader(output)
+    assert reader.lookup('1.0.0.1') == 'Brisbane, AU'
+    assert reader.lookup('1.0.2.0') == 'CN'
+    reader.close()
@@ -0,0 +1,23 @@
+from utils.login_details import (
+    clear_user_agent_cache,
+    parse_user_agent,
+    user_agent_cache_stats,
+)
+
+
+CHROME_WINDOWS = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+SAFARI_IPHONE = 'Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1'
+
+
+def test_parse_user_agent_is_memoized(app):  # noqa: ARG001
+    """Repeated User-Agents are served from the LRU with the same result"""
+    clear_user_agent_cache()
+
+    first = parse_user_agent(CHROME_WINDOWS)
+    assert first == ('Chrome 120.0.0', 'Desktop (Windows)')
+    assert parse_user_agent(CHROME_WINDOWS) == first
+    assert parse_user_agent(SAFARI_IPHONE)[1] == 'Mobile (iPhone)'
+    assert parse_user_agent('') == ('Unknown Browser', 'Unknown Device')
+
+    stats = user_agent_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 2, 2)
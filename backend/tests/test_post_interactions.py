@@ -1,6 +1,17 @@
 """Tests for post interactions (votes & comments)"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from app import create_app, db
+from flask_jwt_extended import create_access_token
 from models.comment import Comment
-from models.vote import Vote
+from models.post import BlogPost
+from models.user import User
+from models.vote import DOWNVOTE, UPVOTE, Vote
+import pytest
+from sqlalchemy.exc import IntegrityError
+from utils import redis_client, vote_buffer
+import worker
 
 
 def test_upvote_post(create_verified_user, get_auth_token, client):
@@ -23,7 +34,7 @@ def test_upvote_post(create_verified_user, get_auth_token, client):
     # Verify vote in database
     vote = Vote.query.filter_by(post_id=post_id).first()
     assert vote is not None
-    assert vote.vote_type == 'upvote'
+    assert vote.vote_type == UPVOTE
 
 
 def test_downvote_post(create_verified_user, get_auth_token, client):
@@ -46,7 +57,7 @@ def test_downvote_post(create_verified_user, get_auth_token, client):
     # Verify vote in database
     vote = Vote.query.filter_by(post_id=post_id).first()
     assert vote is not None
-    assert vote.vote_type == 'downvote'
+    assert vote.vote_type == DOWNVOTE
 
 
 def test_change_vote(create_verified_user, get_auth_token, client):
@@ -70,7 +81,61 @@ def test_change_vote(create_verified_user, get_auth_token, client):
 
     # Verify vote changed
     vote = Vote.query.filter_by(post_id=post_id).first()
-    assert vote.vote_type == 'downvote'
+    assert vote.vote_type == DOWNVOTE
+
+
+def test_vote_unique_per_user_and_post(create_verified_user, get_auth_token, client):
+    """Test votes are unique per (user, post) and exposed by name"""
+    user = create_verified_user(username='unique', email='unique@dev.com', password='Test@Pass123')
+    token = get_auth_token(username='unique', password='Test@Pass123')
+
+    response = client.post('/api/posts', json={
+        'title': 'Once Only',
+        'content': 'One vote each'
+    }, headers={'Authorization': f'Bearer {token}'})
+    post_id = response.get_json()['id']
+    client.post(f'/api/posts/{post_id}/upvote', headers={'Authorization': f'Bearer {token}'})
+
+    db.session.add(Vote(user_id=user.id, post_id=post_id, vote_type=DOWNVOTE))  # type: ignore
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    response = client.get('/api/users/unique/voted-posts')
+    assert [post['user_vote'] for post in response.get_json()['posts']] == ['upvote']
+
+
+def test_get_my_votes_batch(create_verified_user, get_auth_token, client, count_queries):
+    """Test GET /api/posts/votes/me resolves vote state for many posts at once"""
+    create_verified_user(username='batcher', email='batcher@dev.com', password='Test@Pass123')
+    token = get_auth_token(username='batcher', password='Test@Pass123')
+
+    post_ids = []
+    for i in range(3):
+        response = client.post('/api/posts', json={
+            'title': f'Batch {i}',
+            'content': 'Vote state'
+        }, headers={'Authorization': f'Bearer {token}'})
+        post_ids.append(response.get_json()['id'])
+    client.post(f'/api/posts/{post_ids[0]}/upvote')
+    client.post(f'/api/posts/{post_ids[2]}/downvote')
+
+    ids = ','.join(str(post_id) for post_id in post_ids)
+    with count_queries() as statements:
+        response = client.get(f'/api/posts/votes/me?ids={ids}')
+    assert response.status_code == 200
+    assert response.get_json()['votes'] == {
+        str(post_ids[0]): 'upvote',
+        str(post_ids[1]): None,
+        str(post_ids[2]): 'downvote',
+    }
+    # The single IN query (the token_version check is served from cache)
+    assert len(statements) == 1
+
+    assert client.get('/api/posts/votes/me').status_code == 400
+    assert client.get('/api/posts/votes/me?ids=1,abc').status_code == 400
+    too_many = ','.join(str(i) for i in range(1, 102))
+    assert client.get(f'/api/posts/votes/me?ids={too_many}').status_code == 400
 
 
 def test_vote_unauthenticated(create_verified_user, get_auth_token, client, app):
@@ -190,7 +255,7 @@ def test_get_comments(create_verified_user, get_auth_token, client):
     }, headers={'Authorization': f'Bearer {token}'})
 
     # Get comments
-    response = client.get(f'/api/posts/{post_id}/comments')
+    response = client.get(f'/api/posts/{post_id}/comments?all=true')
     assert response.status_code == 200
     data = response.get_json()
     assert isinstance(data, list)
@@ -215,8 +280,43 @@ def test_get_comments_empty(create_verified_user, get_auth_token, client):
     response = client.get(f'/api/posts/{post_id}/comments')
     assert response.status_code == 200
     data = response.get_json()
-    assert isinstance(data, list)
-    assert len(data) == 0
+    assert data == {'comments': [], 'next_cursor': None}
+
+    assert client.get('/api/posts/99999/comments').status_code == 404
+
+
+def test_get_comments_cursor_pagination(create_verified_user, client, count_queries):
+    """Test comments page oldest first with authors loaded in the same query"""
+    user = create_verified_user(username='threader', email='threader@dev.com', password='Test@Pass123')
+    post = BlogPost(title='Long Thread', content='Discuss', user_id=user.id)  # type: ignore
+    db.session.add(post)
+    db.session.flush()
+    db.session.add_all([
+        Comment(content=f'Comment {i}', user_id=user.id, post_id=post.id)  # type: ignore
+        for i in range(5)
+    ])
+    db.session.commit()
+    post_id = post.id
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        response = client.get(f'/api/posts/{post_id}/comments?limit=2')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [c['content'] for c in data['comments']] == ['Comment 0', 'Comment 1']
+    assert all(c['username'] == 'threader' for c in data['comments'])
+    assert len(statements) == 1
+
+    seen = [c['content'] for c in data['comments']]
+    cursor = data['next_cursor']
+    while cursor:
+        data = client.get(f'/api/posts/{post_id}/comments?limit=2&cursor={cursor}').get_json()
+        seen.extend(c['content'] for c in data['comments'])
+        cursor = data['next_cursor']
+    assert seen == [f'Comment {i}' for i in range(5)]
+
+    assert client.get(f'/api/posts/{post_id}/comments?limit=0').status_code == 400
+    assert client.get(f'/api/posts/{post_id}/comments?cursor=bogus').status_code == 400
 
 
 def test_delete_comment(create_verified_user, get_auth_token, client):
@@ -294,3 +394,137 @@ def test_delete_comment_unauthenticated(create_verified_user, get_auth_token, cl
     # Try to delete without auth
     response = fresh_client.delete(f'/api/posts/{post_id}/comments/{comment_id}')
     assert response.status_code == 401
+
+
+def test_comment_count_maintained_on_write(create_verified_user, get_auth_token, client):
+    """Test blog_posts.comment_count tracks comment creation and deletion"""
+    create_verified_user(username='counter', email='counter@dev.com', password='Test@Pass123')
+    token = get_auth_token(username='counter', password='Test@Pass123')
+
+    response = client.post('/api/posts', json={
+        'title': 'Counted Post',
+        'content': 'Count my comments'
+    }, headers={'Authorization': f'Bearer {token}'})
+    post_id = response.get_json()['id']
+
+    comment_ids = []
+    for i in range(3):
+        response = client.post(f'/api/posts/{post_id}/comments', json={
+            'content': f'Comment {i}'
+        }, headers={'Authorization': f'Bearer {token}'})
+        comment_ids.append(response.get_json()['id'])
+
+    response = client.get(f'/api/posts/{post_id}')
+    assert response.get_json()['comment_count'] == 3
+
+    client.delete(f'/api/posts/{post_id}/comments/{comment_ids[0]}', headers={'Authorization': f'Bearer {token}'})
+    response = client.get(f'/api/posts/{post_id}')
+    assert response.get_json()['comment_count'] == 2
+
+    db.session.expire_all()
+    assert db.session.get(BlogPost, post_id).comment_count == Comment.query.filter_by(post_id=post_id).count()
+
+
+def test_concurrent_votes_keep_counters_consistent(tmp_path):
+    """Test parallel vote toggles leave post counters equal to the votes table"""
+    # A file database so every thread gets its own connection, as under gunicorn
+    app = create_app(testing=True, database_uri=f"sqlite:///{tmp_path / 'votes.db'}")
+    with app.app_context():
+        db.create_all()
+        users = []
+        for i in range(8):
+            user = User(username=f'racer{i}', email=f'racer{i}@dev.com', is_verified=True)  # type: ignore
+            user.set_password('Test@Pass123')
+            users.append(user)
+        db.session.add_all(users)
+        db.session.commit()
+        post = BlogPost(title='Contested', content='Vote on me', user_id=users[0].id)  # type: ignore
+        db.session.add(post)
+        db.session.commit()
+        post_id = post.id
+        tokens = [create_access_token(identity=str(user.id), additional_claims={'token_version': 0}) for user in users]
+        db.session.remove()
+
+    def hammer(index):
+        client = app.test_client()
+        client.set_cookie('access_token_cookie', tokens[index])
+        statuses = []
+        # Odd number of clicks alternating between the two buttons
+        for click in range(7):
+            vote = 'upvote' if (click + index) % 2 == 0 else 'downvote'
+            statuses.append(client.post(f'/api/posts/{post_id}/{vote}').status_code)
+        return statuses
+
+    with ThreadPoolExecutor(max_workers=len(tokens)) as pool:
+        results = list(pool.map(hammer, range(len(tokens))))
+    assert all(status == 200 for statuses in results for status in statuses)
+
+    with app.app_context():
+        post = db.session.get(BlogPost, post_id)
+        upvotes = Vote.query.filter_by(post_id=post_id, vote_type=UPVOTE).count()
+        downvotes = Vote.query.filter_by(post_id=post_id, vote_type=DOWNVOTE).count()
+        assert Vote.query.filter_by(post_id=post_id).count() == len(tokens)
+        assert (post.upvotes, post.downvotes) == (upvotes, downvotes)
+        assert post.score == upvotes - downvotes
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.mark.skipif(not os.environ.get('REDIS_TEST_URL'), reason='REDIS_TEST_URL not set (needs a real Redis)')
+def test_buffered_votes_flush_and_replay(create_verified_user, get_auth_token, client, app, monkeypatch):
+    """Test buffered votes are visible at once, flushed in batches and replayed after a crash"""
+    monkeypatch.setenv('REDIS_URL', os.environ['REDIS_TEST_URL'])
+    monkeypatch.setitem(app.config, 'VOTE_BUFFER_ENABLED', True)
+    r = redis_client.get_client()
+    r.delete(vote_buffer.PENDING_KEY, vote_buffer.INFLIGHT_KEY)
+
+    create_verified_user(username='buffered', email='buffered@dev.com', password='Test@Pass123')
+    token = get_auth_token(username='buffered', password='Test@Pass123')
+    response = client.post('/api/posts', json={
+        'title': 'Viral Post',
+        'content': 'Everyone votes here'
+    }, headers={'Authorization': f'Bearer {token}'})
+    post_id = response.get_json()['id']
+
+    response = client.post(f'/api/posts/{post_id}/upvote', headers={'Authorization': f'Bearer {token}'})
+    assert response.get_json()['upvotes'] == 1
+    db.session.expire_all()
+    assert db.session.get(BlogPost, post_id).upvotes == 0
+    assert client.get(f'/api/posts/{post_id}').get_json()['upvotes'] == 1
+
+    assert vote_buffer.flush_pending_votes() == 1
+    db.session.expire_all()
+    assert db.session.get(BlogPost, post_id).upvotes == 1
+    assert client.get(f'/api/posts/{post_id}').get_json()['upvotes'] == 1
+
+    # Crash after freezing a batch: the next flush replays it before anything else
+    client.post(f'/api/posts/{post_id}/downvote', headers={'Authorization': f'Bearer {token}'})
+    r.renamenx(vote_buffer.PENDING_KEY, vote_buffer.INFLIGHT_KEY)
+    assert client.get(f'/api/posts/{post_id}').get_json()['downvotes'] == 1
+    assert vote_buffer.flush_pending_votes() == 1
+    db.session.expire_all()
+    post = db.session.get(BlogPost, post_id)
+    assert (post.upvotes, post.downvotes) == (0, 1)
+    assert not r.exists(vote_buffer.INFLIGHT_KEY)
+
+    # Crash after the commit but before the delete: the replayed batch is skipped
+    client.post(f'/api/posts/{post_id}/upvote', headers={'Authorization': f'Bearer {token}'})
+    r.renamenx(vote_buffer.PENDING_KEY, vote_buffer.INFLIGHT_KEY)
+    r.hset(vote_buffer.INFLIGHT_KEY, vote_buffer.BATCH_FIELD, 'crashed-batch')
+    batch = r.hgetall(vote_buffer.INFLIGHT_KEY)
+    assert vote_buffer.flush_pending_votes() == 1
+    r.hset(vote_buffer.INFLIGHT_KEY, mapping=batch)
+    assert vote_buffer.flush_pending_votes() == 0
+    db.session.expire_all()
+    post = db.session.get(BlogPost, post_id)
+    assert (post.upvotes, post.downvotes) == (1, 0)
+    assert not r.exists(vote_buffer.INFLIGHT_KEY)
+
+    # Switching buffering off neither hides nor strands votes already buffered
+    client.post(f'/api/posts/{post_id}/upvote', headers={'Authorization': f'Bearer {token}'})
+    monkeypatch.setitem(app.config, 'VOTE_BUFFER_ENABLED', False)
+    assert client.get(f'/api/posts/{post_id}').get_json()['upvotes'] == 0
+    worker.flush_vote_buffer()
+    db.session.expire_all()
+    assert db.session.get(BlogPost, post_id).upvotes == 0
+    assert not r.exists(vote_buffer.PENDING_KEY)
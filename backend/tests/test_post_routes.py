@@ -1,3 +1,12 @@
+from datetime import timedelta
+
+from app import db
+from models.comment import Comment
+from models.post import BlogPost
+from models.tag import Tag
+from models.user import User
+
+
 def test_create_and_get_blog_post(create_verified_user, get_auth_token, client):
     create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
     token = get_auth_token(username="blogger", password="Test@Pass123")
@@ -74,8 +83,8 @@ def test_get_all_blog_posts(create_verified_user, get_auth_token, client):
         'content': 'Second content.'
     }, headers={"Authorization": f"Bearer {token}"})
 
-    # Get all posts
-    response = client.get('/api/posts')
+    # Get all posts (legacy unpaginated form)
+    response = client.get('/api/posts?all=true')
     assert response.status_code == 200
     data = response.get_json()
     assert isinstance(data, list)
@@ -119,3 +128,225 @@ def test_create_post_missing_fields(create_verified_user, get_auth_token, client
         'title': 'No Content'
     }, headers={"Authorization": f"Bearer {token}"})
     assert response.status_code == 400
+
+def test_get_posts_cursor_pagination(create_verified_user, get_auth_token, client):
+    create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
+    token = get_auth_token(username="blogger", password="Test@Pass123")
+    for i in range(5):
+        client.post('/api/posts', json={
+            'title': f'Post {i}',
+            'content': f'Content {i}.'
+        }, headers={"Authorization": f"Bearer {token}"})
+
+    # First page
+    response = client.get('/api/posts?limit=2')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [p["title"] for p in data["posts"]] == ['Post 4', 'Post 3']
+    assert data["next_cursor"]
+
+    # Walk the remaining pages
+    seen = [p["title"] for p in data["posts"]]
+    cursor = data["next_cursor"]
+    while cursor:
+        data = client.get(f'/api/posts?limit=2&cursor={cursor}').get_json()
+        seen.extend(p["title"] for p in data["posts"])
+        cursor = data["next_cursor"]
+    assert seen == ['Post 4', 'Post 3', 'Post 2', 'Post 1', 'Post 0']
+
+def test_get_posts_invalid_pagination_params(client):
+    assert client.get('/api/posts?limit=0').status_code == 400
+    assert client.get('/api/posts?limit=101').status_code == 400
+    assert client.get('/api/posts?limit=abc').status_code == 400
+    assert client.get('/api/posts?cursor=not-a-cursor').status_code == 400
+
+def test_get_posts_fixed_query_count(create_verified_user, client, count_queries):
+    """Serializing 500 posts must not issue per-post author/comment lazy loads"""
+    create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
+    user = User.query.filter_by(username="blogger").first()
+    posts = [BlogPost(title=f'Post {i}', content='Body', user_id=user.id) for i in range(500)]  # type: ignore
+    db.session.add_all(posts)
+    db.session.flush()
+    db.session.add_all([Comment(content='Nice', user_id=user.id, post_id=post.id) for post in posts[:50]])  # type: ignore
+    for post in posts[:50]:
+        post.comment_count = 1
+    db.session.commit()
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        response = client.get('/api/posts?all=true')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data) == 500
+    assert sum(post['comment_count'] for post in data) == 50
+    assert all(post['author'] == 'blogger' for post in data)
+    assert len(statements) == 1
+
+    db.session.expire_all()
+    with count_queries() as statements:
+        response = client.get('/api/posts?limit=100')
+    assert len(response.get_json()['posts']) == 100
+    assert len(statements) == 1
+
+def test_get_posts_summary_view(create_verified_user, get_auth_token, client, count_queries):
+    create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
+    token = get_auth_token(username="blogger", password="Test@Pass123")
+    long_content = 'word ' * 2000
+    client.post('/api/posts', json={
+        'title': 'Long Post',
+        'content': long_content,
+        'topic_tags': 'python,flask'
+    }, headers={"Authorization": f"Bearer {token}"})
+
+    with count_queries() as statements:
+        response = client.get('/api/posts?view=summary')
+    assert response.status_code == 200
+    post = response.get_json()['posts'][0]
+    assert 'content' not in post
+    assert post['title'] == 'Long Post'
+    assert post['author'] == 'blogger'
+    assert post['topic_tags'] == 'python,flask'
+    assert post['excerpt'].endswith('…')
+    assert len(post['excerpt']) <= 281
+    # The full body is never selected for the summary feed
+    assert not any('blog_posts.content' in statement for statement in statements)
+
+    # Excerpt follows content edits
+    client.put(f'/api/posts/{post["id"]}', json={
+        'title': 'Long Post',
+        'content': 'Now short.'
+    }, headers={"Authorization": f"Bearer {token}"})
+    post = client.get('/api/posts?view=summary').get_json()['posts'][0]
+    assert post['excerpt'] == 'Now short.'
+
+def test_get_posts_invalid_view(client):
+    assert client.get('/api/posts?view=compact').status_code == 400
+
+def test_search_posts(create_verified_user, get_auth_token, client):
+    create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
+    token = get_auth_token(username="blogger", password="Test@Pass123")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post('/api/posts', json={'title': 'Flask tips', 'content': 'Routing and blueprints.'}, headers=headers)
+    client.post('/api/posts', json={'title': 'Docker notes', 'content': 'Running flask in a container.'}, headers=headers)
+    client.post('/api/posts', json={'title': 'Rust', 'content': 'Ownership.', 'topic_tags': 'systems,flask'}, headers=headers)
+    response = client.post('/api/posts', json={'title': 'Unrelated', 'content': 'Nothing here.'}, headers=headers)
+    unrelated_id = response.get_json()['id']
+
+    response = client.get('/api/posts/search?q=flask')
+    assert response.status_code == 200
+    data = response.get_json()
+    titles = [post['title'] for post in data['posts']]
+    assert set(titles) == {'Flask tips', 'Docker notes', 'Rust'}
+    assert data['next_cursor'] is None
+    assert 'content' not in data['posts'][0]
+
+    # Ranked pages walk the full result set without repeats
+    page = client.get('/api/posts/search?q=flask&limit=2').get_json()
+    assert len(page['posts']) == 2
+    rest = client.get(f'/api/posts/search?q=flask&limit=2&cursor={page["next_cursor"]}').get_json()
+    assert {p['title'] for p in page['posts'] + rest['posts']} == set(titles)
+    assert rest['next_cursor'] is None
+
+    # Index follows edits and deletes
+    client.put(f'/api/posts/{unrelated_id}', json={'title': 'Now about Flask', 'content': 'Edited.'}, headers=headers)
+    assert len(client.get('/api/posts/search?q=flask').get_json()['posts']) == 4
+    client.delete(f'/api/posts/{unrelated_id}', headers=headers)
+    assert len(client.get('/api/posts/search?q=flask').get_json()['posts']) == 3
+
+    # Query syntax characters are treated as plain text
+    assert client.get('/api/posts/search?q="flask* OR (').status_code == 200
+
+def test_search_posts_invalid_params(client):
+    assert client.get('/api/posts/search').status_code == 400
+    assert client.get('/api/posts/search?q=' + 'a' * 101).status_code == 400
+    assert client.get('/api/posts/search?q=flask&cursor=bogus').status_code == 400
+
+def test_tag_index_filter_and_counts(create_verified_user, get_auth_token, client):
+    create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
+    token = get_auth_token(username="blogger", password="Test@Pass123")
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post('/api/posts', json={'title': 'A', 'content': 'a', 'topic_tags': 'Python, flask'}, headers=headers)
+    client.post('/api/posts', json={'title': 'B', 'content': 'b', 'topic_tags': 'python'}, headers=headers)
+    response = client.post('/api/posts', json={'title': 'C', 'content': 'c', 'topic_tags': 'rust'}, headers=headers)
+    post_c = response.get_json()['id']
+
+    data = client.get('/api/posts?tag=python').get_json()
+    assert [post['title'] for post in data['posts']] == ['B', 'A']
+    assert client.get('/api/posts?tag=PYTHON&view=summary').get_json()['posts'][0]['title'] == 'B'
+    assert client.get('/api/posts?tag=missing').get_json()['posts'] == []
+
+    response = client.get('/api/tags')
+    assert response.status_code == 200
+    assert response.get_json() == [
+        {'name': 'python', 'count': 2},
+        {'name': 'flask', 'count': 1},
+        {'name': 'rust', 'count': 1},
+    ]
+
+    # Editing tags re-indexes the post and refreshes the counts
+    client.put(f'/api/posts/{post_c}', json={'title': 'C', 'content': 'c', 'topic_tags': 'python'}, headers=headers)
+    assert len(client.get('/api/posts?tag=python').get_json()['posts']) == 3
+    assert client.get('/api/posts?tag=rust').get_json()['posts'] == []
+    assert client.get('/api/tags').get_json()[0] == {'name': 'python', 'count': 3}
+
+    # Deleting a post refreshes the counts too
+    client.delete(f'/api/posts/{post_c}', headers=headers)
+    assert client.get('/api/tags').get_json()[0] == {'name': 'python', 'count': 2}
+
+def test_get_or_create_tags_tolerates_existing_rows(app):  # noqa: ARG001
+    """Tags another transaction already inserted are reused, not re-inserted"""
+    db.session.add(Tag(name='python'))
+    db.session.commit()
+    tags = Tag.get_or_create_many(['Python', 'rust ', 'python', ''])
+    assert [tag.name for tag in tags] == ['python', 'rust']
+    # The inserted row is selected back, so later calls resolve to it
+    assert Tag.get_or_create_many(['rust']) == [tags[1]]
+    db.session.commit()
+    assert Tag.query.count() == 2
+
+def test_get_posts_sort_modes(create_verified_user, get_auth_token, client):
+    create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
+    token = get_auth_token(username="blogger", password="Test@Pass123")
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = []
+    for title in ('Old favourite', 'Middle', 'Newest'):
+        ids.append(client.post('/api/posts', json={'title': title, 'content': 'x'}, headers=headers).get_json()['id'])
+
+    # Age the first post by two days and give it the most votes
+    old_post = db.session.get(BlogPost, ids[0])
+    old_post.created_at -= timedelta(days=2)
+    db.session.commit()
+    client.post(f'/api/posts/{ids[0]}/upvote', headers=headers)
+    client.post(f'/api/posts/{ids[1]}/downvote', headers=headers)
+
+    new = client.get('/api/posts?sort=new').get_json()['posts']
+    assert [p['title'] for p in new] == ['Newest', 'Middle', 'Old favourite']
+
+    top = client.get('/api/posts?sort=top').get_json()['posts']
+    assert [p['title'] for p in top] == ['Old favourite', 'Newest', 'Middle']
+
+    # The upvote cannot outweigh two days of decay against a fresh post
+    hot = client.get('/api/posts?sort=hot').get_json()['posts']
+    assert [p['title'] for p in hot] == ['Newest', 'Old favourite', 'Middle']
+
+    # Cursor pagination follows the chosen sort
+    page = client.get('/api/posts?sort=top&limit=1').get_json()
+    rest = client.get(f'/api/posts?sort=top&limit=2&cursor={page["next_cursor"]}').get_json()
+    assert [p['title'] for p in page['posts'] + rest['posts']] == ['Old favourite', 'Newest', 'Middle']
+
+    assert client.get('/api/posts?sort=random').status_code == 400
+
+def test_recompute_hot_ranks_applies_decay(create_verified_user, app):  # noqa: ARG001
+    create_verified_user(username="blogger", email="blogger@dev.com", password="Test@Pass123")
+    user = User.query.filter_by(username="blogger").first()
+    post = BlogPost(title='Decaying', content='x', user_id=user.id)  # type: ignore
+    db.session.add(post)
+    db.session.commit()
+    initial_rank = post.hot_rank
+
+    assert BlogPost.recompute_hot_ranks(now=post.created_at + timedelta(hours=10)) == 1
+    db.session.refresh(post)
+    assert post.hot_rank < initial_rank
+
+    # Posts outside the hot window are left alone
+    assert BlogPost.recompute_hot_ranks(now=post.created_at + timedelta(days=30)) == 0
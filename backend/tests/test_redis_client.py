@@ -0,0 +1,81 @@
+import logging
+import os
+
+import redis
+from utils import redis_client
+
+
+# Nothing listens on port 1, so connecting fails fast with ConnectionRefused
+UNREACHABLE_REDIS = 'redis://127.0.0.1:1/0'
+
+
+def test_no_client_without_real_redis():
+    """memory:// (tests, development) means no Redis client at all"""
+    assert redis_client.get_client() is None
+    assert redis_client.ping() is True
+    assert redis_client.pool_stats() == {'configured': False, 'pools': {}}
+
+
+def test_client_is_shared_and_pool_bounded(monkeypatch):
+    """Every caller gets the same client on one bounded, health-checked pool"""
+    monkeypatch.setenv('REDIS_URL', UNREACHABLE_REDIS)
+    monkeypatch.setenv('REDIS_MAX_CONNECTIONS', '7')
+
+    client = redis_client.get_client()
+    assert redis_client.get_client() is client
+    pool = client.connection_pool
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs['health_check_interval'] == redis_client.DEFAULT_HEALTH_CHECK_INTERVAL
+
+    # The limiter's raw-reply pool is separate but bounded the same way
+    limiter_pool = redis_client.get_pool(decode_responses=False)
+    assert limiter_pool is not pool
+    assert limiter_pool.max_connections == 7
+
+    stats = redis_client.pool_stats()
+    assert stats['configured'] is True
+    assert stats['pools']['app'] == {'max_connections': 7, 'created': 0, 'in_use': 0, 'idle': 0}
+
+
+def test_pools_are_recreated_after_fork(monkeypatch):
+    """A child process never reuses the parent's pool"""
+    monkeypatch.setenv('REDIS_URL', UNREACHABLE_REDIS)
+    parent_client = redis_client.get_client()
+
+    monkeypatch.setattr(os, 'getpid', lambda: -1)
+    child_client = redis_client.get_client()
+    assert child_client is not parent_client
+    assert child_client.connection_pool is not parent_client.connection_pool
+
+
+def test_health_reports_unreachable_redis(client, monkeypatch):
+    """/api/health answers 503 when Redis is down and never exposes pool stats"""
+    assert client.get('/api/health').get_json() == {'status': 'ok'}
+
+    monkeypatch.setenv('REDIS_URL', UNREACHABLE_REDIS)
+    response = client.get('/api/health')
+    assert response.status_code == 503
+    assert response.get_json() == {'status': 'degraded'}
+
+
+def test_health_is_rate_limited(client):
+    """The public health check cannot be used to hammer Redis"""
+    for _ in range(30):
+        assert client.get('/api/health').status_code == 200
+    assert client.get('/api/health').status_code == 429
+
+
+def test_pool_stats_are_logged_periodically(client, monkeypatch, caplog):
+    """Pool usage reaches the log at most once per interval, never the response"""
+    assert redis_client.log_pool_stats() is False  # nothing to report without Redis
+
+    monkeypatch.setenv('REDIS_URL', UNREACHABLE_REDIS)
+    redis_client.get_client()
+    with caplog.at_level(logging.INFO, logger='utils.redis_client'):
+        client.get('/api/health')
+        client.get('/api/health')
+    lines = [record.message for record in caplog.records if record.message.startswith('Redis pools')]
+    assert len(lines) == 1
+    assert "'app': {'max_connections'" in lines[0]
+    assert redis_client.log_pool_stats() is False
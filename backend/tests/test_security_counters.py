@@ -0,0 +1,62 @@
+import os
+
+from app import db
+from models.user import User
+import pytest
+from utils import redis_client, security_counters
+
+
+def _counters(username):
+    db.session.expire_all()
+    user = User.query.filter_by(username=username).one()
+    return user.failed_login_attempts, user.rate_limit_violations
+
+
+def test_counters_write_through_without_redis(create_verified_user, client):
+    """Without Redis, wrong passwords and 429s update the users row directly"""
+    create_verified_user(username='stuffed', email='stuffed@dev.com')
+
+    for _ in range(5):
+        assert client.post('/api/login', json={'identifier': 'stuffed', 'password': 'Wrong@Pass1'}).status_code == 401
+    assert client.post('/api/login', json={'identifier': 'stuffed@dev.com', 'password': 'Wrong@Pass1'}).status_code == 429
+
+    assert _counters('stuffed') == (5, 1)
+    assert security_counters.flush_pending_counters() == 0
+
+
+@pytest.mark.skipif(not os.environ.get('REDIS_TEST_URL'), reason='REDIS_TEST_URL not set (needs a real Redis)')
+def test_counters_are_buffered_and_flushed(create_verified_user, client, monkeypatch):
+    """Attack traffic only touches Redis; the worker flush applies the totals"""
+    create_verified_user(username='stuffed', email='stuffed@dev.com')
+    monkeypatch.setenv('REDIS_URL', os.environ['REDIS_TEST_URL'])
+    redis_client.get_client().delete(security_counters.PENDING_KEY, security_counters.INFLIGHT_KEY)
+
+    for _ in range(2):
+        assert client.post('/api/login', json={'identifier': 'stuffed', 'password': 'Wrong@Pass1'}).status_code == 401
+    assert _counters('stuffed') == (0, 0)
+    assert security_counters.flush_pending_counters() == 1
+    assert _counters('stuffed') == (2, 0)
+
+    # A successful login resets the count, including failures not yet flushed
+    client.post('/api/login', json={'identifier': 'stuffed', 'password': 'Wrong@Pass1'})
+    assert client.post('/api/login', json={'identifier': 'stuffed', 'password': 'Test@Pass123'}).status_code == 200
+    assert security_counters.flush_pending_counters() == 0
+    assert _counters('stuffed') == (0, 0)
+
+    client.post('/api/login', json={'identifier': 'stuffed', 'password': 'Wrong@Pass1'})
+    assert client.post('/api/login', json={'identifier': 'STUFFED@dev.com', 'password': 'Wrong@Pass1'}).status_code == 429
+    assert security_counters.flush_pending_counters() == 1
+    assert _counters('stuffed') == (1, 1)
+
+    # Crash after the commit but before the delete: the replayed batch is skipped
+    client.post('/api/login', json={'identifier': 'stuffed', 'password': 'Wrong@Pass1'})
+    r = redis_client.get_client()
+    r.renamenx(security_counters.PENDING_KEY, security_counters.INFLIGHT_KEY)
+    r.hset(security_counters.INFLIGHT_KEY, security_counters.BATCH_FIELD, 'crashed-batch')
+    batch = r.hgetall(security_counters.INFLIGHT_KEY)
+    assert security_counters.flush_pending_counters() == 1
+    applied = _counters('stuffed')
+    r.hset(security_counters.INFLIGHT_KEY, mapping=batch)
+    assert security_counters.flush_pending_counters() == 0
+    assert _counters('stuffed') == applied
+    assert not r.exists(security_counters.INFLIGHT_KEY)
@@ -1,7 +1,14 @@
 """Tests for user routes (routes/user.py)"""
+from datetime import datetime, timedelta, timezone
+import os
+
 from app import db
+from models.comment import Comment
 from models.post import BlogPost
 from models.user import User
+from models.vote import DOWNVOTE, UPVOTE, Vote
+import pytest
+from utils import overview_cache
 
 
 def test_get_profile(authenticated_client):
@@ -103,6 +110,28 @@ def test_delete_profile(authenticated_client):
     assert post is None
 
 
+def test_delete_profile_updates_comment_counts(create_verified_user, get_auth_token, client):
+    """Test DELETE /api/profile decrements comment_count on other users' posts"""
+    create_verified_user(username='postowner', email='postowner@dev.com', password='Test@Pass123')
+    owner = User.query.filter_by(username='postowner').first()
+    post = BlogPost(title='Owner Post', content='Content', user_id=owner.id)
+    db.session.add(post)
+    db.session.commit()
+    post_id = post.id
+
+    create_verified_user(username='leaver', email='leaver@dev.com', password='Test@Pass123')
+    token = get_auth_token(username='leaver', password='Test@Pass123')
+    for i in range(2):
+        client.post(f'/api/posts/{post_id}/comments', json={
+            'content': f'Comment {i}'
+        }, headers={'Authorization': f'Bearer {token}'})
+    assert client.get(f'/api/posts/{post_id}').get_json()['comment_count'] == 2
+
+    response = client.delete('/api/profile', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert client.get(f'/api/posts/{post_id}').get_json()['comment_count'] == 0
+
+
 def test_get_user_by_username(create_verified_user, client):
     """Test GET /api/users/<username> - Get user profile by username"""
     create_verified_user(username='publicuser', email='public@dev.com', password='Test@Pass123')
@@ -206,3 +235,167 @@ def test_get_user_comments_count(create_verified_user, client):
     data = response.get_json()
     assert 'count' in data
     assert data['count'] == 0
+
+
+def test_get_user_posts_fixed_query_count(create_verified_user, client, count_queries):
+    """GET /api/users/<username>/posts - one lookup for the user, one for the posts"""
+    create_verified_user(username='author', email='author@dev.com', password='Test@Pass123')
+    user = User.query.filter_by(username='author').first()
+    db.session.add_all([BlogPost(title=f'Post {i}', content='Body', user_id=user.id) for i in range(200)])  # type: ignore
+    db.session.commit()
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        response = client.get('/api/users/author/posts')
+    assert response.status_code == 200
+    assert len(response.get_json()) == 200
+    assert len(statements) == 2
+
+
+def test_get_user_voted_posts_fixed_query_count(create_verified_user, client, count_queries):
+    """GET /api/users/<username>/voted-posts - one join regardless of vote count, newest vote first"""
+    create_verified_user(username='voter', email='voter@dev.com', password='Test@Pass123')
+    user = User.query.filter_by(username='voter').first()
+    posts = [BlogPost(title=f'Post {i}', content='Body', user_id=user.id) for i in range(150)]  # type: ignore
+    db.session.add_all(posts)
+    db.session.flush()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc).replace(tzinfo=None)
+    db.session.add_all([
+        Vote(user_id=user.id, post_id=post.id, vote_type=UPVOTE if i % 2 else DOWNVOTE,  # type: ignore
+             created_at=start + timedelta(minutes=i))
+        for i, post in enumerate(posts)
+    ])
+    db.session.commit()
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        response = client.get('/api/users/voter/voted-posts?limit=100')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data['posts']) == 100
+    assert data['posts'][0]['title'] == 'Post 149'
+    assert data['posts'][0]['user_vote'] == 'upvote'
+    assert data['posts'][1]['user_vote'] == 'downvote'
+    assert all(post['author'] == 'voter' for post in data['posts'])
+    assert len(statements) == 2
+
+    response = client.get(f"/api/users/voter/voted-posts?limit=100&cursor={data['next_cursor']}")
+    data = response.get_json()
+    assert [post['title'] for post in data['posts']] == [f'Post {i}' for i in range(49, -1, -1)]
+    assert data['next_cursor'] is None
+
+    with count_queries() as statements:
+        response = client.get('/api/users/voter/voted-posts?all=true')
+    assert len(response.get_json()) == 150
+    assert len(statements) == 2
+
+
+def test_get_user_commented_posts_latest_comment(create_verified_user, client, count_queries):
+    """GET /api/users/<username>/commented-posts - one row per post with the latest comment, one statement"""
+    create_verified_user(username='chatty', email='chatty@dev.com', password='Test@Pass123')
+    user = User.query.filter_by(username='chatty').first()
+    posts = [BlogPost(title=f'Post {i}', content='Body', user_id=user.id) for i in range(30)]  # type: ignore
+    db.session.add_all(posts)
+    db.session.flush()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc).replace(tzinfo=None)
+    comments = []
+    for i, post in enumerate(posts):
+        for j in range(3):
+            comments.append(Comment(content=f'Reply {j} on {i}', user_id=user.id, post_id=post.id,  # type: ignore
+                                    created_at=start + timedelta(minutes=i + 100 * j)))
+    db.session.add_all(comments)
+    db.session.commit()
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        response = client.get('/api/users/chatty/commented-posts?limit=20')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(statements) == 2
+    assert len(data['posts']) == 20
+    assert data['posts'][0]['title'] == 'Post 29'
+    assert data['posts'][0]['user_comment']['content'] == 'Reply 2 on 29'
+
+    response = client.get(f"/api/users/chatty/commented-posts?limit=20&cursor={data['next_cursor']}")
+    data = response.get_json()
+    assert [post['title'] for post in data['posts']] == [f'Post {i}' for i in range(9, -1, -1)]
+    assert data['next_cursor'] is None
+
+    response = client.get('/api/users/chatty/commented-posts?all=true')
+    assert len(response.get_json()) == 30
+
+
+def test_get_user_posts_summary_view(create_verified_user, client):
+    """GET /api/users/<username>/posts?view=summary returns excerpts, not content"""
+    create_verified_user(username='author', email='author@dev.com', password='Test@Pass123')
+    user = User.query.filter_by(username='author').first()
+    db.session.add(BlogPost(title='Post', content='Short body', user_id=user.id))  # type: ignore
+    db.session.commit()
+
+    response = client.get('/api/users/author/posts?view=summary')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data[0]['excerpt'] == 'Short body'
+    assert 'content' not in data[0]
+
+    assert client.get('/api/users/author/posts?view=bogus').status_code == 400
+
+
+def test_get_user_overview(create_verified_user, get_auth_token, client, count_queries):
+    """GET /api/users/<username>/overview - profile, counts and first pages, cached until the user writes"""
+    create_verified_user(username='profiled', email='profiled@dev.com', password='Test@Pass123')
+    token = get_auth_token(username='profiled', password='Test@Pass123')
+    headers = {'Authorization': f'Bearer {token}'}
+    post_ids = []
+    for i in range(3):
+        response = client.post('/api/posts', json={'title': f'Post {i}', 'content': 'Body'}, headers=headers)
+        post_ids.append(response.get_json()['id'])
+    client.post(f'/api/posts/{post_ids[0]}/upvote', headers=headers)
+    client.post(f'/api/posts/{post_ids[1]}/comments', json={'content': 'Self reply'}, headers=headers)
+    db.session.expire_all()
+
+    with count_queries() as statements:
+        response = client.get('/api/users/profiled/overview?limit=2')
+    assert response.status_code == 200
+    data = response.get_json()
+    # User, aggregate counts, and one statement per list
+    assert len(statements) == 5
+    assert data['user']['username'] == 'profiled'
+    assert data['counts'] == {
+        'posts': 3, 'votes': 1, 'comments': 1, 'votes_received': 1, 'comments_received': 1
+    }
+    assert [post['title'] for post in data['posts']['posts']] == ['Post 2', 'Post 1']
+    assert data['posts']['next_cursor']
+    assert [post['user_vote'] for post in data['voted_posts']['posts']] == ['upvote']
+    assert data['commented_posts']['posts'][0]['user_comment']['content'] == 'Self reply'
+
+    response = client.get(f"/api/users/profiled/posts?limit=2&cursor={data['posts']['next_cursor']}")
+    assert [post['title'] for post in response.get_json()['posts']] == ['Post 0']
+
+    # Served from cache: only the user lookup
+    with count_queries() as statements:
+        assert client.get('/api/users/profiled/overview?limit=2').get_json()['counts']['posts'] == 3
+    assert len(statements) == 1
+
+    # The user's own write invalidates their entry
+    client.post('/api/posts', json={'title': 'Post 3', 'content': 'Body'}, headers=headers)
+    assert client.get('/api/users/profiled/overview?limit=2').get_json()['counts']['posts'] == 4
+
+    assert client.get('/api/users/nobody/overview').status_code == 404
+    assert client.get('/api/users/profiled/overview?limit=0').status_code == 400
+
+
+@pytest.mark.skipif(not os.environ.get('REDIS_TEST_URL'), reason='REDIS_TEST_URL not set (needs a real Redis)')
+def test_overview_cache_is_shared_between_workers(monkeypatch):
+    """With Redis, an invalidation by one worker is seen by every other worker"""
+    monkeypatch.setenv('REDIS_URL', os.environ['REDIS_TEST_URL'])
+    overview = {'counts': {'posts': 1}, 'posts': {'posts': [], 'next_cursor': None}}
+    overview_cache.invalidate_overview(424242)
+
+    overview_cache.set_overview(424242, 20, overview)
+    overview_cache.clear_overviews()  # nothing held in this process
+    assert overview_cache.get_overview(424242, 20) == overview
+    assert overview_cache.get_overview(424242, 50) is None
+
+    overview_cache.invalidate_overview(424242)
+    assert overview_cache.get_overview(424242, 20) is None
@@ -0,0 +1,159 @@
+"""
+Rate limit incidents aggregated into a periodic admin digest.
+
+The 429 handler only records the incident: one XADD to the alerts:rate_limit
+Redis stream (capped at roughly STREAM_MAXLEN entries). The blog-worker's
+send_alert_digest job then reads everything recorded since the last digest,
+groups it by endpoint with the top offending IPs, queues a single email to
+ADMIN_EMAIL and trims the entries it reported. A distributed attack from
+hundreds of IPs therefore costs one O(1) Redis write per blocked request and
+one email per digest interval.
+
+If the worker dies after queueing the digest but before trimming, the next
+digest repeats those incidents; nothing is lost. Without Redis (development)
+there is nowhere the worker could read incidents from, so each one is only
+logged at info level and no digest is sent.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+import time
+
+from app import db
+from flask import current_app
+import redis
+from utils import redis_client
+from utils.email import send_email
+from utils.email_templates import render_email
+
+
+STREAM_KEY = 'alerts:rate_limit'
+STREAM_MAXLEN = 100000     # approximate cap, enforced by XADD
+READ_BATCH = 1000
+MAX_DIGEST_INCIDENTS = 50000  # anything beyond waits for the next digest
+TOP_IPS = 10
+TOP_IDENTIFIERS = 5
+
+
+def record_rate_limit_incident(ip_address, endpoint, user_email=None):
+    """
+    Record one rate-limited request for the next digest (never raises).
+
+    Args:
+        ip_address: Client IP that hit the limit
+        endpoint: Request path that was limited
+        user_email: Email/username from the request body, if any
+    """
+    incident = {
+        'ip': ip_address,
+        'endpoint': endpoint,
+        'email': user_email or '',
+        'ts': f'{time.time():.3f}',
+    }
+    r = redis_client.get_client()
+    if r is None:
+        current_app.logger.info(
+            f"Rate limit incident (not digested without Redis): {ip_address} on {endpoint}"
+            + (f" for {user_email}" if user_email else "")
+        )
+        return
+    try:
+        r.xadd(STREAM_KEY, incident, maxlen=STREAM_MAXLEN, approximate=True)
+    except redis.RedisError as e:
+        current_app.logger.warning(f"Could not record rate limit incident: {e!r}")
+
+
+def _read_incidents(r):
+    """(incidents, last stream id) for up to MAX_DIGEST_INCIDENTS entries"""
+    incidents, last_id, start = [], None, '-'
+    while len(incidents) < MAX_DIGEST_INCIDENTS:
+        entries = r.xrange(STREAM_KEY, min=start, max='+', count=READ_BATCH)
+        if not entries:
+            break
+        for entry_id, fields in entries:
+            incidents.append(fields)
+            last_id = entry_id
+        start = f'({last_id}'  # exclusive range start
+    return incidents, last_id
+
+
+def _next_id(entry_id):
+    """Smallest stream id after entry_id (XTRIM MINID keeps ids >= it)"""
+    ms, seq = entry_id.split('-')
+    return f'{ms}-{int(seq) + 1}'
+
+
+def _format_ts(ts):
+    return datetime.fromtimestamp(float(ts), tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
+
+
+def summarize(incidents):
+    """
+    Group incidents by endpoint, busiest first.
+
+    Returns:
+        list: dicts with endpoint, count, distinct_ips, top_ips [(ip, count)],
+              identifiers [(email, count)], first_seen and last_seen
+    """
+    groups = {}
+    for incident in incidents:
+        group = groups.setdefault(incident['endpoint'], {
+            'ips': Counter(), 'identifiers': Counter(), 'first': incident['ts'], 'last': incident['ts'],
+        })
+        group['ips'][incident['ip']] += 1
+        if incident.get('email'):
+            group['identifiers'][incident['email']] += 1
+        group['first'] = min(group['first'], incident['ts'], key=float)
+        group['last'] = max(group['last'], incident['ts'], key=float)
+
+    summary = [
+        {
+            'endpoint': endpoint,
+            'count': sum(group['ips'].values()),
+            'distinct_ips': len(group['ips']),
+            'top_ips': group['ips'].most_common(TOP_IPS),
+            'identifiers': group['identifiers'].most_common(TOP_IDENTIFIERS),
+            'first_seen': _format_ts(group['first']),
+            'last_seen': _format_ts(group['last']),
+        }
+        for endpoint, group in groups.items()
+    ]
+    summary.sort(key=lambda item: item['count'], reverse=True)
+    return summary
+
+
+def send_rate_limit_digest():
+    """
+    Queue one digest email covering all incidents since the last one (blog-worker job).
+
+    Returns:
+        int: Number of incidents consumed (dropped with a warning if ADMIN_EMAIL is unset)
+    """
+    r = redis_client.get_client()
+    if r is None:
+        return 0
+    incidents, last_id = _read_incidents(r)
+    if not incidents:
+        return 0
+
+    admin_email = current_app.config.get('ADMIN_EMAIL')
+    if admin_email:
+        summary = summarize(incidents)
+        distinct_ips = len({incident['ip'] for incident in incidents})
+        html = render_email(
+            'rate_limit_digest',
+            endpoints=summary,
+            total=len(incidents),
+            distinct_ips=distinct_ips,
+            generated_at=datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC'),
+        )
+        send_email(
+            to=admin_email,
+            subject=f"🚨 Rate Limit Digest - {len(incidents)} blocked request(s) from {distinct_ips} IP(s)",
+            html=html,
+        )
+        db.session.commit()
+    else:
+        current_app.logger.warning(f"ADMIN_EMAIL not configured - dropping {len(incidents)} rate limit incident(s)")
+
+    r.xtrim(STREAM_KEY, minid=_next_id(last_id), approximate=False)
+    return len(incidents)
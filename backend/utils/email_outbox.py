@@ -0,0 +1,233 @@
+"""
+Delivery of queued emails from the email_outbox table (blog-worker job).
+
+utils.email.send_email only inserts an OutboxEmail row in the caller's
+transaction, so no request ever waits on the email provider. The
+deliver_emails worker job then:
+
+    1. Claims due rows in a short transaction (FOR UPDATE SKIP LOCKED on
+       Postgres), bumping attempts and pushing next_attempt_at out by
+       CLAIM_LEASE so a crashed delivery is retried after the lease.
+    2. Sends each claimed email through the configured transport outside any
+       transaction.
+    3. Deletes delivered rows; failed rows are rescheduled with exponential
+       backoff, and after MAX_ATTEMPTS are kept with status 'dead'.
+
+Registration and 2FA codes go through the outbox too, so a running worker is
+required for anyone to sign up or log in. deliver_emails runs on its own
+thread in the worker, so geolocation and hot-rank recomputation never delay
+a code.
+
+Delivery is at-least-once: a crash between sending and deleting resends
+that email. Dead rows can be retried with
+    UPDATE email_outbox SET status = 'pending', attempts = 0 WHERE status = 'dead';
+
+Transports (EMAIL_TRANSPORT): 'resend' (production), 'log' (development -
+prints codes and links instead of sending) and 'fake' (tests - records
+messages in fake_transport.sent).
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import re
+
+from app import db
+from flask import current_app
+from models.email_outbox import OUTBOX_DEAD, OUTBOX_PENDING, OutboxEmail
+import resend
+
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 30     # seconds before the first retry, doubled per attempt
+BACKOFF_MAX = 3600
+CLAIM_LEASE = 300     # seconds a claimed row is hidden from other deliveries
+
+
+@dataclass
+class QueuedEmail:
+    """Snapshot of a claimed outbox row, usable after the claim transaction"""
+    id: int
+    to: list
+    subject: str
+    html: str
+    from_email: str
+    reply_to: str | None
+    attempts: int
+
+
+class ResendTransport:
+    """Sends through the Resend API"""
+
+    def send(self, message):
+        resend.api_key = current_app.config.get('RESEND_API_KEY')
+        if not resend.api_key:
+            raise ValueError("RESEND_API_KEY not configured")
+
+        params = {
+            "from": message.from_email,
+            "to": message.to,
+            "subject": message.subject,
+            "html": message.html,
+        }
+        if message.reply_to:
+            params["reply_to"] = message.reply_to
+        resend.Emails.send(params)  # type: ignore[arg-type]
+
+
+class LogTransport:
+    """Logs emails instead of sending them (development)"""
+
+    def send(self, message):
+        # Extract URLs from HTML for easy copy/paste
+        urls = re.findall(r'href=["\']([^"\']*)["\']', message.html)
+        # Filter to only show http/https URLs (exclude mailto:)
+        action_urls = [url for url in urls if url.startswith('http')]
+
+        # Also extract 2FA codes or verification codes from HTML
+        code_pattern = r'(?:code|verification code|2FA code).*?([0-9]{6})'
+        codes = re.findall(code_pattern, message.html, re.IGNORECASE | re.DOTALL)
+
+        current_app.logger.info(
+            f"\n{'='*80}\n"
+            f"[DEVELOPMENT MODE] Email NOT sent - logged instead:\n"
+            f"  To: {message.to}\n"
+            f"  Subject: {message.subject}\n"
+            f"  From: {message.from_email}\n"
+            f"  Reply-To: {message.reply_to or 'N/A'}\n"
+        )
+
+        # Print verification codes if found
+        if codes:
+            current_app.logger.info("\n  🔑 VERIFICATION CODE(S):")
+            for i, code in enumerate(codes, 1):
+                current_app.logger.info(f"     [{i}] {code}")
+
+        # Print action URLs if found
+        if action_urls:
+            current_app.logger.info("\n  📧 ACTION LINKS (copy/paste to test):")
+            for i, url in enumerate(action_urls, 1):
+                current_app.logger.info(f"     [{i}] {url}")
+
+        current_app.logger.info(
+            f"\n"
+            f"  💡 TIP: Copy the code/link above and use it to test!\n"
+            f"{'='*80}\n"
+        )
+
+
+class FakeTransport:
+    """Records emails in memory (tests); fail_next makes the next N sends raise"""
+
+    def __init__(self):
+        self.sent = []
+        self.fail_next = 0
+
+    def send(self, message):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("Fake transport failure")
+        self.sent.append({
+            'to': list(message.to),
+            'subject': message.subject,
+            'html': message.html,
+            'from_email': message.from_email,
+            'reply_to': message.reply_to,
+        })
+
+    def reset(self):
+        self.sent.clear()
+        self.fail_next = 0
+
+
+fake_transport = FakeTransport()
+_TRANSPORTS = {
+    'resend': ResendTransport,
+    'log': LogTransport,
+    'fake': lambda: fake_transport,
+}
+
+
+def get_transport():
+    """Transport selected by EMAIL_TRANSPORT"""
+    name = current_app.config.get('EMAIL_TRANSPORT', 'resend')
+    if name not in _TRANSPORTS:
+        raise ValueError(f"Unknown EMAIL_TRANSPORT: {name}")
+    return _TRANSPORTS[name]()
+
+
+def retry_delay(attempts):
+    """Seconds to wait after the given number of failed attempts"""
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+def _utcnow():
+    return datetime.now(tz=timezone.utc).replace(tzinfo=None)
+
+
+def claim_due_emails(limit=BATCH_SIZE):
+    """
+    Lease a batch of due emails to this process.
+
+    Returns:
+        list: QueuedEmail snapshots with attempts already incremented
+    """
+    now = _utcnow()
+    rows = (
+        OutboxEmail.query
+        .filter(OutboxEmail.status == OUTBOX_PENDING, OutboxEmail.next_attempt_at <= now)
+        .order_by(OutboxEmail.next_attempt_at, OutboxEmail.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for row in rows:
+        row.attempts += 1
+        row.next_attempt_at = now + timedelta(seconds=CLAIM_LEASE)
+        claimed.append(QueuedEmail(
+            id=row.id,
+            to=row.to,
+            subject=row.subject,
+            html=row.html,
+            from_email=row.from_email,
+            reply_to=row.reply_to,
+            attempts=row.attempts,
+        ))
+    db.session.commit()
+    return claimed
+
+
+def deliver_pending_emails(limit=BATCH_SIZE):
+    """
+    Deliver due outbox emails, rescheduling or dead-lettering failures.
+
+    Returns:
+        tuple: (delivered, failed) counts
+    """
+    messages = claim_due_emails(limit)
+    if not messages:
+        return 0, 0
+
+    transport = get_transport()
+    delivered_ids, failures = [], []
+    for message in messages:
+        try:
+            transport.send(message)
+            delivered_ids.append(message.id)
+        except Exception as e:
+            current_app.logger.warning(f"Email {message.id} delivery attempt {message.attempts} failed: {e!r}")
+            failures.append((message, repr(e)[:1000]))
+
+    if delivered_ids:
+        OutboxEmail.query.filter(OutboxEmail.id.in_(delivered_ids)).delete(synchronize_session=False)
+    now = _utcnow()
+    for message, error in failures:
+        changes = {OutboxEmail.last_error: error}
+        if message.attempts >= MAX_ATTEMPTS:
+            changes[OutboxEmail.status] = OUTBOX_DEAD
+            current_app.logger.error(f"Email {message.id} to {message.to} dead-lettered after {message.attempts} attempts")
+        else:
+            changes[OutboxEmail.next_attempt_at] = now + timedelta(seconds=retry_delay(message.attempts))
+        OutboxEmail.query.filter_by(id=message.id).update(changes, synchronize_session=False)
+    db.session.commit()
+    return len(delivered_ids), len(failures)
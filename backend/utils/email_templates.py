@@ -0,0 +1,91 @@
+"""
+Compiled Jinja2 environment for the HTML emails in templates/email/.
+
+Every email extends base.html (card, blog header, signature and footer) and
+shares the alert/button/code macros in macros.html. All templates are compiled
+once when this module is imported, so rendering is a call into precompiled
+Python code: the layout and other static markup are constant strings in that
+code and only the escaped variables are produced per email. Autoescaping is
+on, so context values never need manual escape() calls.
+
+render_batch renders one template for many recipients in a single call,
+reusing the compiled template and shared globals.
+"""
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'templates' / 'email'
+
+SUPPORT_EMAIL = 'support@computeranything.dev'
+
+# Inline styles shared by the macros (email clients ignore <style> blocks)
+STYLES = {
+    'button_primary': 'background-color: #28a745; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; font-weight: bold;',
+    'alert_success': 'background-color: #d4edda; border-left: 4px solid #28a745; padding: 15px; margin: 20px 0; border-radius: 4px;',
+    'alert_warning': 'background-color: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin: 20px 0; border-radius: 4px;',
+    'alert_danger': 'background-color: #f8d7da; border-left: 4px solid #dc3545; padding: 15px; margin: 20px 0; border-radius: 4px;',
+    'alert_info': 'background-color: #d1ecf1; border-left: 4px solid #17a2b8; padding: 15px; margin: 20px 0; border-radius: 4px;',
+}
+
+# Template name -> subject line
+SUBJECTS = {
+    'login_notification': "New Login to Your Account",
+    'email_verification': "Confirm Your Email",
+    'password_reset_request': "Password Reset Request",
+    'password_reset_confirmation': "Password Reset Successful",
+    'password_change_confirmation': "Password Changed Successfully",
+    '2fa_code': "Your Login Verification Code",
+    'registration_code': "Welcome! Verify Your Email",
+    'password_reset_admin_alert': "🔐 Password Reset Request - Security Alert",
+    'rate_limit_digest': None,  # built per digest (see utils/alert_digest.py)
+}
+
+
+def create_environment():
+    """Jinja2 environment for the email templates (templates never change at runtime)"""
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=False,
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    env.globals.update(styles=STYLES, support_email=SUPPORT_EMAIL)
+    return env
+
+
+_env = create_environment()
+_templates = {name: _env.get_template(f'{name}.html') for name in SUBJECTS}
+
+
+def render_email(name, **context):
+    """
+    Render one email.
+
+    Args:
+        name: Template name (a key of SUBJECTS)
+        **context: Template variables
+
+    Returns:
+        str: The HTML body
+    """
+    return _templates[name].render(context)
+
+
+def render_batch(name, contexts):
+    """
+    Render one template for many recipients.
+
+    Args:
+        name: Template name (a key of SUBJECTS)
+        contexts: Iterable of per-recipient template variable dicts
+
+    Returns:
+        list: (subject, html) per context, in order
+    """
+    template = _templates[name]
+    subject = SUBJECTS[name]
+    return [(subject, template.render(context)) for context in contexts]
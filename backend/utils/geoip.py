@@ -0,0 +1,194 @@
+"""
+Offline IP geolocation from a local database file (GEOIP_DATABASE_PATH).
+
+Two formats are supported, chosen by file extension:
+
+    *.mmdb   MaxMind-style database, read with the maxminddb package (optional
+             dependency) in MODE_MMAP
+    other    Sorted range table built by scripts/refresh_geoip.py:
+
+             header   '>8sIIQ'  magic, IPv4 count, IPv6 count, strings offset
+             IPv4     '>III'    start, end, location offset   (sorted by start)
+             IPv6     16s 16s I start, end, location offset   (sorted by start)
+             strings  u16 length + UTF-8 "City, Country" per distinct location
+
+Either way the file is memory-mapped, so every gunicorn worker shares the same
+page-cache copy and a lookup is a binary search with no network I/O. A
+refreshed file is swapped in atomically (os.replace) and picked up within
+RELOAD_CHECK_INTERVAL seconds.
+"""
+import ipaddress
+import mmap
+import os
+import struct
+import threading
+import time
+
+
+MAGIC = b'CPTAGEO1'
+HEADER = struct.Struct('>8sIIQ')
+V4_RECORD = struct.Struct('>III')
+V6_RECORD = struct.Struct('>16s16sI')
+STRING_LENGTH = struct.Struct('>H')
+RELOAD_CHECK_INTERVAL = 60
+
+_reader = None
+_reader_key = None
+_checked_at = 0.0
+_reader_lock = threading.Lock()
+
+
+class RangeTableReader:
+    """Binary search over a memory-mapped sorted range table"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._v4_count, self._v6_count, self._strings_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a geolocation range table")
+        self._v4_offset = HEADER.size
+        self._v6_offset = self._v4_offset + self._v4_count * V4_RECORD.size
+
+    def _search(self, record, offset, count, key):
+        """Location offset of the last range starting at or below key, if it contains key"""
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            if record.unpack_from(self._mm, offset + mid * record.size)[0] <= key:
+                low = mid + 1
+            else:
+                high = mid
+        if low == 0:
+            return None
+        _, end, location_offset = record.unpack_from(self._mm, offset + (low - 1) * record.size)
+        return location_offset if key <= end else None
+
+    def lookup(self, ip_address):
+        ip = ipaddress.ip_address(ip_address)
+        if ip.version == 4:
+            location_offset = self._search(V4_RECORD, self._v4_offset, self._v4_count, int(ip))
+        else:
+            location_offset = self._search(V6_RECORD, self._v6_offset, self._v6_count, ip.packed)
+        if location_offset is None:
+            return None
+        start = self._strings_offset + location_offset
+        (length,) = STRING_LENGTH.unpack_from(self._mm, start)
+        start += STRING_LENGTH.size
+        return self._mm[start:start + length].decode('utf-8')
+
+    def close(self):
+        self._mm.close()
+
+
+class MMDBReader:
+    """MaxMind-style .mmdb database (needs the maxminddb package)"""
+
+    def __init__(self, path):
+        import maxminddb  # noqa: PLC0415
+
+        self._db = maxminddb.open_database(path, maxminddb.MODE_MMAP)
+
+    def lookup(self, ip_address):
+        record = self._db.get(ip_address)
+        if not record:
+            return None
+        city = record.get('city', {}).get('names', {}).get('en', '')
+        country = record.get('country', {}).get('names', {}).get('en', '')
+        if city and country:
+            return f"{city}, {country}"
+        return country or None
+
+    def close(self):
+        self._db.close()
+
+
+def open_reader(path):
+    """Open a geolocation database file with the reader matching its format"""
+    if path.endswith('.mmdb'):
+        return MMDBReader(path)
+    return RangeTableReader(path)
+
+
+def _get_reader(path):
+    """This process's reader for path, reopened when the file is replaced"""
+    global _reader, _reader_key, _checked_at  # noqa: PLW0603
+    now = time.monotonic()
+    if _reader is not None and _reader_key[0] == path and now - _checked_at < RELOAD_CHECK_INTERVAL:
+        return _reader
+    with _reader_lock:
+        stat = os.stat(path)
+        key = (path, stat.st_ino, stat.st_mtime_ns)
+        if key != _reader_key:
+            # The previous map stays valid for lookups already using it
+            _reader = open_reader(path)
+            _reader_key = key
+        _checked_at = now
+        return _reader
+
+
+def lookup(path, ip_address):
+    """
+    Location of an IP from the local database.
+
+    Returns:
+        str | None: "City, Country", or None if the IP is not covered
+
+    Raises:
+        OSError, ValueError: If the database is missing or unreadable
+    """
+    return _get_reader(path).lookup(ip_address)
+
+
+def build_range_table(rows, path):
+    """
+    Compile (start_ip, end_ip, location) rows into a range table file.
+
+    Rows of each address family must be sorted by start address and not
+    overlap (the order geolocation CSV exports use). The file is written next
+    to path and moved into place atomically.
+
+    Args:
+        rows: Iterable of (start_ip, end_ip, location) strings
+        path: Destination file
+
+    Returns:
+        tuple: (ipv4_ranges, ipv6_ranges) written
+    """
+    strings = {}
+    string_bytes = bytearray()
+    v4, v6 = bytearray(), bytearray()
+    last_v4 = last_v6 = None
+
+    for start_ip, end_ip, location in rows:
+        start, end = ipaddress.ip_address(start_ip), ipaddress.ip_address(end_ip)
+        if start.version != end.version or start > end:
+            raise ValueError(f"Invalid range {start_ip} - {end_ip}")
+        location_offset = strings.get(location)
+        if location_offset is None:
+            encoded = location.encode('utf-8')
+            location_offset = strings[location] = len(string_bytes)
+            string_bytes += STRING_LENGTH.pack(len(encoded)) + encoded
+
+        if start.version == 4:
+            if last_v4 is not None and start <= last_v4:
+                raise ValueError(f"IPv4 ranges are not sorted at {start_ip}")
+            v4 += V4_RECORD.pack(int(start), int(end), location_offset)
+            last_v4 = end
+        else:
+            if last_v6 is not None and start <= last_v6:
+                raise ValueError(f"IPv6 ranges are not sorted at {start_ip}")
+            v6 += V6_RECORD.pack(start.packed, end.packed, location_offset)
+            last_v6 = end
+
+    v4_count, v6_count = len(v4) // V4_RECORD.size, len(v6) // V6_RECORD.size
+    strings_offset = HEADER.size + len(v4) + len(v6)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, v4_count, v6_count, strings_offset))
+        f.write(v4)
+        f.write(v6)
+        f.write(string_bytes)
+    os.replace(tmp_path, path)
+    return v4_count, v6_count
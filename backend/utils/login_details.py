@@ -1,13 +1,24 @@
 """Utility functions for extracting login details (browser, device, location)"""
+from functools import lru_cache
+
 from flask import current_app
 import requests
 from user_agents import parse
+from utils import geoip
+
+
+# Distinct User-Agent strings are few compared with logins, while parsing one
+# runs the whole user_agents regex cascade
+USER_AGENT_CACHE_SIZE = 1024
 
 
 def parse_user_agent(user_agent_string):
     """
     Parse User-Agent string to extract browser and device information.
 
+    Results are memoized per raw string in a bounded LRU shared by the module
+    (see user_agent_cache_stats).
+
     Args:
         user_agent_string: The User-Agent header from the request
 
@@ -18,7 +29,27 @@ def parse_user_agent(user_agent_string):
     """
     if not user_agent_string:
         return "Unknown Browser", "Unknown Device"
+    return _parse_user_agent_cached(user_agent_string)
 
+
+def user_agent_cache_stats():
+    """
+    Hit/miss counters of the parse_user_agent cache.
+
+    Returns:
+        dict: {'hits', 'misses', 'size', 'maxsize'}
+    """
+    info = _parse_user_agent_cached.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+def clear_user_agent_cache():
+    """Empty the parse_user_agent cache and reset its counters"""
+    _parse_user_agent_cached.cache_clear()
+
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def _parse_user_agent_cached(user_agent_string):
     try:
         user_agent = parse(user_agent_string)
 
@@ -49,7 +80,11 @@ def parse_user_agent(user_agent_string):
 
 def get_location_from_ip(ip_address):
     """
-    Get approximate location from IP address using ipapi.co free service.
+    Get approximate location from IP address.
+
+    Uses the local geolocation database (GEOIP_DATABASE_PATH, see utils/geoip.py)
+    when configured, falling back to the ipapi.co free service for IPs it does
+    not cover or when the file cannot be read.
 
     Args:
         ip_address: IP address string
@@ -65,6 +100,15 @@ def get_location_from_ip(ip_address):
     if ip_address.startswith(('10.', '172.', '192.168.')):
         return "Private Network"
 
+    database_path = current_app.config.get('GEOIP_DATABASE_PATH')
+    if database_path:
+        try:
+            location = geoip.lookup(database_path, ip_address)
+            if location:
+                return location
+        except (OSError, ValueError) as e:
+            current_app.logger.warning(f"Local geolocation lookup failed: {e!r}")
+
     try:
         # Use ipapi.co free tier (no API key needed, 1000 requests/day)
         response = requests.get(
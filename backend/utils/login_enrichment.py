@@ -0,0 +1,182 @@
+"""
+Background enrichment of successful logins (geolocation + notification email).
+
+Geolocating an IP is a blocking HTTP call to ipapi.co, so login and verify_2fa
+only record the IP and enqueue an event here. The blog-worker's
+enrich_logins job pops events from the login_enrichment:queue Redis list,
+resolves the location (cached per IP for GEOLOCATION_CACHE_TTL seconds), fills
+in users.last_login_location and queues the login notification email.
+
+Without Redis (development) events are handled by a small thread pool inside
+the web process instead; with LOGIN_ENRICHMENT_EAGER (tests) they run inline.
+Enrichment is best effort: an event lost to a worker crash only means a
+missing location and notification for that login.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import json
+import os
+import threading
+import time
+
+from app import db
+from flask import current_app
+from models.user import User
+import redis
+from utils import redis_client
+from utils.cache import TTLCache
+from utils.email import get_login_notification_email, send_email
+from utils.login_details import get_location_from_ip
+
+
+QUEUE_KEY = 'login_enrichment:queue'
+LOCATION_KEY = 'geo:{ip}'
+# Failed lookups are not cached so the next login from that IP retries
+UNCACHED_LOCATIONS = frozenset({'Unknown Location'})
+
+_local_locations = TTLCache(maxsize=10000)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _local_executor():
+    """Per-process thread pool for the no-Redis fallback (created after fork)"""
+    global _executor, _executor_pid  # noqa: PLW0603
+    with _executor_lock:
+        if _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='login-enrichment')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def enqueue_login(user_id, ip_address, browser=None, device=None):
+    """
+    Schedule location lookup and notification for a login that just committed.
+
+    Never blocks on the geolocation provider; the caller's response goes out
+    immediately.
+    """
+    event = {
+        'user_id': user_id,
+        'ip_address': ip_address,
+        'browser': browser,
+        'device': device,
+        'login_time': datetime.now(timezone.utc).strftime('%B %d, %Y at %I:%M %p UTC'),
+    }
+
+    r = redis_client.get_client()
+    if r is not None:
+        try:
+            r.lpush(QUEUE_KEY, json.dumps(event))
+            return
+        except redis.RedisError as e:
+            current_app.logger.warning(f"Login enrichment queue unavailable, enriching in process: {e!r}")
+
+    if current_app.config.get('LOGIN_ENRICHMENT_EAGER'):
+        enrich_login(event)
+        return
+    _local_executor().submit(_enrich_in_app_context, current_app._get_current_object(), event)
+
+
+def _enrich_in_app_context(app, event):
+    with app.app_context():
+        try:
+            enrich_login(event)
+        except Exception as e:
+            app.logger.error(f"Login enrichment failed: {e!r}")
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+
+def lookup_location(ip_address):
+    """
+    Location for an IP, from the per-IP cache or the geolocation provider.
+
+    Returns:
+        str: "City, Country" or one of get_location_from_ip's fallbacks
+    """
+    ttl = current_app.config.get('GEOLOCATION_CACHE_TTL', 86400)
+    key = LOCATION_KEY.format(ip=ip_address)
+    r = redis_client.get_client()
+    if r is None:
+        location = _local_locations.get(key)
+    else:
+        try:
+            location = r.get(key)
+        except redis.RedisError as e:
+            current_app.logger.warning(f"Location cache unavailable: {e!r}")
+            r, location = None, None
+    if location is not None:
+        return location
+
+    location = get_location_from_ip(ip_address)
+    if location not in UNCACHED_LOCATIONS:
+        if r is None:
+            _local_locations.set(key, location, ttl=ttl)
+        else:
+            try:
+                r.set(key, location, ex=ttl)
+            except redis.RedisError as e:
+                current_app.logger.warning(f"Location cache write failed: {e!r}")
+    return location
+
+
+def enrich_login(event):
+    """Resolve one login's location, store it on the user and queue the notification"""
+    location = lookup_location(event['ip_address'])
+
+    # A newer login from another IP may already have replaced these details
+    db.session.query(User).filter(
+        User.id == event['user_id'],
+        User.last_login_ip == event['ip_address'],
+    ).update({'last_login_location': location}, synchronize_session=False)
+
+    email = db.session.query(User.email).filter_by(id=event['user_id']).scalar()
+    if email is not None:  # None if the account was deleted since the login
+        subject, html = get_login_notification_email(
+            email=email,
+            login_time=event['login_time'],
+            ip_address=event['ip_address'],
+            location=location,
+            browser=event['browser'],
+            device=event['device']
+        )
+        send_email(to=email, subject=subject, html=html)
+    db.session.commit()
+
+
+def process_pending_logins(limit=100, time_budget=None):
+    """
+    Enrich queued logins (blog-worker job).
+
+    Args:
+        limit: Maximum number of events to process
+        time_budget: Seconds after which no further event is started
+
+    Returns:
+        int: Number of events processed
+    """
+    r = redis_client.get_client()
+    if r is None:
+        return 0
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    processed = 0
+    while processed < limit and (deadline is None or time.monotonic() < deadline):
+        payload = r.rpop(QUEUE_KEY)
+        if payload is None:
+            break
+        try:
+            enrich_login(json.loads(payload))
+        except Exception as e:
+            current_app.logger.error(f"Login enrichment failed: {e!r}")
+            db.session.rollback()
+        processed += 1
+    return processed
+
+
+def clear_local():
+    """Drop this process's cached locations (tests)"""
+    _local_locations.clear()
@@ -0,0 +1,78 @@
+"""
+Per-user cache for GET /users/<username>/overview.
+
+With Redis the cache is shared by every gunicorn worker: one hash per user
+(overview:<user_id>, a field per page size, JSON values) that expires after
+OVERVIEW_TTL seconds, so invalidating a user is a single DEL seen by all
+workers. Without Redis (development and tests) there is one process and an
+in-process TTL cache is used instead.
+"""
+import json
+import logging
+
+import redis
+from utils import redis_client
+from utils.cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+# A user's own writes invalidate their entry explicitly; the short TTL bounds
+# staleness from everything else (votes/comments by others on their posts).
+OVERVIEW_TTL = 30
+REDIS_KEY = 'overview:{user_id}'
+_overview_cache = TTLCache(maxsize=1024, ttl=OVERVIEW_TTL)
+
+
+def get_overview(user_id, limit):
+    """Cached overview for this user and page size, or None"""
+    r = redis_client.get_client()
+    if r is None:
+        return (_overview_cache.get(user_id) or {}).get(limit)
+    try:
+        cached = r.hget(REDIS_KEY.format(user_id=user_id), str(limit))
+    except redis.RedisError as e:
+        logger.warning(f"Overview cache lookup failed: {e!r}")
+        return None
+    return json.loads(cached) if cached is not None else None
+
+
+def set_overview(user_id, limit, overview):
+    """Cache an overview; entries for other page sizes of the same user are kept"""
+    r = redis_client.get_client()
+    if r is None:
+        pages = dict(_overview_cache.get(user_id) or {})
+        pages[limit] = overview
+        _overview_cache.set(user_id, pages)
+        return
+    key = REDIS_KEY.format(user_id=user_id)
+    try:
+        pipe = r.pipeline()
+        pipe.hset(key, str(limit), json.dumps(overview))
+        # Set only when the hash is new, so later page sizes never extend it
+        pipe.expire(key, OVERVIEW_TTL, nx=True)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Overview cache write failed: {e!r}")
+
+
+def invalidate_overview(*user_ids):
+    """Drop every worker's cached overviews for the given users"""
+    user_ids = [user_id for user_id in user_ids if user_id is not None]
+    if not user_ids:
+        return
+    r = redis_client.get_client()
+    if r is None:
+        for user_id in user_ids:
+            _overview_cache.delete(user_id)
+        return
+    try:
+        r.delete(*(REDIS_KEY.format(user_id=user_id) for user_id in user_ids))
+    except redis.RedisError as e:
+        # Stale for at most OVERVIEW_TTL
+        logger.warning(f"Overview cache invalidation failed: {e!r}")
+
+
+def clear_overviews():
+    """Drop every in-process cached overview (tests)"""
+    _overview_cache.clear()
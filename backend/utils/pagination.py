@@ -0,0 +1,149 @@
+"""Keyset (cursor) pagination helpers shared by list endpoints"""
+import base64
+from datetime import datetime
+import json
+
+from sqlalchemy import tuple_
+
+
+DEFAULT_PAGE_LIMIT = 20
+MAX_PAGE_LIMIT = 100
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplies a malformed pagination cursor"""
+
+
+def parse_limit(raw_limit, default=DEFAULT_PAGE_LIMIT, maximum=MAX_PAGE_LIMIT):
+    """
+    Validate the ?limit= query parameter.
+
+    Args:
+        raw_limit: Raw value from request.args (may be None)
+        default: Limit used when the parameter is absent
+        maximum: Largest page size a client may request
+
+    Returns:
+        int: Page size
+
+    Raises:
+        ValueError: If the value is not an integer between 1 and maximum
+    """
+    if raw_limit is None or raw_limit == '':
+        return default
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError(f"Limit must be between 1 and {maximum}") from None
+    if limit < 1 or limit > maximum:
+        raise ValueError(f"Limit must be between 1 and {maximum}")
+    return limit
+
+
+def encode_cursor_values(*values):
+    """Encode JSON-serializable sort-key values as an opaque URL-safe token"""
+    payload = json.dumps(list(values), separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor_values(cursor, count):
+    """
+    Decode a token produced by encode_cursor_values.
+
+    Args:
+        cursor: Opaque token from the client
+        count: Number of values the token must contain
+
+    Returns:
+        list: The decoded values
+
+    Raises:
+        InvalidCursorError: If the token cannot be decoded
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise InvalidCursorError("Invalid cursor") from None
+    if not isinstance(values, list) or len(values) != count:
+        raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def encode_cursor(sort_value, row_id):
+    """Encode a (sort key, id) position as an opaque URL-safe token"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    return encode_cursor_values(sort_value, row_id)
+
+
+def decode_cursor(cursor, sort_col):
+    """
+    Decode a token produced by encode_cursor.
+
+    Args:
+        cursor: Opaque token from the client
+        sort_col: Column the cursor was built from (determines the value type)
+
+    Returns:
+        tuple: (sort value, id: int)
+
+    Raises:
+        InvalidCursorError: If the token cannot be decoded
+    """
+    sort_value, row_id = decode_cursor_values(cursor, 2)
+    try:
+        if not isinstance(row_id, int):
+            raise TypeError("Non-integer id")
+        python_type = sort_col.type.python_type
+        if python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif python_type in (int, float) and not isinstance(sort_value, int | float):
+            raise TypeError("Non-numeric sort key")
+        return sort_value, row_id
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid cursor") from None
+
+
+def paginate_keyset(query, sort_col, id_col, limit, cursor=None, *, descending=True):
+    """
+    Apply keyset pagination over (sort_col, id_col).
+
+    The query must be backed by a composite index on the same columns so each
+    page is a bounded index range scan regardless of table size.
+
+    Args:
+        query: SQLAlchemy query to paginate
+        sort_col: Column used as the primary sort key (e.g. created_at)
+        id_col: Primary key column used as a tie-breaker
+        limit: Page size
+        cursor: Opaque cursor from a previous page (optional)
+        descending: Newest/largest first (default); False pages oldest first
+
+    Returns:
+        tuple: (rows, next_cursor) - next_cursor is None on the last page
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_col)
+        position = tuple_(sort_col, id_col)
+        after = tuple_(sort_value, row_id)
+        query = query.filter(position < after if descending else position > after)
+
+    if descending:
+        query = query.order_by(sort_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(sort_col.asc(), id_col.asc())
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*_cursor_key(rows[-1], sort_col, id_col))
+    return rows, next_cursor
+
+
+def _cursor_key(row, sort_col, id_col):
+    """Extract (sort value, id) from an ORM entity or a (entity, ...) result row"""
+    if not hasattr(row, sort_col.key):
+        row = row[0]
+    return getattr(row, sort_col.key), getattr(row, id_col.key)
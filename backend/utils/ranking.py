@@ -0,0 +1,41 @@
+"""Post ranking formulas for the "top" and "hot" feed sorts"""
+from datetime import datetime, timezone
+
+
+# Higher gravity makes posts fall off the hot feed faster
+HOT_GRAVITY = 1.8
+# Posts older than this have decayed to the bottom of the hot feed, so the
+# periodic recompute job stops touching them
+HOT_WINDOW_DAYS = 7
+
+
+def hot_rank_decay(created_at, now=None):
+    """
+    Gravity divisor for a post of the given age.
+
+    Args:
+        created_at: Naive UTC creation time of the post
+        now: Naive UTC reference time (defaults to the current time)
+
+    Returns:
+        float: (age_hours + 2) ** HOT_GRAVITY
+    """
+    if now is None:
+        now = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+    age_hours = max((now - created_at).total_seconds() / 3600, 0) if created_at else 0
+    return (age_hours + 2) ** HOT_GRAVITY
+
+
+def compute_hot_rank(score, created_at, now=None):
+    """
+    Time-decayed popularity (Hacker News style gravity).
+
+    Args:
+        score: Net votes (upvotes - downvotes)
+        created_at: Naive UTC creation time of the post
+        now: Naive UTC reference time (defaults to the current time)
+
+    Returns:
+        float: Rank where larger is hotter
+    """
+    return (score + 1) / hot_rank_decay(created_at, now)
@@ -0,0 +1,184 @@
+"""
+Shared Redis connection pools for REDIS_URL.
+
+Everything that talks to Redis (session registry, token_version cache, login
+enrichment queue, vote buffer, alert deduplication and the rate limiter) gets
+its client from here instead of calling redis.from_url itself, so each process
+holds one bounded pool rather than a new pool per call:
+
+    * BlockingConnectionPool capped at REDIS_MAX_CONNECTIONS - when every
+      connection is busy a caller waits up to REDIS_POOL_TIMEOUT seconds and
+      then gets a ConnectionError (a RedisError) instead of opening more
+      sockets, which matters during an attack when alerts fire most.
+    * Idle connections are PINGed before reuse after REDIS_HEALTH_CHECK_INTERVAL
+      seconds, and socket/connect timeouts keep a hung Redis from hanging
+      requests.
+    * Pools are per process: a pool created before a gunicorn fork is never
+      reused by the child (the pid is checked on every get_client call).
+
+The limiter gets its own pool from get_pool(decode_responses=False) because
+the limits library expects raw replies; it is bounded the same way.
+
+Pool usage is not exposed over HTTP: log_pool_stats() writes it to this
+process's log at most once per POOL_STATS_LOG_INTERVAL (at warning level when
+a pool is saturated) and is called on every request.
+"""
+import logging
+import os
+import threading
+import time
+
+import redis
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_POOL_TIMEOUT = 2           # seconds to wait for a free connection
+DEFAULT_SOCKET_TIMEOUT = 2
+DEFAULT_HEALTH_CHECK_INTERVAL = 30
+POOL_STATS_LOG_INTERVAL = 60       # seconds between pool usage log lines
+
+_pools = {}          # decode_responses -> BlockingConnectionPool
+_clients = {}        # decode_responses -> Redis
+_pid = None
+_lock = threading.Lock()
+_stats_logged_at = None
+
+
+def redis_url():
+    """REDIS_URL when it points at a real Redis, else None (memory:// or unset)"""
+    url = os.environ.get('REDIS_URL')
+    if not url or url == 'memory://':
+        return None
+    return url
+
+
+def is_configured():
+    """Whether a real Redis is configured for this process"""
+    return redis_url() is not None
+
+
+def _env_number(name, default, cast=int):
+    value = os.environ.get(name)
+    return cast(value) if value else default
+
+
+def _create_pool(url, decode_responses):
+    return redis.BlockingConnectionPool.from_url(
+        url,
+        max_connections=_env_number('REDIS_MAX_CONNECTIONS', DEFAULT_MAX_CONNECTIONS),
+        timeout=_env_number('REDIS_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT, float),
+        socket_timeout=_env_number('REDIS_SOCKET_TIMEOUT', DEFAULT_SOCKET_TIMEOUT, float),
+        socket_connect_timeout=_env_number('REDIS_SOCKET_TIMEOUT', DEFAULT_SOCKET_TIMEOUT, float),
+        health_check_interval=_env_number('REDIS_HEALTH_CHECK_INTERVAL', DEFAULT_HEALTH_CHECK_INTERVAL),
+        decode_responses=decode_responses,
+    )
+
+
+def get_pool(decode_responses=True):
+    """
+    This process's connection pool for REDIS_URL.
+
+    Returns:
+        BlockingConnectionPool | None: None when Redis is not configured
+    """
+    global _pid  # noqa: PLW0603
+    url = redis_url()
+    if url is None:
+        return None
+    with _lock:
+        if _pid != os.getpid():
+            # Forked (or first use): never share sockets with the parent
+            _pools.clear()
+            _clients.clear()
+            _pid = os.getpid()
+        if decode_responses not in _pools:
+            _pools[decode_responses] = _create_pool(url, decode_responses)
+        return _pools[decode_responses]
+
+
+def get_client(decode_responses=True):
+    """
+    Shared client for REDIS_URL (str replies by default).
+
+    Returns:
+        redis.Redis | None: None when Redis is not configured
+    """
+    pool = get_pool(decode_responses)
+    if pool is None:
+        return None
+    with _lock:
+        client = _clients.get(decode_responses)
+        if client is None or client.connection_pool is not pool:
+            client = _clients[decode_responses] = redis.Redis(connection_pool=pool)
+        return client
+
+
+def ping():
+    """False if a configured Redis does not answer (True when not configured)"""
+    client = get_client()
+    if client is None:
+        return True
+    try:
+        return bool(client.ping())
+    except redis.RedisError as e:
+        logger.warning(f"Redis ping failed: {e!r}")
+        return False
+
+
+def pool_stats():
+    """
+    Connection counts of this process's pools, for monitoring.
+
+    Returns:
+        dict: {'configured': bool, 'pools': {name: {max_connections, created, in_use, idle}}}
+    """
+    stats = {'configured': is_configured(), 'pools': {}}
+    with _lock:
+        if _pid != os.getpid():
+            return stats
+        for decode_responses, pool in _pools.items():
+            created = len(pool._connections)
+            idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+            stats['pools']['app' if decode_responses else 'limiter'] = {
+                'max_connections': pool.max_connections,
+                'created': created,
+                'in_use': created - idle,
+                'idle': idle,
+            }
+    return stats
+
+
+def log_pool_stats(interval=POOL_STATS_LOG_INTERVAL):
+    """
+    Log this process's pool usage, at most once per interval seconds.
+
+    Returns:
+        bool: True if a line was logged
+    """
+    global _stats_logged_at  # noqa: PLW0603
+    if not is_configured():
+        return False
+    now = time.monotonic()
+    with _lock:
+        if _stats_logged_at is not None and now - _stats_logged_at < interval:
+            return False
+        _stats_logged_at = now
+    pools = pool_stats()['pools']
+    saturated = any(pool['in_use'] >= pool['max_connections'] for pool in pools.values())
+    logger.log(logging.WARNING if saturated else logging.INFO, f"Redis pools (pid {os.getpid()}): {pools}")
+    return True
+
+
+def reset():
+    """Disconnect and forget this process's pools (tests, or after REDIS_URL changes)"""
+    global _pid, _stats_logged_at  # noqa: PLW0603
+    with _lock:
+        if _pid == os.getpid():
+            for pool in _pools.values():
+                pool.disconnect()
+        _pools.clear()
+        _clients.clear()
+        _pid = None
+        _stats_logged_at = None
@@ -0,0 +1,88 @@
+"""Full-text search over blog posts (Postgres tsvector, SQLite FTS5 fallback)"""
+import re
+
+from app import db
+from models.post import BlogPost
+from sqlalchemy import func, literal_column, select, table, text, tuple_
+from utils.pagination import (
+    InvalidCursorError,
+    decode_cursor_values,
+    encode_cursor_values,
+)
+
+
+MAX_QUERY_LENGTH = 100
+
+
+def _postgres_matches(query_text):
+    """(post id, score) for every post matching query_text, via the GIN-indexed tsvector"""
+    tsquery = func.websearch_to_tsquery('english', query_text)
+    search_vector = literal_column('blog_posts.search_vector')
+    return (
+        select(BlogPost.id.label('id'), func.ts_rank_cd(search_vector, tsquery).label('score'))
+        .where(search_vector.op('@@')(tsquery))
+        .subquery()
+    )
+
+
+def _sqlite_matches(query_text):
+    """(post id, score) for every post matching query_text, via the FTS5 table"""
+    # Quote each word so user input can never be parsed as FTS5 query syntax;
+    # the trailing * gives prefix matching, and terms are ANDed together.
+    terms = re.findall(r'\w+', query_text)
+    match = ' '.join(f'"{term}"*' for term in terms)
+    fts = table('blog_posts_fts')
+    return (
+        select(
+            literal_column('blog_posts_fts.rowid').label('id'),
+            # bm25() is lower-is-better; negate so higher scores rank first on both backends
+            (-func.bm25(literal_column('blog_posts_fts'))).label('score')
+        )
+        .select_from(fts)
+        .where(text('blog_posts_fts MATCH :match').bindparams(match=match))
+        .subquery()
+    )
+
+
+def search_posts(query_text, limit, cursor=None):
+    """
+    Rank posts against a free-text query with keyset pagination over (score, id).
+
+    Args:
+        query_text: User search string (already length-validated)
+        limit: Page size
+        cursor: Opaque cursor from a previous page (optional)
+
+    Returns:
+        tuple: (posts, next_cursor) - posts are loaded with the summary projection
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded
+    """
+    if db.engine.dialect.name == 'postgresql':
+        matches = _postgres_matches(query_text)
+    else:
+        if not re.search(r'\w', query_text):
+            return [], None
+        matches = _sqlite_matches(query_text)
+
+    query = (
+        BlogPost.query_for_list(summary=True)
+        .join(matches, matches.c.id == BlogPost.id)
+        .add_columns(matches.c.score)
+    )
+
+    if cursor:
+        score, row_id = decode_cursor_values(cursor, 2)
+        if not isinstance(score, int | float) or not isinstance(row_id, int):
+            raise InvalidCursorError("Invalid cursor")
+        query = query.filter(tuple_(matches.c.score, BlogPost.id) < tuple_(score, row_id))
+
+    rows = query.order_by(matches.c.score.desc(), BlogPost.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_post, last_score = rows[-1]
+        next_cursor = encode_cursor_values(last_score, last_post.id)
+    return [post for post, _score in rows], next_cursor
@@ -0,0 +1,188 @@
+"""
+Write-behind users.failed_login_attempts and users.rate_limit_violations.
+
+A credential-stuffing attack is a stream of wrong passwords and 429s, and each
+one used to commit an UPDATE of a users row. When Redis is configured the
+increments are HINCRBY'd into the security_counters:pending hash instead and
+the blog-worker's flush_security_counters job applies them in one short
+transaction every few seconds; without Redis (or if it is unreachable) they
+are written through as before.
+
+    failed:<user_id>        wrong passwords since the last flush
+    failed_at:<user_id>     unix time of the latest one
+    violations:<identifier> 429s for an email/username taken from the request
+                            body, resolved to a user only at flush time so the
+                            429 path never queries Postgres
+
+A successful login resets failed_login_attempts, so it also drops the user's
+pending failures, and a batch's failures are skipped at flush time for users
+who logged in after the last of them. The stored counters lag by up to one
+flush interval.
+
+The flush uses the same RENAMENX pending -> inflight protocol as
+utils/vote_buffer.py: a batch left in flight by a crash is replayed on the
+next run, unless its id is already in flush_batches because the crash came
+after the commit.
+"""
+from datetime import datetime, timezone
+import time
+import uuid
+
+from app import db
+from flask import current_app
+from models.flush_batch import FlushBatch
+from models.user import User
+import redis
+from sqlalchemy import or_
+from utils import redis_client
+
+
+PENDING_KEY = 'security_counters:pending'
+INFLIGHT_KEY = 'security_counters:inflight'
+BATCH_FIELD = '__batch'
+
+
+def _normalize(identifier):
+    return identifier.lower().strip()
+
+
+def buffer_failed_login(user_id):
+    """
+    Count a wrong password for the next flush.
+
+    Returns:
+        bool: False if Redis is not configured or unavailable (caller should write through)
+    """
+    r = redis_client.get_client()
+    if r is None:
+        return False
+    try:
+        pipe = r.pipeline(transaction=False)
+        pipe.hincrby(PENDING_KEY, f'failed:{user_id}', 1)
+        pipe.hset(PENDING_KEY, f'failed_at:{user_id}', f'{time.time():.3f}')
+        pipe.execute()
+        return True
+    except redis.RedisError as e:
+        current_app.logger.warning(f"Security counters unavailable, writing through: {e!r}")
+        return False
+
+
+def discard_failed_logins(user_id):
+    """Drop a user's unflushed failures (their successful login resets the count)"""
+    r = redis_client.get_client()
+    if r is None:
+        return
+    try:
+        r.hdel(PENDING_KEY, f'failed:{user_id}', f'failed_at:{user_id}')
+    except redis.RedisError as e:
+        current_app.logger.warning(f"Could not discard pending failed logins: {e!r}")
+
+
+def record_rate_limit_violation(identifier):
+    """
+    Count a 429 for whichever user the email/username belongs to.
+
+    One HINCRBY when Redis is available; otherwise the user is looked up and
+    the counter committed directly.
+    """
+    identifier = _normalize(identifier)
+    if not identifier:
+        return
+    r = redis_client.get_client()
+    if r is not None:
+        try:
+            r.hincrby(PENDING_KEY, f'violations:{identifier}', 1)
+            return
+        except redis.RedisError as e:
+            current_app.logger.warning(f"Security counters unavailable, writing through: {e!r}")
+
+    user = User.query.filter((User.email == identifier) | (User.username == identifier)).first()
+    if user:
+        user.rate_limit_violations += 1
+        db.session.commit()
+
+
+def _parse_counters(fields):
+    """Hash fields -> ({user_id: (failed, failed_at)}, {identifier: violations})"""
+    failed, failed_at, violations = {}, {}, {}
+    for field, value in fields.items():
+        if field == BATCH_FIELD:
+            continue
+        kind, key = field.split(':', 1)
+        if kind == 'failed':
+            failed[int(key)] = int(value)
+        elif kind == 'failed_at':
+            failed_at[int(key)] = float(value)
+        elif kind == 'violations':
+            violations[key] = int(value)
+    failures = {user_id: (count, failed_at.get(user_id, time.time())) for user_id, count in failed.items() if count}
+    return failures, violations
+
+
+def _resolve_identifiers(identifiers):
+    """{identifier: violations} -> {user_id: violations} (unknown identifiers are dropped)"""
+    if not identifiers:
+        return {}
+    rows = (
+        db.session.query(User.id, User.email, User.username)
+        .filter(or_(User.email.in_(identifiers), User.username.in_(identifiers)))
+        .all()
+    )
+    totals = {}
+    for user_id, email, username in rows:
+        count = identifiers.get(email, 0) + (identifiers.get(username, 0) if username != email else 0)
+        if count:
+            totals[user_id] = totals.get(user_id, 0) + count
+    return totals
+
+
+def flush_pending_counters():
+    """
+    Apply buffered counters to users (replaying any crashed batch first).
+
+    Returns:
+        int: Number of users updated
+    """
+    r = redis_client.get_client()
+    if r is None:
+        return 0
+    if not r.exists(INFLIGHT_KEY):
+        if not r.exists(PENDING_KEY):
+            return 0
+        # Only this job renames, so pending cannot vanish between the two calls
+        r.renamenx(PENDING_KEY, INFLIGHT_KEY)
+    # Kept by a replay, so a committed batch is recognised in flush_batches
+    r.hsetnx(INFLIGHT_KEY, BATCH_FIELD, uuid.uuid4().hex)
+    fields = r.hgetall(INFLIGHT_KEY)
+    if not FlushBatch.begin(fields[BATCH_FIELD], source='security_counters'):
+        current_app.logger.warning(f"Security counter batch {fields[BATCH_FIELD]} was already applied, discarding it")
+        r.delete(INFLIGHT_KEY)
+        return 0
+    failures, identifiers = _parse_counters(fields)
+    violations = _resolve_identifiers(identifiers)
+
+    updated = set()
+    # Sorted so concurrent write-through updates lock rows in the same order
+    for user_id in sorted(failures.keys() | violations.keys()):
+        if user_id in violations:
+            db.session.query(User).filter(User.id == user_id).update({
+                User.rate_limit_violations: db.func.coalesce(User.rate_limit_violations, 0) + violations[user_id],
+            }, synchronize_session=False)
+            updated.add(user_id)
+        if user_id in failures:
+            count, failed_at = failures[user_id]
+            last_failed = datetime.fromtimestamp(failed_at, tz=timezone.utc).replace(tzinfo=None)
+            # A login after the last failure already reset the count
+            matched = db.session.query(User).filter(
+                User.id == user_id,
+                or_(User.last_login.is_(None), User.last_login < last_failed),
+            ).update({
+                User.failed_login_attempts: db.func.coalesce(User.failed_login_attempts, 0) + count,
+                User.last_failed_login: last_failed,
+            }, synchronize_session=False)
+            if matched:
+                updated.add(user_id)
+    db.session.commit()
+
+    r.delete(INFLIGHT_KEY)
+    return len(updated)
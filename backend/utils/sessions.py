@@ -0,0 +1,205 @@
+"""
+Per-session registry of issued JWTs (one entry per login/device).
+
+Tokens issued by login, verify_2fa and extend_session carry a jti that is
+recorded here with a TTL equal to JWT_ACCESS_TOKEN_EXPIRES, so a token is
+valid only while its session:<jti> key exists. Revocation is a DEL and the
+per-request check is a single Redis EXISTS; the token's token_version claim is
+also compared (through utils/token_versions.py), so a password change ends
+every session even if the revocation below never reaches Redis.
+
+    session:<jti>              JSON metadata (user, IP, browser, device, times)
+    user_sessions:<user_id>    sorted set of the user's jtis scored by expiry
+
+Revoking every session of a user (password change/reset, account deletion)
+happens after the transaction commits, like the token_version write-through.
+Without Redis (development and tests) the registry lives in this process.
+"""
+from datetime import datetime, timezone
+import json
+import logging
+import threading
+import time
+
+from app import db
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils import redis_client
+from utils.cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEY = 'session:{jti}'
+USER_SESSIONS_KEY = 'user_sessions:{user_id}'
+
+# Session.info key for users whose sessions are revoked once the transaction commits
+_PENDING_KEY = 'sessions_revoke_pending'
+
+# Deletes the session only if it was in the caller's set, atomically
+_REVOKE_OWN_SESSION = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+return redis.call('DEL', KEYS[2])
+"""
+
+# In-process fallback used when REDIS_URL is not a real Redis
+_local_sessions = TTLCache(maxsize=100000)
+_local_by_user = {}
+_local_lock = threading.Lock()
+
+
+def register(user_id, jti, ttl, *, ip_address=None, browser=None, device=None):
+    """
+    Record a newly issued token's session.
+
+    Args:
+        user_id: Owner of the session
+        jti: The token's jti claim
+        ttl: Seconds until the token expires (JWT_ACCESS_TOKEN_EXPIRES)
+        ip_address, browser, device: Login details shown in the session list
+
+    Raises:
+        redis.RedisError: If the registry could not be written
+    """
+    now = int(time.time())
+    metadata = {
+        'user_id': user_id,
+        'ip_address': ip_address,
+        'browser': browser,
+        'device': device,
+        'created_at': now,
+        'expires_at': now + ttl,
+    }
+    r = redis_client.get_client()
+    if r is None:
+        with _local_lock:
+            _local_sessions.set(jti, metadata, ttl=ttl)
+            user_jtis = _local_by_user.setdefault(user_id, {})
+            for expired in [key for key, expires_at in user_jtis.items() if expires_at <= now]:
+                del user_jtis[expired]
+            user_jtis[jti] = now + ttl
+        return
+
+    user_key = USER_SESSIONS_KEY.format(user_id=user_id)
+    pipe = r.pipeline()
+    pipe.set(SESSION_KEY.format(jti=jti), json.dumps(metadata), ex=ttl)
+    pipe.zremrangebyscore(user_key, '-inf', now)
+    pipe.zadd(user_key, {jti: now + ttl})
+    pipe.expire(user_key, ttl)
+    pipe.execute()
+
+
+def exists(jti):
+    """
+    True while the session has not expired or been revoked.
+
+    Raises:
+        redis.RedisError: If Redis is unreachable (the caller fails closed)
+    """
+    r = redis_client.get_client()
+    if r is None:
+        return _local_sessions.get(jti) is not None
+    return bool(r.exists(SESSION_KEY.format(jti=jti)))
+
+
+def _serialize(jti, metadata):
+    return {
+        'id': jti,
+        'ip_address': metadata.get('ip_address'),
+        'browser': metadata.get('browser'),
+        'device': metadata.get('device'),
+        'created_at': datetime.fromtimestamp(metadata['created_at'], tz=timezone.utc).isoformat(),
+        'expires_at': datetime.fromtimestamp(metadata['expires_at'], tz=timezone.utc).isoformat(),
+    }
+
+
+def list_for_user(user_id):
+    """
+    Active sessions of a user, newest first.
+
+    Returns:
+        list: [{'id', 'ip_address', 'browser', 'device', 'created_at', 'expires_at'}, ...]
+    """
+    r = redis_client.get_client()
+    if r is None:
+        with _local_lock:
+            jtis = list(_local_by_user.get(user_id, {}))
+        entries = [(jti, _local_sessions.get(jti)) for jti in jtis]
+    else:
+        jtis = r.zrangebyscore(USER_SESSIONS_KEY.format(user_id=user_id), int(time.time()), '+inf')
+        values = r.mget([SESSION_KEY.format(jti=jti) for jti in jtis]) if jtis else []
+        entries = [(jti, json.loads(value) if value else None) for jti, value in zip(jtis, values, strict=True)]
+
+    sessions = [_serialize(jti, metadata) for jti, metadata in entries if metadata is not None]
+    sessions.sort(key=lambda session: session['created_at'], reverse=True)
+    return sessions
+
+
+def revoke(user_id, jti):
+    """
+    End one of the user's sessions.
+
+    Returns:
+        bool: False if the session does not exist or belongs to someone else
+    """
+    r = redis_client.get_client()
+    if r is None:
+        with _local_lock:
+            if _local_by_user.get(user_id, {}).pop(jti, None) is None:
+                return False
+            found = _local_sessions.get(jti) is not None
+            _local_sessions.delete(jti)
+            return found
+
+    deleted = r.eval(
+        _REVOKE_OWN_SESSION, 2, USER_SESSIONS_KEY.format(user_id=user_id), SESSION_KEY.format(jti=jti), jti,
+    )
+    return bool(deleted)
+
+
+def revoke_all(user_id):
+    """End every session of the user"""
+    r = redis_client.get_client()
+    if r is None:
+        with _local_lock:
+            for jti in _local_by_user.pop(user_id, {}):
+                _local_sessions.delete(jti)
+        return
+
+    user_key = USER_SESSIONS_KEY.format(user_id=user_id)
+    jtis = r.zrange(user_key, 0, -1)
+    pipe = r.pipeline()
+    for jti in jtis:
+        pipe.delete(SESSION_KEY.format(jti=jti))
+    pipe.delete(user_key)
+    pipe.execute()
+
+
+def revoke_all_after_commit(user_id):
+    """End every session of the user once the current transaction commits"""
+    db.session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _revoke_pending(session):
+    for user_id in session.info.pop(_PENDING_KEY, set()):
+        try:
+            revoke_all(user_id)
+        except redis.RedisError as e:
+            # token_version still rejects them after a password change/reset
+            logger.error(f"Revoking sessions for user {user_id} failed: {e!r}")
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending(session, previous_transaction):  # noqa: ARG001
+    session.info.pop(_PENDING_KEY, None)
+
+
+def clear_local():
+    """Drop the in-process registry (tests)"""
+    with _local_lock:
+        _local_sessions.clear()
+        _local_by_user.clear()
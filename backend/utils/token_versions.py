@@ -0,0 +1,185 @@
+"""
+Cache of users' token_version for the JWT revocation check.
+
+Every JWT-protected request compares the token's token_version claim with the
+user's current one. Lookups go through an in-process TTL LRU, then a Redis key
+(token_version:<user_id>), and only fall back to a single-column Postgres read
+on a miss, so steady-state authenticated requests never touch the database.
+
+Invalidation is write-through: when a version changes (User.invalidate_tokens)
+or a user is deleted, the new state is written to Redis after the transaction
+commits and a message on the token_version:invalidate channel makes every
+gunicorn worker drop its local entry. Each worker subscribes lazily (after
+fork) with a background pub/sub thread; while that subscription is down the
+local layer is bypassed so a missed message can never keep a revoked token
+alive.
+"""
+import logging
+import os
+import threading
+
+from app import db
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils import redis_client
+from utils.cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = 'token_version:{user_id}'
+INVALIDATE_CHANNEL = 'token_version:invalidate'
+# Postgres is re-read after expiry, which also bounds how long a failed
+# invalidation (Redis down mid-publish) could leave a stale entry behind
+REDIS_TTL = 600
+# Bounds the window in which a missed pub/sub message could matter
+LOCAL_TTL = 30
+_local = TTLCache(maxsize=10000, ttl=LOCAL_TTL)
+
+# Session.info key for versions to publish once the transaction commits
+_PENDING_KEY = 'token_versions_pending'
+_DELETED = None
+
+_listener_lock = threading.Lock()
+_listener_pid = None
+
+
+def _on_invalidate(message):
+    _local.delete(int(message['data']))
+
+
+def _on_listener_error(error, pubsub, thread):  # noqa: ARG001
+    """Subscription lost: stop trusting the local layer until it is re-established"""
+    global _listener_pid  # noqa: PLW0603
+    logger.warning(f"Token version subscription lost: {error!r}")
+    _listener_pid = None
+    _local.clear()
+    thread.stop()
+
+
+def _local_cache_usable():
+    """
+    True when local entries are guaranteed to hear about invalidations.
+
+    Without Redis there is a single process to invalidate (development and
+    tests). With Redis, this process must be subscribed to the channel.
+    """
+    global _listener_pid  # noqa: PLW0603
+    r = redis_client.get_client()
+    if r is None:
+        return True
+    if _listener_pid == os.getpid():
+        return True
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return True
+        try:
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATE_CHANNEL: _on_invalidate})
+            pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=_on_listener_error)
+        except redis.RedisError as e:
+            logger.warning(f"Token version subscription failed: {e!r}")
+            return False
+        # Anything cached before subscribing may have missed a message
+        _local.clear()
+        _listener_pid = os.getpid()
+        return True
+
+
+def get_cached(user_id):
+    """
+    Current token_version from the local cache or Redis.
+
+    Returns:
+        int | None: The version, or None if it has to be read from the database
+    """
+    use_local = _local_cache_usable()
+    if use_local:
+        version = _local.get(user_id)
+        if version is not None:
+            return version
+
+    r = redis_client.get_client()
+    if r is None:
+        return None
+    try:
+        version = r.get(REDIS_KEY.format(user_id=user_id))
+    except redis.RedisError as e:
+        logger.warning(f"Token version lookup failed: {e!r}")
+        return None
+    if version is None:
+        return None
+    version = int(version)
+    if use_local:
+        _local.set(user_id, version)
+    return version
+
+
+def remember(user_id, version):
+    """
+    Cache a version just read from the database.
+
+    Uses SET NX so a concurrent write-through invalidation always wins over a
+    reader that saw the old row.
+
+    Returns:
+        int: The version to compare against (the newer one if a writer won)
+    """
+    r = redis_client.get_client()
+    if r is not None:
+        try:
+            key = REDIS_KEY.format(user_id=user_id)
+            if not r.set(key, version, ex=REDIS_TTL, nx=True):
+                version = int(r.get(key) or version)
+        except redis.RedisError as e:
+            logger.warning(f"Token version cache write failed: {e!r}")
+            return version
+    if _local_cache_usable():
+        _local.set(user_id, version)
+    return version
+
+
+def store_after_commit(user_id, version):
+    """Publish a changed token_version once the current transaction commits"""
+    db.session.info.setdefault(_PENDING_KEY, {})[user_id] = version
+
+
+def forget_after_commit(user_id):
+    """Revoke a deleted user's cached version once the current transaction commits"""
+    db.session.info.setdefault(_PENDING_KEY, {})[user_id] = _DELETED
+
+
+def _publish(user_id, version):
+    _local.delete(user_id)
+    r = redis_client.get_client()
+    if r is None:
+        return
+    key = REDIS_KEY.format(user_id=user_id)
+    try:
+        pipe = r.pipeline()
+        if version is _DELETED:
+            pipe.delete(key)
+        else:
+            pipe.set(key, version, ex=REDIS_TTL)
+        pipe.publish(INVALIDATE_CHANNEL, user_id)
+        pipe.execute()
+    except redis.RedisError as e:
+        # Other workers' entries expire within LOCAL_TTL and REDIS_TTL
+        logger.error(f"Token version invalidation for user {user_id} failed: {e!r}")
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending(session):
+    for user_id, version in session.info.pop(_PENDING_KEY, {}).items():
+        _publish(user_id, version)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending(session, previous_transaction):  # noqa: ARG001
+    session.info.pop(_PENDING_KEY, None)
+
+
+def clear_local():
+    """Drop this worker's local entries (tests)"""
+    _local.clear()
@@ -0,0 +1,171 @@
+"""
+Optional Redis buffering of post vote counters (VOTE_BUFFER_ENABLED).
+
+Under a burst of votes on one post, every vote otherwise updates the same
+blog_posts row and queues on its row lock. In buffered mode the vote row is
+still written to Postgres (votes rows never contend with each other), but the
+counter change is HINCRBY'd into a Redis hash and the flush_vote_buffer worker
+job applies the accumulated deltas in one short transaction every few seconds.
+
+Flush protocol (single flusher - the blog-worker service):
+    1. RENAMENX votes:pending -> votes:inflight freezes the current batch while
+       new votes keep landing in a fresh votes:pending hash, and HSETNX gives
+       the batch a random id in its __batch field.
+    2. The inflight deltas are applied to blog_posts and committed together
+       with a flush_batches row for that id.
+    3. votes:inflight is deleted.
+If the worker dies between 1 and 3, votes:inflight is still there on the next
+run and is replayed before a new batch is taken. A crash after the commit but
+before the delete leaves a batch whose id is already in flush_batches, so the
+replay only deletes it.
+
+VOTE_BUFFER_ENABLED only decides whether new votes are buffered. Whenever
+Redis is configured the worker keeps draining both hashes and reads keep
+merging them, so switching the mode off never strands buffered votes.
+"""
+import uuid
+
+from app import db
+from flask import current_app
+from models.flush_batch import FlushBatch
+from models.post import BlogPost
+import redis
+from utils import redis_client
+
+
+PENDING_KEY = 'votes:pending'
+INFLIGHT_KEY = 'votes:inflight'
+BATCH_FIELD = '__batch'
+
+
+def is_enabled():
+    """Whether new votes are buffered: needs the config flag and a real Redis behind REDIS_URL"""
+    return bool(current_app.config.get('VOTE_BUFFER_ENABLED')) and redis_client.is_configured()
+
+
+def _parse_deltas(fields):
+    """{'<post_id>:up': '3', '<post_id>:down': '-1'} -> {post_id: (up, down)}"""
+    deltas = {}
+    for field, value in fields.items():
+        if field == BATCH_FIELD:
+            continue
+        post_id, kind = field.split(':')
+        up, down = deltas.get(int(post_id), (0, 0))
+        if kind == 'up':
+            up += int(value)
+        else:
+            down += int(value)
+        deltas[int(post_id)] = (up, down)
+    return deltas
+
+
+def buffer_vote_delta(post_id, upvote_delta, downvote_delta):
+    """
+    Queue a counter change for the next flush.
+
+    Returns:
+        bool: False if Redis was unavailable (caller should write through)
+    """
+    try:
+        pipe = redis_client.get_client().pipeline()
+        if upvote_delta:
+            pipe.hincrby(PENDING_KEY, f'{post_id}:up', upvote_delta)
+        if downvote_delta:
+            pipe.hincrby(PENDING_KEY, f'{post_id}:down', downvote_delta)
+        pipe.execute()
+        return True
+    except redis.RedisError as e:
+        current_app.logger.warning(f"Vote buffer unavailable, writing through: {e!r}")
+        return False
+
+
+def pending_deltas(post_ids):
+    """
+    Unflushed counter changes for the given posts (pending plus in-flight).
+
+    Returns:
+        dict: {post_id: (upvote_delta, downvote_delta)} for posts with changes
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return {}
+    fields = [f'{post_id}:{kind}' for post_id in post_ids for kind in ('up', 'down')]
+    pipe = redis_client.get_client().pipeline()
+    pipe.hmget(PENDING_KEY, fields)
+    pipe.hmget(INFLIGHT_KEY, fields)
+    totals = {}
+    for values in pipe.execute():
+        for field, value in zip(fields, values, strict=True):
+            if value is not None:
+                totals[field] = totals.get(field, 0) + int(value)
+    deltas = _parse_deltas(totals)
+    return {post_id: delta for post_id, delta in deltas.items() if delta != (0, 0)}
+
+
+def merge_pending_votes(post_dicts):
+    """
+    Add unflushed deltas to serialized posts so voters see their vote at once.
+
+    A no-op without Redis. Deltas are merged even when VOTE_BUFFER_ENABLED is
+    off, since votes buffered before it was switched off may not be flushed
+    yet; if Redis is unreachable the stored counters are returned unchanged.
+
+    Args:
+        post_dicts: List of BlogPost.to_dict()/to_summary_dict() results
+
+    Returns:
+        list: The same dicts, updated in place
+    """
+    if not post_dicts or not redis_client.is_configured():
+        return post_dicts
+    try:
+        deltas = pending_deltas(post['id'] for post in post_dicts)
+    except redis.RedisError as e:
+        current_app.logger.warning(f"Could not read pending votes: {e!r}")
+        return post_dicts
+    for post in post_dicts:
+        up, down = deltas.get(post['id'], (0, 0))
+        post['upvotes'] += up
+        post['downvotes'] += down
+    return post_dicts
+
+
+def flush_pending_votes():
+    """
+    Apply buffered counter deltas to blog_posts (replaying any crashed batch first).
+
+    Returns:
+        int: Number of posts updated
+    """
+    r = redis_client.get_client()
+    if r is None:
+        return 0
+    if not r.exists(INFLIGHT_KEY):
+        if not r.exists(PENDING_KEY):
+            return 0
+        # Only this job renames, so pending cannot vanish between the two calls
+        r.renamenx(PENDING_KEY, INFLIGHT_KEY)
+    # Kept by a replay, so a committed batch is recognised in flush_batches
+    r.hsetnx(INFLIGHT_KEY, BATCH_FIELD, uuid.uuid4().hex)
+    fields = r.hgetall(INFLIGHT_KEY)
+    if not FlushBatch.begin(fields[BATCH_FIELD], source='votes'):
+        current_app.logger.warning(f"Vote batch {fields[BATCH_FIELD]} was already applied, discarding it")
+        r.delete(INFLIGHT_KEY)
+        return 0
+    deltas = _parse_deltas(fields)
+    deltas = {post_id: delta for post_id, delta in deltas.items() if delta != (0, 0)}
+
+    if deltas:
+        created = dict(
+            db.session.query(BlogPost.id, BlogPost.created_at)
+            .filter(BlogPost.id.in_(deltas))
+            .all()
+        )
+        # Sorted so concurrent write-through votes lock rows in the same order
+        for post_id in sorted(created):
+            upvote_delta, downvote_delta = deltas[post_id]
+            BlogPost.apply_vote_delta(post_id, created[post_id], upvote_delta, downvote_delta)
+    db.session.commit()
+
+    r.delete(INFLIGHT_KEY)
+    return len(deltas)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Background worker for periodic maintenance jobs.
+
+Runs alongside the gunicorn web process (see the blog-worker service in the
+docker-compose files) so that batch work never happens on the request path.
+It also delivers registration and 2FA codes, so authentication depends on it.
+
+Usage:
+    python worker.py              # run all jobs on their schedules forever
+    python worker.py <job_name>   # run a single job once and exit
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+import sys
+import threading
+import time
+
+
+# Add backend directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import create_app, db
+from models.post import BlogPost
+from utils import (
+    alert_digest,
+    email_outbox,
+    login_enrichment,
+    redis_client,
+    security_counters,
+    vote_buffer,
+)
+
+
+logger = logging.getLogger('worker')
+
+
+@dataclass
+class Job:
+    name: str
+    interval: int  # seconds between runs
+    func: Callable[[], None]
+    next_run: float = 0.0
+    # Runs on its own thread so slow jobs can never delay it
+    dedicated: bool = False
+
+
+def recompute_hot_ranks():
+    updated = BlogPost.recompute_hot_ranks()
+    logger.info(f"Recomputed hot_rank for {updated} post(s)")
+
+
+def flush_vote_buffer():
+    # Runs on every start too, which replays a batch left in flight by a crash.
+    # Not gated on VOTE_BUFFER_ENABLED: votes buffered before it was switched
+    # off still have to reach Postgres.
+    flushed = vote_buffer.flush_pending_votes()
+    if flushed:
+        logger.info(f"Flushed buffered votes for {flushed} post(s)")
+
+
+def flush_security_counters():
+    updated = security_counters.flush_pending_counters()
+    if updated:
+        logger.info(f"Flushed failed login / rate limit counters for {updated} user(s)")
+
+
+def enrich_logins():
+    # Geolocation can block for seconds per login; yield the loop to other jobs
+    processed = login_enrichment.process_pending_logins(time_budget=ENRICH_TIME_BUDGET)
+    if processed:
+        logger.info(f"Enriched {processed} login(s)")
+
+
+def deliver_emails():
+    delivered, failed = email_outbox.deliver_pending_emails()
+    if delivered or failed:
+        logger.info(f"Delivered {delivered} email(s), {failed} failed")
+
+
+def send_alert_digest():
+    reported = alert_digest.send_rate_limit_digest()
+    if reported:
+        logger.info(f"Sent rate limit digest covering {reported} incident(s)")
+
+
+ENRICH_TIME_BUDGET = 5  # seconds of enrichment per tick
+
+
+JOBS = [
+    Job('recompute_hot_ranks', interval=300, func=recompute_hot_ranks),
+    Job('flush_vote_buffer', interval=5, func=flush_vote_buffer),
+    Job('flush_security_counters', interval=5, func=flush_security_counters),
+    Job('enrich_logins', interval=1, func=enrich_logins),
+    # 2FA and registration codes expire within minutes: never queue them
+    # behind geolocation or hot-rank recomputation
+    Job('deliver_emails', interval=2, func=deliver_emails, dedicated=True),
+    Job('send_alert_digest', interval=300, func=send_alert_digest),
+]
+
+
+def run_job(app, job):
+    """Run one job inside an app context, logging (not raising) failures"""
+    with app.app_context():
+        try:
+            job.func()
+        except Exception as e:
+            logger.error(f"Job {job.name} failed: {e!r}")
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+
+def run_forever(app, jobs, tick=1.0):
+    """Simple scheduler loop: run each job whenever its interval has elapsed"""
+    logger.info(f"Worker started with jobs: {', '.join(job.name for job in jobs)}")
+    while True:
+        now = time.monotonic()
+        for job in jobs:
+            if now >= job.next_run:
+                run_job(app, job)
+                job.next_run = time.monotonic() + job.interval
+        redis_client.log_pool_stats()
+        time.sleep(tick)
+
+
+def main():
+    """Main entry point for the worker."""
+    app = create_app()
+    logger.setLevel(logging.INFO)
+
+    jobs_by_name = {job.name: job for job in JOBS}
+    if len(sys.argv) == 2:
+        job = jobs_by_name.get(sys.argv[1])
+        if job is None:
+            print(f"Unknown job: {sys.argv[1]}")
+            print(f"Available jobs: {', '.join(jobs_by_name)}")
+            sys.exit(1)
+        run_job(app, job)
+        return
+
+    for job in JOBS:
+        if job.dedicated:
+            threading.Thread(target=run_forever, args=(app, [job]), name=job.name, daemon=True).start()
+    run_forever(app, [job for job in JOBS if not job.dedicated])
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,7 @@ import ReactMarkdown from 'react-markdown'
 import { Prism as SyntaxHighlighter } from 'react-syntax-highlighter'
 import { vscDarkPlus } from 'react-syntax-highlighter/dist/esm/styles/prism'
 import { useAuth } from '../../../../contexts/AuthContext'
-import { userAPI, commentAPI } from '../../../../services/api'
+import { userAPI } from '../../../../services/api'
 import type { User, BlogPost, VotedPost, CommentedPost } from '../../../../types'
 import { getErrorMessage } from '../../../../utils/errors'
 import { colors, shadows, transitions } from '../../../../theme/colors'
@@ -232,6 +232,28 @@ const PostsSection = styled.div`
   }
 `
 
+const LoadMoreButton = styled.button`
+  display: block;
+  margin: 1.5rem auto 0;
+  padding: 0.6rem 1.5rem;
+  background: ${colors.backgroundDark};
+  border: 1px solid ${colors.borderLight};
+  border-radius: 8px;
+  color: ${colors.text.primary};
+  cursor: pointer;
+  transition: ${transitions.default};
+
+  &:hover:not(:disabled) {
+    border-color: ${colors.primary};
+    color: ${colors.primary};
+  }
+
+  &:disabled {
+    opacity: 0.6;
+    cursor: default;
+  }
+`
+
 type ProfileView = 'my-posts' | 'votes-received' | 'comments-received' | 'votes-made' | 'comments-made'
 
 const ProfilePage = () => {
@@ -245,8 +267,10 @@ const ProfilePage = () => {
   const [error, setError] = useState<string | null>(null)
 
   // Stats state
+  const [postsCount, setPostsCount] = useState(0)
   const [votesMade, setVotesMade] = useState(0)
   const [commentsMade, setCommentsMade] = useState(0)
+  const [votesReceived, setVotesReceived] = useState(0)
   const [commentsReceived, setCommentsReceived] = useState(0)
 
   // Interactive view state
@@ -254,6 +278,12 @@ const ProfilePage = () => {
   const [votedPosts, setVotedPosts] = useState<VotedPost[]>([])
   const [commentedPosts, setCommentedPosts] = useState<CommentedPost[]>([])
 
+  // next_cursor of each list (null once everything is loaded)
+  const [postsCursor, setPostsCursor] = useState<string | null>(null)
+  const [votedCursor, setVotedCursor] = useState<string | null>(null)
+  const [commentedCursor, setCommentedCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+
   // Settings modal state
   const [showSettingsModal, setShowSettingsModal] = useState(false)
 
@@ -264,54 +294,37 @@ const ProfilePage = () => {
       setActiveView('my-posts') // Reset view when profile changes
 
       try {
-        // Fetch user profile
-        const profileData = username
-          ? await userAPI.getUserByUsername(username)
-          : await userAPI.getProfile()
-
-        setProfile(profileData)
-
         const targetUsername = username || currentUser?.username
 
         if (targetUsername) {
-          // Fetch user's posts, votes, and comments in parallel
-          const [postsData, votesCount, commentsCount, votedPostsData, commentedPostsData] = await Promise.all([
-            userAPI.getUserPosts(targetUsername),
-            userAPI.getUserVotesCount(targetUsername),
-            userAPI.getUserCommentsCount(targetUsername),
-            userAPI.getUserVotedPosts(targetUsername),
-            userAPI.getUserCommentedPosts(targetUsername)
-          ])
-
-          setPosts(Array.isArray(postsData) ? postsData : [])
-          setVotesMade(votesCount)
-          setCommentsMade(commentsCount)
-          setVotedPosts(Array.isArray(votedPostsData) ? votedPostsData : [])
-          setCommentedPosts(Array.isArray(commentedPostsData) ? commentedPostsData : [])
-
-          // Calculate comments received on user's posts
-          if (Array.isArray(postsData) && postsData.length > 0) {
-            const commentCounts = await Promise.all(
-              postsData.map(async (post) => {
-                try {
-                  const comments = await commentAPI.getComments(post.id)
-                  return Array.isArray(comments) ? comments.length : 0
-                } catch {
-                  return 0
-                }
-              })
-            )
-            setCommentsReceived(commentCounts.reduce((sum, count) => sum + count, 0))
-          } else {
-            setCommentsReceived(0)
-          }
+          // Profile, stats and the first page of each list in one request
+          const overview = await userAPI.getUserOverview(targetUsername)
+
+          setProfile(overview.user)
+          setPosts(overview.posts.posts)
+          setPostsCount(overview.counts.posts)
+          setVotesMade(overview.counts.votes)
+          setCommentsMade(overview.counts.comments)
+          setVotesReceived(overview.counts.votes_received)
+          setCommentsReceived(overview.counts.comments_received)
+          setVotedPosts(overview.voted_posts.posts)
+          setCommentedPosts(overview.commented_posts.posts)
+          setPostsCursor(overview.posts.next_cursor)
+          setVotedCursor(overview.voted_posts.next_cursor)
+          setCommentedCursor(overview.commented_posts.next_cursor)
         } else {
+          setProfile(await userAPI.getProfile())
           setPosts([])
+          setPostsCount(0)
           setVotesMade(0)
           setCommentsMade(0)
+          setVotesReceived(0)
           setCommentsReceived(0)
           setVotedPosts([])
           setCommentedPosts([])
+          setPostsCursor(null)
+          setVotedCursor(null)
+          setCommentedCursor(null)
         }
       } catch (err) {
         console.error('Failed to load profile:', err)
@@ -325,6 +338,39 @@ const ProfilePage = () => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [username])
 
+  // Cursor of the list behind the current view ("received" views filter my posts)
+  const getActiveCursor = () => {
+    if (activeView === 'votes-made') return votedCursor
+    if (activeView === 'comments-made') return commentedCursor
+    return postsCursor
+  }
+
+  const handleLoadMore = async () => {
+    const cursor = getActiveCursor()
+    if (!profile || !cursor) return
+    setLoadingMore(true)
+    try {
+      if (activeView === 'votes-made') {
+        const page = await userAPI.getUserVotedPostsPage(profile.username, cursor)
+        setVotedPosts(prev => [...prev, ...page.posts])
+        setVotedCursor(page.next_cursor)
+      } else if (activeView === 'comments-made') {
+        const page = await userAPI.getUserCommentedPostsPage(profile.username, cursor)
+        setCommentedPosts(prev => [...prev, ...page.posts])
+        setCommentedCursor(page.next_cursor)
+      } else {
+        const page = await userAPI.getUserPostsPage(profile.username, cursor)
+        setPosts(prev => [...prev, ...page.posts])
+        setPostsCursor(page.next_cursor)
+      }
+    } catch (err) {
+      console.error('Failed to load more posts:', err)
+      setError(getErrorMessage(err, 'Failed to load more posts'))
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   // Handler for profile updates from the settings modal
   const handleProfileUpdate = (updatedUser: User) => {
     setProfile(updatedUser)
@@ -339,9 +385,6 @@ const ProfilePage = () => {
     window.location.href = '/?banner=account-deleted-success'
   }
 
-  // Calculate total votes received on user's posts
-  const votesReceived = posts.reduce((sum, post) => sum + post.upvotes + post.downvotes, 0)
-
   // Get posts with votes for "Votes Received" view
   const postsWithVotes = posts.filter(post => (post.upvotes + post.downvotes) > 0)
 
@@ -459,7 +502,7 @@ const ProfilePage = () => {
                   $active={activeView === 'my-posts'}
                   onClick={() => setActiveView('my-posts')}
                 >
-                  <div className="number">{posts.length}</div>
+                  <div className="number">{postsCount}</div>
                   <div className="label">Posts</div>
                 </StatButton>
                 <StatButton
@@ -612,6 +655,12 @@ const ProfilePage = () => {
                 )
               })
             )}
+
+            {getActiveCursor() && (
+              <LoadMoreButton onClick={handleLoadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </LoadMoreButton>
+            )}
           </PostsSection>
 
           {/* Profile Settings Modal */}
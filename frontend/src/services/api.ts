@@ -1,4 +1,4 @@
-import type { User, BlogPost, Comment, VotedPost, CommentedPost } from '../types'
+import type { AuthSession, User, BlogPost, BlogPostSummary, Comment, VotedPost, CommentedPost, Page, UserOverview } from '../types'
 import axios from 'axios'
 
 // Create axios instance with base URL
@@ -112,12 +112,31 @@ export const authAPI = {
     const response = await api.post('/verify-2fa', { email, code })
     return response.data
   },
+
+  getSessions: async () => {
+    const response = await api.get<{ sessions: AuthSession[] }>('/auth/sessions')
+    return response.data.sessions
+  },
+
+  revokeSession: async (sessionId: string) => {
+    const response = await api.delete(`/auth/sessions/${sessionId}`)
+    return response.data
+  },
 }
 
 // Blog API calls
 export const blogAPI = {
   getAllPosts: async () => {
-    const response = await api.get<BlogPost[]>('/posts')
+    // Legacy unpaginated listing (the default response is cursor-paginated)
+    const response = await api.get<BlogPost[]>('/posts', { params: { all: true } })
+    return response.data
+  },
+
+  searchPosts: async (q: string, cursor?: string | null, limit = 20) => {
+    const response = await api.get<{ posts: BlogPostSummary[]; next_cursor: string | null }>(
+      '/posts/search',
+      { params: { q, limit, ...(cursor ? { cursor } : {}) } }
+    )
     return response.data
   },
 
@@ -150,12 +169,21 @@ export const blogAPI = {
     const response = await api.post<{ upvotes: number; downvotes: number }>(`/posts/${postId}/downvote`)
     return response.data
   },
+
+  // Current user's vote on up to 100 posts in one request
+  getMyVotes: async (postIds: number[]) => {
+    const response = await api.get<{ votes: Record<string, 'upvote' | 'downvote' | null> }>(
+      '/posts/votes/me',
+      { params: { ids: postIds.join(',') } }
+    )
+    return response.data.votes
+  },
 }
 
 // Comment API calls
 export const commentAPI = {
   getComments: async (postId: number) => {
-    const response = await api.get<Comment[]>(`/posts/${postId}/comments`)
+    const response = await api.get<Comment[]>(`/posts/${postId}/comments`, { params: { all: true } })
     return response.data
   },
 
@@ -192,6 +220,12 @@ export const userAPI = {
     return response.data
   },
 
+  // Profile, counts and the first page of each profile list in one request
+  getUserOverview: async (username: string, limit = 100) => {
+    const response = await api.get<UserOverview>(`/users/${username}/overview`, { params: { limit } })
+    return response.data
+  },
+
   getUserByUsername: async (username: string) => {
     const response = await api.get<User>(`/users/${username}`)
     return response.data
@@ -202,6 +236,12 @@ export const userAPI = {
     return response.data
   },
 
+  // Next page of a profile list, continuing from the overview's next_cursor
+  getUserPostsPage: async (username: string, cursor: string, limit = 100) => {
+    const response = await api.get<Page<BlogPost>>(`/users/${username}/posts`, { params: { limit, cursor } })
+    return response.data
+  },
+
   getUserVotesCount: async (username: string) => {
     const response = await api.get<{ count: number }>(`/users/${username}/votes/count`)
     return response.data.count
@@ -213,12 +253,22 @@ export const userAPI = {
   },
 
   getUserVotedPosts: async (username: string) => {
-    const response = await api.get<VotedPost[]>(`/users/${username}/voted-posts`)
+    const response = await api.get<VotedPost[]>(`/users/${username}/voted-posts`, { params: { all: true } })
     return response.data
   },
 
   getUserCommentedPosts: async (username: string) => {
-    const response = await api.get<CommentedPost[]>(`/users/${username}/commented-posts`)
+    const response = await api.get<CommentedPost[]>(`/users/${username}/commented-posts`, { params: { all: true } })
+    return response.data
+  },
+
+  getUserVotedPostsPage: async (username: string, cursor: string, limit = 100) => {
+    const response = await api.get<Page<VotedPost>>(`/users/${username}/voted-posts`, { params: { limit, cursor } })
+    return response.data
+  },
+
+  getUserCommentedPostsPage: async (username: string, cursor: string, limit = 100) => {
+    const response = await api.get<Page<CommentedPost>>(`/users/${username}/commented-posts`, { params: { limit, cursor } })
     return response.data
   },
 
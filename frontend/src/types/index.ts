@@ -22,6 +22,11 @@ export interface BlogPost {
   comment_count?: number
 }
 
+// Feed projection returned by ?view=summary (excerpt instead of full content)
+export type BlogPostSummary = Omit<BlogPost, 'content'> & {
+  excerpt: string | null
+}
+
 // Extended BlogPost with user's vote info (for voted-posts endpoint)
 export interface VotedPost extends BlogPost {
   user_vote: 'upvote' | 'downvote'
@@ -35,6 +40,27 @@ export interface CommentedPost extends BlogPost {
   }
 }
 
+// One cursor-paginated list page
+export interface Page<T> {
+  posts: T[]
+  next_cursor: string | null
+}
+
+// GET /users/<username>/overview - everything the profile page shows
+export interface UserOverview {
+  user: User
+  counts: {
+    posts: number
+    votes: number
+    comments: number
+    votes_received: number
+    comments_received: number
+  }
+  posts: Page<BlogPost>
+  voted_posts: Page<VotedPost>
+  commented_posts: Page<CommentedPost>
+}
+
 // Comment types
 export interface Comment {
   id: number
@@ -53,6 +79,16 @@ export interface Vote {
   vote_type: 'upvote' | 'downvote'
 }
 
+export interface AuthSession {
+  id: string
+  ip_address: string | null
+  browser: string | null
+  device: string | null
+  created_at: string
+  expires_at: string
+  current: boolean
+}
+
 // Auth state types
 export interface AuthState {
   user: User | null